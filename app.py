@@ -1,10 +1,12 @@
 """
 Main application entry point for Indian Stock Dashboard.
 """
+import os
 import streamlit as st
 from src.auth.auth_service import auth_service
 from src.auth.login_page import render_login_page
 from src.dashboard.dashboard import render_dashboard
+from src.services.prefetch_scheduler import PrefetchScheduler
 
 
 # Page configuration
@@ -25,6 +27,14 @@ def load_css():
         pass  # CSS file not found, use default styling
 
 
+@st.cache_resource
+def start_prefetch_scheduler() -> PrefetchScheduler:
+    """Start the cache warm-up scheduler once per server process."""
+    scheduler = PrefetchScheduler.from_env()
+    scheduler.start()
+    return scheduler
+
+
 # Initialize session state
 if "authenticated" not in st.session_state:
     st.session_state["authenticated"] = False
@@ -37,6 +47,10 @@ def main():
     # Load custom CSS
     load_css()
     
+    # Warm popular symbols in the background (shared by all sessions)
+    if os.getenv("PREFETCH_ON_STARTUP", "false").lower() == "true":
+        start_prefetch_scheduler()
+    
     # Check authentication status
     if not auth_service.is_authenticated():
         # Show login page
@@ -0,0 +1,81 @@
+"""
+Offline load benchmark for the data service using the replay provider.
+
+Runs cold and warm get_stock_data/get_current_price passes over a synthetic
+universe with production-like upstream latency, without touching the network.
+
+Usage:
+    python -m benchmarks.bench_data_service [SYMBOLS] [LATENCY_SECONDS]
+"""
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src.services import data_service
+from src.services.cache_backend import MemoryCacheBackend, get_cache_backend, set_cache_backend
+from src.services.history_store import history_store
+from src.services.market_data_provider import ReplayProvider, set_provider
+from src.services.symbol_index import symbol_index
+from src.services.upstream_guard import UpstreamGuard
+
+
+def make_bars(days: int, seed: int) -> pd.DataFrame:
+    """Generate a random-walk daily OHLCV frame ending today."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz='Asia/Kolkata')
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.002, days)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(100000, 5000000, days)
+    }, index=index)
+
+
+def run(symbol_count: int = 200, latency: float = 0.05):
+    """Run the benchmark and print timings."""
+    workdir = tempfile.mkdtemp()
+    provider = ReplayProvider(f"{workdir}/fixtures", latency_seconds=latency)
+    symbols = [f"BENCH{i}.NS" for i in range(symbol_count)]
+    for i, symbol in enumerate(symbols):
+        provider.save(symbol, make_bars(1250, i), {'longName': f"Benchmark {i}"})
+        symbol_index.add(f"BENCH{i}", f"Benchmark {i}", ["NSE"])
+
+    set_provider(provider)
+    history_store.store_dir = f"{workdir}/history"
+    data_service.yahoo_guard = UpstreamGuard("replay", rate=1e6, burst=10 ** 6)
+    set_cache_backend(MemoryCacheBackend())
+
+    # The second pass simulates a process restart: in-memory caches are gone
+    # but the on-disk history store is still populated
+    for label in ("cold", "restart"):
+        st.cache_data.clear()
+        get_cache_backend().clear()
+        data_service._history_frames.clear()
+        started = time.perf_counter()
+        for symbol in symbols:
+            data_service.get_current_price(symbol)
+            data_service.get_stock_data(symbol, "1y")
+        elapsed = time.perf_counter() - started
+        print(f"{label:>14}: {elapsed:.2f}s total, {elapsed / symbol_count * 1000:.1f} ms/symbol")
+
+    report = data_service.history_memory_report()
+    used = sum(entry["bytes"] for entry in report.values())
+    saved = sum(entry["saved_bytes"] for entry in report.values())
+    print(f"{'history memory':>14}: {used / 2 ** 20:.1f} MiB held, {saved / 2 ** 20:.1f} MiB saved "
+          f"by the compact layout ({saved / len(report) / 1024:.1f} KiB/symbol)")
+
+    data_service.clear_cache()
+    started = time.perf_counter()
+    data_service.get_stock_data_batch(symbols, "1y")
+    print(f"{'batch':>14}: {time.perf_counter() - started:.2f}s for {symbol_count} symbols")
+    print(data_service.yahoo_guard.stats())
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    run(count, delay)
@@ -0,0 +1,90 @@
+"""
+Benchmark of multi-step LSTM forecasting.
+
+Compares the autoregressive loop that calls model.predict once per forecast
+day with the compiled rollout (lstm_model.create_rollout) that runs every
+step in one graph call, and checks that both produce the same forecasts.
+Then compares forecasting a universe symbol by symbol with one batched
+rollout, as in PredictionService.predict_prices_batch. The NumPy runtime
+(lstm_runtime.NumpyLSTM, served from the model's .npz export) is timed
+alongside.
+
+Uses an untrained model of the production architecture; latency does not
+depend on the weights.
+
+Usage:
+    python -m benchmarks.bench_forecast [REPEATS]
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from src.services.lstm_model import create_lstm_model, create_rollout
+from src.services.lstm_runtime import NumpyLSTM
+from src.services.model_trainer import export_numpy_model
+
+
+LOOKBACK = 60
+HORIZONS = (1, 5, 30)
+BATCH_SYMBOLS = 100
+
+
+def predict_loop(model, window: np.ndarray, days: int) -> np.ndarray:
+    """The previous per-day loop of PredictionService.predict_prices."""
+    predictions = []
+    current_sequence = window.copy()
+    for _ in range(days):
+        X = current_sequence.reshape(1, LOOKBACK, 1)
+        pred_scaled = model.predict(X, verbose=0)[0, 0]
+        predictions.append(pred_scaled)
+        current_sequence = np.append(current_sequence[1:], [[pred_scaled]], axis=0)
+    return np.array(predictions)
+
+
+def best_of(fn, repeats: int) -> float:
+    """Fastest of several runs, in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def run(repeats: int = 5):
+    """Run the benchmark and print timings."""
+    model = create_lstm_model(LOOKBACK)
+    window = np.random.default_rng(0).uniform(0, 1, (LOOKBACK, 1)).astype(np.float32)
+    rollout = create_rollout(model, LOOKBACK)
+    with tempfile.TemporaryDirectory() as directory:
+        export_numpy_model(model, os.path.join(directory, "model.npz"))
+        runtime = NumpyLSTM.load(os.path.join(directory, "model.npz"))
+
+    start = time.perf_counter()
+    rollout(window[None], np.int32(1))
+    print(f"Rollout tracing (once per model): {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    print(f"{'Days':>5} {'predict loop':>14} {'rollout':>10} {'speedup':>8} {'max abs diff':>13} "
+          f"{'numpy':>10} {'max abs diff':>13}")
+    for days in HORIZONS:
+        expected = predict_loop(model, window, days)
+        actual = rollout(window[None], np.int32(days)).numpy()[0]
+        lean = runtime.rollout(window[None], days)[0]
+        loop_ms = best_of(lambda: predict_loop(model, window, days), repeats)
+        rollout_ms = best_of(lambda: rollout(window[None], np.int32(days)).numpy(), repeats)
+        numpy_ms = best_of(lambda: runtime.rollout(window[None], days), repeats)
+        print(f"{days:>5} {loop_ms:>11.1f} ms {rollout_ms:>7.1f} ms {loop_ms / rollout_ms:>7.1f}x "
+              f"{np.max(np.abs(actual - expected)):>13.2e} {numpy_ms:>7.1f} ms "
+              f"{np.max(np.abs(lean - expected)):>13.2e}")
+
+    windows = np.random.default_rng(1).uniform(0, 1, (BATCH_SYMBOLS, LOOKBACK, 1)).astype(np.float32)
+    one_by_one = best_of(lambda: [rollout(window[None], np.int32(5)).numpy() for window in windows], repeats)
+    batched = best_of(lambda: rollout(windows, np.int32(5)).numpy(), repeats)
+    numpy_batched = best_of(lambda: runtime.rollout(windows, 5), repeats)
+    print(f"\n5-day forecasts for {BATCH_SYMBOLS} symbols: {one_by_one:.0f} ms one by one, "
+          f"{batched:.0f} ms batched ({one_by_one / batched:.1f}x), {numpy_batched:.0f} ms batched with NumPy")
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:2]))
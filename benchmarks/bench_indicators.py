@@ -0,0 +1,68 @@
+"""
+Benchmark for computing indicators across a symbol universe.
+
+Compares calling calculate_all_indicators once per symbol with the batch
+path that aligns the universe into (dates x symbols) arrays and computes
+every indicator in one vectorized pass, then times screener queries against
+the resulting table.
+
+Usage:
+    python -m benchmarks.bench_indicators [SYMBOLS] [DAYS]
+"""
+import sys
+import time
+import numpy as np
+from benchmarks.bench_data_service import make_bars
+from src.services.screener import build_indicator_table, evaluate_expression
+from src.services.technical_indicators import (
+    calculate_all_indicators,
+    calculate_universe_indicators,
+    indicator_cache
+)
+
+
+SCREEN_QUERY = "rsi < 45 and close > ma_200 and crosses_above(macd_hist, 0)"
+
+
+def run(symbol_count: int = 500, days: int = 1250):
+    """Run the benchmark and print timings."""
+    frames = {f"BENCH{i}.NS": make_bars(days, i) for i in range(symbol_count)}
+    # Drop a few bars so the batch path also exercises missing-bar handling
+    for i, (symbol, bars) in enumerate(frames.items()):
+        if i % 10 == 0:
+            frames[symbol] = bars.drop(bars.index[days // 2])
+
+    indicator_cache.clear()
+    started = time.perf_counter()
+    per_symbol = {symbol: calculate_all_indicators(bars) for symbol, bars in frames.items()}
+    loop_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    table = calculate_universe_indicators(frames)
+    batch_elapsed = time.perf_counter() - started
+
+    mismatches = sum(
+        not np.isclose(round(table.loc[symbol, "RSI"], 2), result["rsi"]["current"])
+        for symbol, result in per_symbol.items()
+    )
+    print(f"{'per-symbol':>12}: {loop_elapsed:.2f}s ({loop_elapsed / symbol_count * 1000:.2f} ms/symbol)")
+    print(f"{'batch':>12}: {batch_elapsed:.2f}s ({batch_elapsed / symbol_count * 1000:.2f} ms/symbol)")
+    print(f"{'speedup':>12}: {loop_elapsed / batch_elapsed:.1f}x over {symbol_count} symbols x {days} days, "
+          f"{mismatches} RSI mismatches")
+
+    started = time.perf_counter()
+    screen_table = build_indicator_table(frames)
+    build_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(100):
+        matches = screen_table[evaluate_expression(SCREEN_QUERY, screen_table)]
+        matches = matches.sort_values("rsi")
+    query_elapsed = (time.perf_counter() - started) / 100
+    print(f"{'screener':>12}: table built in {build_elapsed:.2f}s, query in {query_elapsed * 1000:.2f} ms "
+          f"({len(matches)} matches for '{SCREEN_QUERY}')")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 1250
+    run(count, length)
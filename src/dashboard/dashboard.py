@@ -4,12 +4,20 @@ Main dashboard layout and orchestration.
 import streamlit as st
 from datetime import datetime
 from src.auth.auth_service import auth_service
+from src.services import data_service
 from src.services.data_service import (
-    get_stock_data, get_current_price, clear_cache, format_inr
+    get_stock_data, get_current_price, clear_cache, format_inr,
+    search_symbols, STOCK_SYMBOL_MAP
 )
+from src.services.symbol_index import symbol_index
 from src.services.sentiment_service import get_sentiment_analysis
 from src.services.prediction_service import get_price_predictions
-from src.services.technical_indicators import calculate_all_indicators
+from src.services.technical_indicators import (
+    calculate_all_indicators,
+    calculate_indicator_series,
+    calculate_pivot_points,
+    calculate_support_resistance
+)
 from src.services.exceptions import (
     InvalidSymbolError, NetworkError, APIRateLimitError, DataNotAvailableError
 )
@@ -20,6 +28,11 @@ from src.visualization.charts import (
 from src.visualization.ui_components import (
     create_section_header, create_alert, create_divider
 )
+from src.dashboard.screener_page import render_screener_page
+
+
+# Pivot timeframe labels and the bar timeframe each is based on
+PIVOT_TIMEFRAMES = {"Daily": "1d", "Weekly": "1wk", "Monthly": "1mo"}
 
 
 def render_sidebar():
@@ -33,6 +46,11 @@ def render_sidebar():
         
         create_divider()
         
+        # Page selection
+        st.radio("Page", ["Stock Analysis", "Screener"], key="page")
+        
+        create_divider()
+        
         # Refresh button
         if st.button("🔄 Refresh Data", use_container_width=True):
             clear_cache()
@@ -112,6 +130,10 @@ def render_stock_overview(stock_data: dict):
             "Volume",
             format_inr(stock_data['volume'])
         )
+    
+    as_of = datetime.fromisoformat(stock_data['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+    refreshing = " · refreshing in the background" if stock_data.get('stale') else ""
+    st.caption(f"Prices as of {as_of}{refreshing}")
 
 
 def render_sentiment_section(symbol: str):
@@ -190,6 +212,7 @@ def render_technical_indicators(symbol: str, data):
     try:
         with st.spinner("Calculating indicators..."):
             indicators = calculate_all_indicators(data)
+            series = calculate_indicator_series(data)
         
         # Moving Averages
         st.markdown("### Moving Averages")
@@ -212,7 +235,7 @@ def render_technical_indicators(symbol: str, data):
             st.metric("Current RSI", rsi.get('current', 'N/A'), rsi.get('signal', ''))
             
             if rsi.get('current'):
-                fig = create_technical_indicator_chart('RSI', data, rsi)
+                fig = create_technical_indicator_chart('RSI', data, rsi, series)
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
@@ -221,12 +244,35 @@ def render_technical_indicators(symbol: str, data):
             st.metric("MACD", macd.get('macd', 'N/A'), macd.get('trend', ''))
             
             if macd.get('macd'):
-                fig = create_technical_indicator_chart('MACD', data, macd)
+                fig = create_technical_indicator_chart('MACD', data, macd, series)
                 st.plotly_chart(fig, use_container_width=True)
         
+        # Volatility, momentum and trend strength
+        st.markdown("### Volatility & Trend Strength")
+        extended = indicators['extended']
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("ATR (14)", f"₹{extended['atr']}" if extended['atr'] is not None else "N/A")
+        with col2:
+            bands = extended['bollinger']
+            st.metric("Bollinger Upper", f"₹{bands['upper']}" if bands['upper'] is not None else "N/A",
+                      f"Lower ₹{bands['lower']}" if bands['lower'] is not None else None,
+                      delta_color="off")
+        with col3:
+            stochastic = extended['stochastic']
+            st.metric("Stochastic %K", stochastic['k'] if stochastic['k'] is not None else "N/A",
+                      stochastic['signal'], delta_color="off")
+        with col4:
+            adx = extended['adx']
+            st.metric("ADX", adx['adx'] if adx['adx'] is not None else "N/A", f"{adx['trend']} trend",
+                      delta_color="off")
+        
         # Support and Resistance
         st.markdown("### Support & Resistance Levels")
-        pivot = indicators['pivot_points']
+        timeframe = st.radio("Pivot timeframe", list(PIVOT_TIMEFRAMES), horizontal=True,
+                             key="pivot_timeframe")
+        pivot = calculate_pivot_points(data, PIVOT_TIMEFRAMES[timeframe])
         
         if pivot:
             col1, col2 = st.columns(2)
@@ -244,6 +290,20 @@ def render_technical_indicators(symbol: str, data):
                 st.write(f"S3: ₹{pivot.get('support_3', 'N/A')}")
             
             st.write(f"**Pivot Point:** ₹{pivot.get('pivot', 'N/A')}")
+        
+        # Zones where price has turned before
+        levels = calculate_support_resistance(data, PIVOT_TIMEFRAMES[timeframe])
+        st.markdown("**Price Zones** (swing highs and lows, weighted by touches and volume)")
+        col1, col2 = st.columns(2)
+        
+        for column, side in ((col1, 'resistance'), (col2, 'support')):
+            with column:
+                zones = levels[f'{side}_zones']
+                if not zones:
+                    st.write(f"No {side} zone found")
+                for zone in zones:
+                    st.write(f"{side.title()} ₹{zone['low']} – ₹{zone['high']} · {zone['touches']} touches · "
+                             f"strength {zone['strength']} · last {zone['last_touch'].strftime('%d %b %Y')}")
     
     except Exception as e:
         create_alert(f"Error calculating indicators: {str(e)}", "error")
@@ -254,6 +314,10 @@ def render_dashboard():
     # Render sidebar
     render_sidebar()
     
+    if st.session_state.get("page") == "Screener":
+        render_screener_page()
+        return
+    
     # Main content
     st.title("📈 Indian Stock Market Dashboard")
     st.markdown("Real-time analysis with AI-powered insights")
@@ -268,6 +332,24 @@ def render_dashboard():
         )
     with col2:
         search_button = st.button("🔍 Analyze", use_container_width=True, type="primary")
+
+    # Autocomplete from the local symbol master when the input is not an exact match.
+    # The master only lists the Nifty 100, so unless strict validation would reject
+    # the input anyway, it is kept as typed until a suggestion is picked.
+    if symbol and symbol.lower().strip() not in STOCK_SYMBOL_MAP and not symbol_index.resolve(symbol):
+        suggestions = search_symbols(symbol)
+        if suggestions:
+            typed = symbol
+            options = suggestions if data_service.STRICT_SYMBOL_VALIDATION else [None] + suggestions
+            choice = st.selectbox(
+                "Did you mean",
+                options,
+                format_func=lambda record: (f"{typed} (as typed)" if record is None
+                                            else f"{record['name']} ({record['symbol']})"),
+                key="symbol_suggestion"
+            )
+            if choice is not None:
+                symbol = choice['symbol']
     
     # If symbol is provided
     if symbol and (search_button or st.session_state.get('last_symbol') == symbol):
@@ -288,8 +370,12 @@ def render_dashboard():
             create_section_header("📊 Price Chart", "Historical price movement")
             indicators = calculate_all_indicators(historical_data)
             fig = create_price_chart(historical_data, indicators, 
-                                    title=f"{stock_data['name']} - Price History")
+                                    title=f"{stock_data['name']} - Price History",
+                                    series=calculate_indicator_series(historical_data))
             st.plotly_chart(fig, use_container_width=True)
+            if historical_data.attrs.get('as_of'):
+                bars_as_of = datetime.fromisoformat(historical_data.attrs['as_of'])
+                st.caption(f"Daily bars as of {bars_as_of.strftime('%Y-%m-%d %H:%M:%S')}")
             
             # Volume Chart
             fig_volume = create_volume_chart(historical_data)
@@ -0,0 +1,52 @@
+"""
+Stock screener page.
+"""
+import streamlit as st
+from src.services.exceptions import DataServiceError, InvalidQueryError
+from src.services.screener import screener
+from src.visualization.ui_components import create_alert, create_section_header
+
+
+EXAMPLE_QUERY = "rsi < 30 and close > ma_200 and crosses_above(macd_hist, 0)"
+
+DISPLAY_COLUMNS = ["name", "close", "change_pct", "rsi", "ma_50", "ma_200", "macd_hist"]
+
+
+def render_screener_page():
+    """Render the indicator screener."""
+    create_section_header("🔎 Stock Screener", "Filter the whole universe by technical indicators")
+
+    where = st.text_input("Filter", value=EXAMPLE_QUERY, key="screener_where",
+                          help="Columns: close, rsi, ma_20, ma_50, ma_200, macd, macd_signal, "
+                               "macd_hist, pivot, support_1..3, resistance_1..3, change_pct and "
+                               "prev_<column>. Combine with and/or/not; crosses_above(a, b) and "
+                               "crosses_below(a, b) compare with the previous bar.")
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_by = st.text_input("Sort by", value="rsi", key="screener_sort")
+    with col2:
+        descending = st.checkbox("Descending", value=False, key="screener_descending")
+    with col3:
+        limit = st.number_input("Max results", min_value=1, max_value=1000, value=50, key="screener_limit")
+
+    if st.button("Run screen", type="primary"):
+        try:
+            with st.spinner("Screening..."):
+                results = screener.screen(where, sort_by=sort_by or None, descending=descending,
+                                          limit=int(limit))
+        except InvalidQueryError as e:
+            create_alert(str(e), "error")
+            return
+        except DataServiceError as e:
+            create_alert(f"Unable to load market data: {e}", "error")
+            return
+
+        st.markdown(f"**{len(results)} matches**")
+        columns = list(DISPLAY_COLUMNS)
+        if sort_by in results.columns and sort_by not in columns:
+            columns.append(sort_by)
+        st.dataframe(results[columns].round(2), use_container_width=True)
+
+    if screener.built_at is not None:
+        st.caption(f"Indicators as of {screener.built_at.strftime('%Y-%m-%d %H:%M:%S')}"
+                   + (f" · {len(screener.errors)} symbols unavailable" if screener.errors else ""))
@@ -0,0 +1,84 @@
+"""
+Background refreshes for stale-while-revalidate caches.
+
+Expired cache entries are served immediately while a worker thread fetches
+the replacement, so page loads never wait on the upstream API.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Hashable, Optional
+
+
+class BackgroundRefresher:
+    """Small thread pool running at most one pending refresh per key."""
+
+    def __init__(self, name: str, max_workers: int = 4):
+        """Initialize the background refresher.
+
+        Args:
+            name: Name of the refresher, used for thread names and statistics
+            max_workers: Maximum number of concurrent refreshes
+        """
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Future] = {}
+        self._counters = {"scheduled": 0, "deduplicated": 0, "failed": 0}
+
+    def submit(self, key: Hashable, fn: Callable, *args, **kwargs) -> bool:
+        """Schedule a refresh unless one for the same key is already pending.
+
+        Errors raised by fn are logged and counted; the stale entry stays in
+        place until a later refresh succeeds.
+
+        Args:
+            key: Identity of the cache entry being refreshed
+            fn: Function performing the refresh
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            True if a new refresh was scheduled
+        """
+        with self._lock:
+            if key in self._pending:
+                self._counters["deduplicated"] += 1
+                return False
+            self._counters["scheduled"] += 1
+            future = self._executor.submit(self._run, key, fn, *args, **kwargs)
+            self._pending[key] = future
+            return True
+
+    def _run(self, key: Hashable, fn: Callable, *args, **kwargs):
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Background refresh of {key} failed: {e}")
+            with self._lock:
+                self._counters["failed"] += 1
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until every pending refresh has finished.
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures, timeout=timeout)
+
+    def stats(self) -> Dict:
+        """Get refresh counters.
+
+        Returns:
+            Dictionary with scheduled, deduplicated and failed refresh counts
+            and refreshes currently pending
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["pending"] = len(self._pending)
+        stats["name"] = self.name
+        return stats
@@ -0,0 +1,371 @@
+"""
+Pluggable cache backends shared by the data, sentiment and prediction caches.
+
+st.cache_data is private to one process. The SQLite backend keeps cached
+results in a local database file instead, so Streamlit replicas on the same
+host share every fetch and cached data survives restarts.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    """A cached value and the local time it was stored."""
+
+    value: Any
+    stored_at: datetime
+
+
+class CacheBackend(ABC):
+    """Key-value store for pickled results with TTL and size-based eviction."""
+
+    name = "base"
+
+    def __init__(self, max_bytes: int):
+        """Initialize the cache backend.
+
+        Args:
+            max_bytes: Total size of stored values above which the least
+                       recently used entries are evicted
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            CacheEntry, or None if the key is missing or has expired
+        """
+        found = self._get(key, time.time())
+        self._count("hits" if found is not None else "misses")
+        if found is None:
+            return None
+        payload, stored_at = found
+        return CacheEntry(pickle.loads(payload), datetime.fromtimestamp(stored_at))
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        """Store a value, evicting old entries if the cache is over its size limit.
+
+        Args:
+            key: Cache key
+            value: Picklable value
+            ttl_seconds: Seconds until the entry may be evicted
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        self._set(key, payload, now, now + ttl_seconds)
+        self._count("sets")
+        self._count("evictions", self._evict(now))
+
+    def stats(self) -> Dict:
+        """Get hit, miss, store and eviction counters plus current usage.
+
+        Returns:
+            Dictionary with counters, entry count and stored bytes
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        entries, size = self._usage()
+        stats.update({"name": self.name, "entries": entries, "bytes": size,
+                      "max_bytes": self.max_bytes})
+        return stats
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> Optional[tuple]:
+        """Return (payload, stored_at) for a live key, or None."""
+
+    @abstractmethod
+    def _set(self, key: str, payload: bytes, now: float, expires_at: float):
+        """Insert or replace a payload."""
+
+    @abstractmethod
+    def _evict(self, now: float) -> int:
+        """Drop expired entries, then least recently used ones over max_bytes."""
+
+    @abstractmethod
+    def _usage(self) -> tuple:
+        """Return (entry count, stored bytes)."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove one entry."""
+
+    @abstractmethod
+    def clear(self, prefix: str = ""):
+        """Remove every entry whose key starts with prefix (all entries by default)."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend (values are still pickled, so callers get copies)."""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+        self._data_lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> Optional[tuple]:
+        with self._data_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, stored_at, expires_at = entry
+            if expires_at <= now:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload, stored_at
+
+    def _set(self, key: str, payload: bytes, now: float, expires_at: float):
+        with self._data_lock:
+            self._drop(key)
+            self._entries[key] = (payload, now, expires_at)
+            self._size += len(payload)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def _evict(self, now: float) -> int:
+        evicted = 0
+        with self._data_lock:
+            for key in [k for k, e in self._entries.items() if e[2] <= now]:
+                self._drop(key)
+                evicted += 1
+            while self._size > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                evicted += 1
+        return evicted
+
+    def _usage(self) -> tuple:
+        with self._data_lock:
+            return len(self._entries), self._size
+
+    def delete(self, key: str):
+        with self._data_lock:
+            self._drop(key)
+
+    def clear(self, prefix: str = ""):
+        with self._data_lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._drop(key)
+
+
+# Entry count and total size are kept in cache_usage by triggers, so checking
+# the size limit reads one row instead of summing the table. Upserts (rather
+# than INSERT OR REPLACE) keep the triggers exact: replaced rows fire no
+# delete trigger.
+SQLITE_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,
+    stored_at REAL NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at);
+CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at);
+CREATE TABLE IF NOT EXISTS cache_usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_usage SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM cache;
+CREATE TRIGGER IF NOT EXISTS cache_usage_insert AFTER INSERT ON cache BEGIN
+    UPDATE cache_usage SET entries = entries + 1, bytes = bytes + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_usage_update AFTER UPDATE OF size ON cache BEGIN
+    UPDATE cache_usage SET bytes = bytes + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_usage_delete AFTER DELETE ON cache BEGIN
+    UPDATE cache_usage SET entries = entries - 1, bytes = bytes - OLD.size;
+END;
+COMMIT;
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache in a local SQLite file shared by every process on the host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "data/cache/shared_cache.sqlite",
+                 max_bytes: int = 256 * 1024 * 1024, access_resolution_seconds: float = 60):
+        """Initialize the SQLite backend.
+
+        Args:
+            path: Database file, created if missing
+            max_bytes: Total size of stored values before LRU eviction
+            access_resolution_seconds: A hit records its access time only if the
+                                       recorded one is older than this, so most
+                                       reads take no write lock
+        """
+        super().__init__(max_bytes)
+        self.path = path
+        self.access_resolution_seconds = access_resolution_seconds
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(SQLITE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (WAL mode lets readers and a writer overlap)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str, now: float) -> Optional[tuple]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at, accessed_at FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] >= self.access_resolution_seconds:
+                conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def _set(self, key: str, payload: bytes, now: float, expires_at: float):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO cache VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, stored_at = excluded.stored_at, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                (key, sqlite3.Binary(payload), len(payload), now, expires_at, now)
+            )
+
+    def _evict(self, now: float) -> int:
+        with self._connect() as conn:
+            evicted = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+            total = conn.execute("SELECT bytes FROM cache_usage").fetchone()[0]
+            if total <= self.max_bytes:
+                return evicted
+
+            stale = []
+            for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                if total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM cache WHERE key = ?", stale)
+        return evicted + len(stale)
+
+    def _usage(self) -> tuple:
+        with self._connect() as conn:
+            return conn.execute("SELECT entries, bytes FROM cache_usage").fetchone()
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = ""):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+
+def cache_key(namespace: str, *args, **kwargs) -> str:
+    """Build a backend key from a namespace and call arguments.
+
+    Arguments must have a faithful repr (strings, numbers, lists).
+    """
+    digest = hashlib.sha1(repr((args, sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def create_cache_backend_from_env() -> CacheBackend:
+    """Create the backend selected by environment variables.
+
+    CACHE_BACKEND selects "sqlite" (default) or "memory". CACHE_DB_PATH sets
+    the SQLite file and CACHE_MAX_MB the size limit for either backend.
+
+    Returns:
+        Configured CacheBackend
+    """
+    backend = os.getenv("CACHE_BACKEND", "sqlite").lower()
+    max_bytes = int(float(os.getenv("CACHE_MAX_MB", 256)) * 1024 * 1024)
+    if backend == "memory":
+        return MemoryCacheBackend(max_bytes)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown cache backend: {backend}")
+    return SQLiteCacheBackend(os.getenv("CACHE_DB_PATH", "data/cache/shared_cache.sqlite"), max_bytes)
+
+
+# Created on first use, so importing this module (e.g. in tests or tools that
+# set their own backend) never opens the shared database file
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend() -> CacheBackend:
+    """Get the active cache backend, creating it from the environment on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_cache_backend_from_env()
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend):
+    """Replace the active cache backend (e.g. for tests).
+
+    Args:
+        backend: Backend used by every shared cache from now on
+    """
+    global _backend
+    _backend = backend
+
+
+def shared_cache(ttl_seconds: float) -> Callable:
+    """Cache a function's results in the active backend with a fixed TTL.
+
+    The cached function also gets lookup(*args) returning the cached
+    CacheEntry or None without calling it.
+
+    Args:
+        ttl_seconds: Time to live in seconds
+
+    Returns:
+        Decorator producing the cached function (with a clear() method)
+    """
+    def decorator(fn: Callable) -> Callable:
+        namespace = f"{fn.__module__}.{fn.__qualname__}"
+
+        def lookup(*args, **kwargs) -> Optional[CacheEntry]:
+            return get_cache_backend().get(cache_key(namespace, *args, **kwargs))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = cache_key(namespace, *args, **kwargs)
+            entry = get_cache_backend().get(key)
+            if entry is not None:
+                return entry.value
+            value = fn(*args, **kwargs)
+            get_cache_backend().set(key, value, ttl_seconds)
+            return value
+
+        wrapper.clear = lambda: get_cache_backend().clear(namespace)
+        wrapper.lookup = lookup
+        return wrapper
+
+    return decorator
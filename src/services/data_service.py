@@ -1,18 +1,91 @@
 """
 Data service for fetching stock market data from Yahoo Finance.
+
+All upstream requests go through the active MarketDataProvider (yfinance by
+default, or recorded fixtures when MARKET_DATA_PROVIDER=replay).
 """
-import yfinance as yf
+import os
+import threading
 import pandas as pd
 import streamlit as st
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 import requests
+from yfinance.exceptions import YFRateLimitError
+from src.services.background_refresher import BackgroundRefresher
+from src.services.cache_backend import get_cache_backend, shared_cache
 from src.services.exceptions import (
+    CircuitOpenError,
+    DataServiceError,
     InvalidSymbolError,
     APIRateLimitError,
     NetworkError,
     DataNotAvailableError
 )
+from src.services.history_store import history_store
+from src.services.indicator_state import indicator_states
+from src.services.market_calendar import CLOSED_HOLD_SECONDS, market_hours_cache, nse_calendar
+from src.services.market_data_provider import HISTORY_COLUMNS, get_provider, period_start
+from src.services.single_flight import SingleFlight
+from src.services.symbol_index import symbol_index
+from src.services.upstream_guard import UpstreamGuard
+
+
+# Reject symbols missing from the symbol master before any upstream request.
+# The bundled master only lists the Nifty 100 and indices, so this is opt-in
+# (SYMBOL_VALIDATION=strict) for deployments shipping the full exchange lists.
+STRICT_SYMBOL_VALIDATION = os.getenv("SYMBOL_VALIDATION", "lenient").lower() == "strict"
+
+# During the session, stored history newer than this is served without an
+# upstream delta fetch (after the close it is served until the next open)
+HISTORY_REFRESH_SECONDS = 3600
+
+# Quotes built from history older than this fetch today's bar first
+QUOTE_REFRESH_SECONDS = 300
+
+# Every period is served as a slice of one canonical frame per symbol. The
+# canonical frame covers at least HISTORY_CANONICAL_PERIOD and is kept in memory
+# for HISTORY_CACHE_SECONDS during the session, or until the next open.
+HISTORY_CANONICAL_PERIOD = os.getenv("HISTORY_CANONICAL_PERIOD", "5y")
+HISTORY_CACHE_SECONDS = 3600
+
+# Canonical history per formatted symbol: {"data", "period", "loaded_at"}
+_history_frames: Dict[str, Dict] = {}
+_history_frames_lock = threading.Lock()
+
+# Quotes are rebuilt after QUOTE_CACHE_SECONDS during the session, or at the next open
+QUOTE_CACHE_SECONDS = 300
+
+# Quotes live in the shared cache backend, so every replica on the host reuses them
+QUOTE_CACHE_RETENTION_SECONDS = CLOSED_HOLD_SECONDS
+
+# Serve expired history frames and quotes at once and refresh them on a background
+# thread. DATA_STALE_WHILE_REVALIDATE=off makes callers wait for the upstream instead.
+STALE_WHILE_REVALIDATE = os.getenv("DATA_STALE_WHILE_REVALIDATE", "on").lower() not in ("0", "off", "false")
+data_refresher = BackgroundRefresher("data_refresh")
+
+# Coalesces concurrent upstream fetches for the same symbol across sessions
+data_flight = SingleFlight("data_service")
+
+
+def _is_transient(error: Exception) -> bool:
+    """Check whether an upstream error is throttling or a temporary outage."""
+    if isinstance(error, YFRateLimitError):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status == 429 or (status is not None and status >= 500)
+    # requests and curl network failures are both OSError subclasses
+    return isinstance(error, OSError)
+
+
+# Shared rate limiter, retry policy and circuit breaker for every Yahoo Finance call.
+# Configured through YF_RATE_LIMIT, YF_BURST, YF_MAX_RETRIES, YF_BACKOFF_BASE,
+# YF_BACKOFF_MAX, YF_BREAKER_THRESHOLD and YF_BREAKER_RESET_SECONDS.
+yahoo_guard = UpstreamGuard.from_env("Yahoo Finance", "YF", is_transient=_is_transient)
+
+# Last successfully fetched info per symbol, served while the upstream is throttling
+_last_known_info: Dict[str, Dict] = {}
 
 
 # Symbol mapping for common Indian stock names
@@ -62,6 +135,11 @@ def format_indian_stock_symbol(name: str) -> str:
     # Check if it's in our mapping
     if name_lower in STOCK_SYMBOL_MAP:
         return STOCK_SYMBOL_MAP[name_lower]
+
+    # Then the full symbol master (tickers, company names and aliases)
+    resolved = symbol_index.resolve(name)
+    if resolved:
+        return resolved
     
     # If already has .NS or .BO suffix, return as is
     if name.upper().endswith('.NS') or name.upper().endswith('.BO'):
@@ -75,9 +153,280 @@ def format_indian_stock_symbol(name: str) -> str:
     return f"{name.upper()}.NS"
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour for historical data
+def resolve_symbol(name: str) -> str:
+    """Resolve user input to a Yahoo Finance symbol without any network call.
+
+    Symbols missing from the symbol master are formatted as NSE tickers,
+    or rejected when SYMBOL_VALIDATION=strict.
+
+    Args:
+        name: Stock name, alias or symbol
+
+    Returns:
+        Formatted symbol
+
+    Raises:
+        InvalidSymbolError: If SYMBOL_VALIDATION=strict and the symbol is not
+                            in the symbol master
+    """
+    name_lower = name.lower().strip()
+    if name_lower in STOCK_SYMBOL_MAP:
+        return STOCK_SYMBOL_MAP[name_lower]
+
+    resolved = symbol_index.resolve(name)
+    if resolved:
+        return resolved
+
+    if not STRICT_SYMBOL_VALIDATION:
+        return format_indian_stock_symbol(name)
+
+    suggestions = [record["name"] for record in symbol_index.fuzzy_search(name, limit=3)]
+    hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+    raise InvalidSymbolError(f"Unknown stock symbol: {name}.{hint}")
+
+
+def search_symbols(query: str, limit: int = 8) -> List[Dict]:
+    """Autocomplete stock names and tickers from the symbol master.
+
+    Args:
+        query: Text typed into the search box
+        limit: Maximum number of suggestions
+
+    Returns:
+        Symbol records with ticker, name, exchanges and Yahoo symbol
+    """
+    if not query.strip():
+        return []
+    return symbol_index.search(query, limit)
+
+
+# Compact in-memory layout of daily bars: float64 prices, integer volume, no
+# corporate-action columns and an IST DatetimeIndex. Prices stay float64:
+# float32 loses paisa precision above ₹131,072 (e.g. MRF trades near ₹1.4 lakh).
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+COMPACT_COLUMNS = PRICE_COLUMNS + ['Volume']
+MARKET_TZ = 'Asia/Kolkata'
+HISTORY_INTERVAL = '1d'
+
+
+def _compact_history(data: pd.DataFrame) -> pd.DataFrame:
+    """Convert upstream or stored bars to the compact history layout.
+
+    Args:
+        data: Daily bars as returned by the provider or the history store
+
+    Returns:
+        DataFrame with Open, High, Low, Close (float64) and Volume (int64)
+    """
+    if data.empty:
+        return data
+
+    index = pd.DatetimeIndex(data.index)
+    in_layout = (list(data.columns) == COMPACT_COLUMNS
+                 and all(data[c].dtype == 'float64' for c in PRICE_COLUMNS)
+                 and data['Volume'].dtype == 'int64'
+                 and str(index.tz) == MARKET_TZ)
+    if in_layout:
+        return data
+
+    compact = data[COMPACT_COLUMNS].astype({c: 'float64' for c in PRICE_COLUMNS})
+    compact['Volume'] = compact['Volume'].fillna(0).astype('int64')
+    compact.index = index.tz_localize(MARKET_TZ) if index.tz is None else index.tz_convert(MARKET_TZ)
+    return compact
+
+
+def _tag_history(data: pd.DataFrame, formatted_symbol: str) -> pd.DataFrame:
+    """Record the symbol and bar interval in a frame's attrs.
+
+    Downstream caches (e.g. technical indicators) key on these instead of
+    hashing the bars. Slices of the frame inherit them.
+    """
+    data.attrs["symbol"] = formatted_symbol
+    data.attrs["interval"] = HISTORY_INTERVAL
+    return data
+
+
+def _load_stored(formatted_symbol: str) -> Optional[pd.DataFrame]:
+    """Load a symbol's stored history in the compact layout."""
+    stored = history_store.load(formatted_symbol)
+    return _compact_history(stored) if stored is not None else None
+
+
+def _fetch_history(formatted_symbol: str, **window) -> pd.DataFrame:
+    """Fetch bars for one symbol through the Yahoo guard, in the compact layout."""
+    return _compact_history(yahoo_guard.call(get_provider().history, formatted_symbol, **window))
+
+
+def _download_history(formatted_symbols: List[str], **window) -> Dict[str, pd.DataFrame]:
+    """Fetch bars for many symbols in one guarded request, in the compact layout."""
+    fetched = yahoo_guard.call(get_provider().download, formatted_symbols, **window)
+    return {symbol: _compact_history(bars) for symbol, bars in fetched.items()}
+
+
+def _slice_period(data: pd.DataFrame, start: Optional[pd.Timestamp]) -> pd.DataFrame:
+    """Restrict stored history to the bars inside a requested window."""
+    if start is None or data.empty:
+        return data
+    if data.index.tz is not None:
+        start = start.tz_localize(data.index.tz)
+    # Positional slice of a sorted index: shares memory with data instead of copying
+    return data.iloc[data.index.searchsorted(start):]
+
+
+def _covers_period(covered: str, period: str) -> bool:
+    """Check whether a frame loaded for one period contains another period."""
+    covered_start = period_start(covered)
+    if covered_start is None:
+        return True
+    start = period_start(period)
+    return start is not None and covered_start <= start
+
+
+def _load_history(formatted_symbol: str, period: str) -> pd.DataFrame:
+    """Load history from the local store, fetching only missing bars upstream.
+
+    Symbols whose stored partition already covers the requested window only
+    fetch bars from the last stored session onwards; partitions refreshed
+    within HISTORY_REFRESH_SECONDS are served straight from disk.
+
+    Args:
+        formatted_symbol: Formatted stock symbol
+        period: Time period for historical data
+
+    Returns:
+        DataFrame with historical stock data for the requested window
+    """
+    start = period_start(period)
+    stored = _load_stored(formatted_symbol) if history_store.covers(formatted_symbol, start) else None
+
+    try:
+        if stored is not None:
+            if history_store.is_fresh(formatted_symbol, HISTORY_REFRESH_SECONDS):
+                return _slice_period(stored, start)
+
+            last_session = stored.index[-1].strftime('%Y-%m-%d')
+            delta = _fetch_history(formatted_symbol, start=last_session)
+            merged = history_store.merge(formatted_symbol, delta, start)
+            return _slice_period(merged, start)
+
+        data = _fetch_history(formatted_symbol, period=period)
+
+    except Exception as e:
+        stored = stored if stored is not None else _load_stored(formatted_symbol)
+        if stored is None or not (isinstance(e, CircuitOpenError) or _is_transient(e)):
+            raise
+        # Serve the stored bars rather than failing while the upstream is throttling us
+        print(f"Serving stored history for {formatted_symbol}: {e}")
+        yahoo_guard.record_stale_served()
+        return _slice_period(stored, start)
+
+    if data.empty:
+        return data
+
+    merged = history_store.merge(formatted_symbol, data, start)
+    return _slice_period(merged, start)
+
+
+def _refresh_history_frame(formatted_symbol: str, load_period: str) -> pd.DataFrame:
+    """Load a symbol's history and make it the canonical in-memory frame.
+
+    The frame's attrs record the symbol, the bar interval and, as "as_of", when
+    its bars were last refreshed from the upstream API (ISO format).
+
+    Args:
+        formatted_symbol: Formatted stock symbol
+        load_period: Period the canonical frame should cover
+
+    Returns:
+        DataFrame with historical stock data for load_period
+    """
+    data = data_flight.do(("history", formatted_symbol, load_period),
+                          _load_history, formatted_symbol, load_period)
+    if data.empty:
+        return data
+
+    _tag_history(data, formatted_symbol)
+    data.attrs["as_of"] = (history_store.last_updated(formatted_symbol) or datetime.now()).isoformat()
+    with _history_frames_lock:
+        current = _history_frames.get(formatted_symbol)
+        # A background refresh must not replace a frame widened in the meantime
+        if current is None or _covers_period(load_period, current["period"]):
+            _history_frames[formatted_symbol] = {
+                "data": data,
+                "period": load_period,
+                "loaded_at": datetime.now()
+            }
+    return data
+
+
+def _get_history_frame(formatted_symbol: str, period: str) -> pd.DataFrame:
+    """Get the canonical in-memory history of a symbol covering a period.
+
+    One frame is kept per symbol, spanning the longest period requested so far
+    (at least HISTORY_CANONICAL_PERIOD), so shorter periods never trigger
+    separate downloads or hold duplicate copies of the same bars. An expired
+    frame is served as-is while it is refreshed in the background.
+
+    Args:
+        formatted_symbol: Formatted stock symbol
+        period: Time period the caller needs
+
+    Returns:
+        DataFrame reaching back at least to the start of period
+    """
+    with _history_frames_lock:
+        entry = _history_frames.get(formatted_symbol)
+
+    if entry is not None and _covers_period(entry["period"], period):
+        if nse_calendar.is_fresh(entry["loaded_at"], HISTORY_CACHE_SECONDS):
+            return entry["data"]
+        if STALE_WHILE_REVALIDATE:
+            data_refresher.submit(("history", formatted_symbol),
+                                  _refresh_history_frame, formatted_symbol, entry["period"])
+            return entry["data"]
+
+    load_period = HISTORY_CANONICAL_PERIOD
+    if entry is not None and not _covers_period(load_period, entry["period"]):
+        # Widen the cached frame rather than keeping a second one alongside it
+        load_period = entry["period"]
+    if not _covers_period(load_period, period):
+        load_period = period
+
+    return _refresh_history_frame(formatted_symbol, load_period)
+
+
+def history_memory_report() -> Dict[str, Dict]:
+    """Report memory held by the canonical history frames.
+
+    The baseline is the same bars in the upstream layout (float64 columns
+    including Dividends and Stock Splits), so saved_bytes is what the compact
+    layout saves per symbol.
+
+    Returns:
+        Dictionary mapping each formatted symbol to rows, bytes,
+        baseline_bytes and saved_bytes
+    """
+    with _history_frames_lock:
+        frames = {symbol: entry["data"] for symbol, entry in _history_frames.items()}
+
+    report = {}
+    for formatted_symbol, data in frames.items():
+        used = int(data.memory_usage(index=True, deep=True).sum())
+        baseline = len(data) * len(HISTORY_COLUMNS) * 8 + int(data.index.nbytes)
+        report[formatted_symbol] = {
+            "rows": len(data),
+            "bytes": used,
+            "baseline_bytes": baseline,
+            "saved_bytes": baseline - used
+        }
+    return report
+
+
 def get_stock_data(symbol: str, period: str = "1y") -> pd.DataFrame:
     """Fetch historical stock data from Yahoo Finance.
+
+    Periods are read-only slices of one cached history frame per symbol.
+    attrs["as_of"] holds the time the bars were last refreshed upstream.
     
     Args:
         symbol: Stock symbol (will be formatted for Indian stocks)
@@ -93,15 +442,14 @@ def get_stock_data(symbol: str, period: str = "1y") -> pd.DataFrame:
         DataNotAvailableError: If no data is available
     """
     try:
-        formatted_symbol = format_indian_stock_symbol(symbol)
-        stock = yf.Ticker(formatted_symbol)
-        data = stock.history(period=period)
-        
+        formatted_symbol = resolve_symbol(symbol)
+        data = _slice_period(_get_history_frame(formatted_symbol, period), period_start(period))
+
         if data.empty:
             raise DataNotAvailableError(f"No data available for symbol: {formatted_symbol}")
-        
+
         return data
-    
+
     except requests.exceptions.ConnectionError:
         raise NetworkError("Network connection issue. Please check your internet connection.")
     except requests.exceptions.Timeout:
@@ -110,64 +458,139 @@ def get_stock_data(symbol: str, period: str = "1y") -> pd.DataFrame:
         if e.response.status_code == 429:
             raise APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
         raise InvalidSymbolError(f"Invalid stock symbol: {symbol}")
-    except DataNotAvailableError:
+    except DataServiceError:
         raise
+    except YFRateLimitError:
+        raise APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
     except Exception as e:
         print(f"Error fetching stock data for {symbol}: {e}")
         raise InvalidSymbolError(f"Unable to fetch data for symbol: {symbol}")
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes for real-time data
-def get_current_price(symbol: str) -> Dict:
-    """Fetch current price and key metrics for a stock.
-    
+def _build_quote(formatted_symbol: str, hist: pd.DataFrame, name: str,
+                 prev_close: Optional[float]) -> Dict:
+    """Build a price quote from the latest bar of a history frame.
+
     Args:
-        symbol: Stock symbol (will be formatted for Indian stocks)
-    
+        formatted_symbol: Formatted stock symbol
+        hist: Recent daily bars, most recent last
+        name: Display name for the stock
+        prev_close: Previous session close used for the change percentage
+
     Returns:
         Dictionary with current price data
-        
-    Raises:
-        InvalidSymbolError: If symbol is invalid or not found
-        NetworkError: If network connectivity issues occur
-        DataNotAvailableError: If no data is available
+    """
+    current_price = float(hist['Close'].iloc[-1])
+    day_high = float(hist['High'].iloc[-1])
+    day_low = float(hist['Low'].iloc[-1])
+    volume = hist['Volume'].iloc[-1]
+    prev_close = float(prev_close) if prev_close else None
+
+    change_percent = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+
+    return {
+        "symbol": formatted_symbol,
+        "name": name,
+        "current_price": round(current_price, 2),
+        "day_high": round(day_high, 2),
+        "day_low": round(day_low, 2),
+        "volume": int(volume),
+        "change_percent": round(change_percent, 2),
+        "currency": "INR",
+        "bar_time": hist.index[-1].isoformat(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def _fetch_latest_bar(formatted_symbol: str) -> pd.DataFrame:
+    """Fetch today's daily bar and merge it into the history store.
+
+    While the upstream is throttling us an empty frame is returned, so the
+    quote falls back to the last stored bar.
     """
     try:
-        formatted_symbol = format_indian_stock_symbol(symbol)
-        stock = yf.Ticker(formatted_symbol)
-        
-        # Get current data
-        info = stock.info
-        hist = stock.history(period="1d")
-        
+        latest = _fetch_history(formatted_symbol, period="1d")
+    except Exception as e:
+        if not (isinstance(e, CircuitOpenError) or _is_transient(e)):
+            raise
+        yahoo_guard.record_stale_served()
+        return pd.DataFrame()
+    if not latest.empty:
+        history_store.merge(formatted_symbol, latest, period_start("1d"))
+    return latest
+
+
+def _fetch_info(formatted_symbol: str) -> Dict:
+    """Fetch the info record for a symbol, falling back to the last known one when throttled."""
+    try:
+        info = yahoo_guard.call(get_provider().info, formatted_symbol)
+    except Exception as e:
+        if formatted_symbol not in _last_known_info or \
+                not (isinstance(e, CircuitOpenError) or _is_transient(e)):
+            raise
+        yahoo_guard.record_stale_served()
+        return _last_known_info[formatted_symbol]
+
+    _last_known_info[formatted_symbol] = info
+    return info
+
+
+def _get_display_name(formatted_symbol: str) -> str:
+    """Look up the company name without any upstream request.
+
+    The name comes from the symbol master, else from an already cached
+    fundamentals record. Otherwise that record is fetched in the background,
+    so the slow .info request stays off the quote's critical path and later
+    quotes pick the name up.
+
+    Args:
+        formatted_symbol: Formatted stock symbol
+
+    Returns:
+        Company name, or the formatted symbol if it is not known yet
+    """
+    record = symbol_index.lookup(formatted_symbol)
+    if record:
+        return record["name"]
+
+    entry = get_stock_info.lookup(formatted_symbol)
+    if entry is not None:
+        return entry.value['name']
+
+    data_refresher.submit(("info", formatted_symbol), get_stock_info, formatted_symbol)
+    return formatted_symbol
+
+
+def _fetch_quote(formatted_symbol: str) -> Dict:
+    """Build a quote from the cached daily history and, if needed, today's bar.
+
+    The history is extended with a single lightweight fetch of today's bar
+    when it is older than QUOTE_REFRESH_SECONDS.
+
+    Args:
+        formatted_symbol: Formatted stock symbol
+
+    Returns:
+        Dictionary with current price data
+    """
+    try:
+        # Daily history is shared with the price chart, so this is usually a cache hit
+        hist = get_stock_data(formatted_symbol, period="1y")
+
+        # Only fetch today's bar if the stored history has not just been refreshed
+        if not history_store.is_fresh(formatted_symbol, QUOTE_REFRESH_SECONDS):
+            latest = data_flight.do(("latest_bar", formatted_symbol),
+                                    _fetch_latest_bar, formatted_symbol)
+            if not latest.empty:
+                hist = pd.concat([hist, latest])
+                hist = hist[~hist.index.duplicated(keep='last')]
+
         if hist.empty:
             raise DataNotAvailableError(f"No current data available for symbol: {formatted_symbol}")
-        
-        current_price = hist['Close'].iloc[-1]
-        day_high = hist['High'].iloc[-1]
-        day_low = hist['Low'].iloc[-1]
-        volume = hist['Volume'].iloc[-1]
-        
-        # Calculate percentage change
-        if len(hist) > 1:
-            prev_close = hist['Close'].iloc[-2]
-        else:
-            prev_close = info.get('previousClose', current_price)
-        
-        change_percent = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
-        
-        return {
-            "symbol": formatted_symbol,
-            "name": info.get('longName', formatted_symbol),
-            "current_price": round(current_price, 2),
-            "day_high": round(day_high, 2),
-            "day_low": round(day_low, 2),
-            "volume": int(volume),
-            "change_percent": round(change_percent, 2),
-            "currency": "INR",
-            "timestamp": datetime.now().isoformat()
-        }
-    
+
+        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else None
+        return _build_quote(formatted_symbol, hist, _get_display_name(formatted_symbol), prev_close)
+
     except requests.exceptions.ConnectionError:
         raise NetworkError("Network connection issue. Please check your internet connection.")
     except requests.exceptions.Timeout:
@@ -175,15 +598,59 @@ def get_current_price(symbol: str) -> Dict:
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 429:
             raise APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
-        raise InvalidSymbolError(f"Invalid stock symbol: {symbol}")
-    except DataNotAvailableError:
+        raise InvalidSymbolError(f"Invalid stock symbol: {formatted_symbol}")
+    except DataServiceError:
         raise
+    except YFRateLimitError:
+        raise APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
     except Exception as e:
-        print(f"Error fetching current price for {symbol}: {e}")
-        raise InvalidSymbolError(f"Unable to fetch data for symbol: {symbol}")
+        print(f"Error fetching current price for {formatted_symbol}: {e}")
+        raise InvalidSymbolError(f"Unable to fetch data for symbol: {formatted_symbol}")
+
+
+def _refresh_quote(formatted_symbol: str) -> Dict:
+    """Rebuild a symbol's quote and store it in the quote cache."""
+    quote = data_flight.do(("quote", formatted_symbol), _fetch_quote, formatted_symbol)
+    get_cache_backend().set(f"quote:{formatted_symbol}", quote, QUOTE_CACHE_RETENTION_SECONDS)
+    return quote
+
 
+def get_current_price(symbol: str) -> Dict:
+    """Fetch current price and key metrics for a stock.
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+    The quote is built from the cached daily history plus, when that history
+    is older than QUOTE_REFRESH_SECONDS, a single lightweight fetch of today's
+    bar. The company name comes from the symbol master or the cached
+    fundamentals record, never from a blocking .info request. An expired
+    quote is returned immediately while a fresh one is built in the background.
+    
+    Args:
+        symbol: Stock symbol (will be formatted for Indian stocks)
+    
+    Returns:
+        Dictionary with current price data. "timestamp" is when the quote was
+        built; "stale" is True while an expired quote is being refreshed.
+        
+    Raises:
+        InvalidSymbolError: If symbol is invalid or not found
+        NetworkError: If network connectivity issues occur
+        DataNotAvailableError: If no data is available
+    """
+    formatted_symbol = resolve_symbol(symbol)
+
+    entry = get_cache_backend().get(f"quote:{formatted_symbol}")
+
+    if entry is not None:
+        if nse_calendar.is_fresh(entry.stored_at, QUOTE_CACHE_SECONDS):
+            return dict(entry.value, stale=False)
+        if STALE_WHILE_REVALIDATE:
+            data_refresher.submit(("quote", formatted_symbol), _refresh_quote, formatted_symbol)
+            return dict(entry.value, stale=True)
+
+    return dict(_refresh_quote(formatted_symbol), stale=False)
+
+
+@shared_cache(ttl_seconds=86400)  # Fundamentals are refreshed once a day
 def get_stock_info(symbol: str) -> Dict:
     """Fetch additional stock information and metadata.
     
@@ -198,9 +665,8 @@ def get_stock_info(symbol: str) -> Dict:
         NetworkError: If network connectivity issues occur
     """
     try:
-        formatted_symbol = format_indian_stock_symbol(symbol)
-        stock = yf.Ticker(formatted_symbol)
-        info = stock.info
+        formatted_symbol = resolve_symbol(symbol)
+        info = data_flight.do(("info", formatted_symbol), _fetch_info, formatted_symbol)
         
         return {
             "symbol": formatted_symbol,
@@ -223,14 +689,206 @@ def get_stock_info(symbol: str) -> Dict:
         if e.response.status_code == 429:
             raise APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
         raise InvalidSymbolError(f"Invalid stock symbol: {symbol}")
+    except DataServiceError:
+        raise
+    except YFRateLimitError:
+        raise APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
     except Exception as e:
         print(f"Error fetching stock info for {symbol}: {e}")
         raise InvalidSymbolError(f"Unable to fetch data for symbol: {symbol}")
 
 
+def _to_service_error(error: Exception, symbol: str) -> DataServiceError:
+    """Translate an upstream exception into the matching data service error.
+
+    Args:
+        error: Exception raised while fetching data
+        symbol: Symbol the request was made for
+
+    Returns:
+        DataServiceError instance describing the failure
+    """
+    if isinstance(error, DataServiceError):
+        return error
+    if isinstance(error, YFRateLimitError):
+        return APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return NetworkError("Network connection issue. Please check your internet connection.")
+    if isinstance(error, requests.exceptions.Timeout):
+        return NetworkError("Request timed out. Please try again.")
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None \
+            and error.response.status_code == 429:
+        return APIRateLimitError("Rate limit exceeded. Please try again in a few minutes.")
+    return InvalidSymbolError(f"Unable to fetch data for symbol: {symbol}")
+
+
+def _all_succeeded(results: Dict[str, Any]) -> bool:
+    """Cache a batch only if no symbol failed, so transient errors are retried."""
+    return not any(isinstance(value, DataServiceError) for value in results.values())
+
+
+def _resolve_symbols(symbols: List[str]) -> tuple:
+    """Resolve many symbols, separating out the unknown ones.
+
+    Args:
+        symbols: Stock symbols or names
+
+    Returns:
+        Tuple of (requested symbol -> Yahoo symbol, requested symbol -> InvalidSymbolError)
+    """
+    formatted, rejected = {}, {}
+    for symbol in symbols:
+        try:
+            formatted[symbol] = resolve_symbol(symbol)
+        except InvalidSymbolError as e:
+            rejected[symbol] = e
+    return formatted, rejected
+
+
+@market_hours_cache(open_ttl=3600, cacheable=_all_succeeded)  # 1 hour in session, until the next open after close
+def get_stock_data_batch(symbols: List[str], period: str = "1y") -> Dict[str, Union[pd.DataFrame, DataServiceError]]:
+    """Fetch historical stock data for many symbols at once.
+
+    Symbols already held in the history store only download their missing
+    bars; the rest are fetched in a single multi-ticker request.
+
+    Args:
+        symbols: Stock symbols (will be formatted for Indian stocks)
+        period: Time period for historical data (default: 1y)
+
+    Returns:
+        Dictionary mapping each requested symbol to its DataFrame, or to the
+        DataServiceError (InvalidSymbolError, DataNotAvailableError, ...)
+        raised for that symbol alone
+    """
+    start = period_start(period)
+    results = {}
+    formatted, rejected = _resolve_symbols(symbols)
+
+    cold, stale = [], {}
+    for formatted_symbol in set(formatted.values()):
+        stored = _load_stored(formatted_symbol) if history_store.covers(formatted_symbol, start) else None
+        if stored is None:
+            cold.append(formatted_symbol)
+        elif history_store.is_fresh(formatted_symbol, HISTORY_REFRESH_SECONDS):
+            results[formatted_symbol] = _slice_period(_tag_history(stored, formatted_symbol), start)
+        else:
+            stale[formatted_symbol] = _tag_history(stored, formatted_symbol)
+
+    groups = []
+    if cold:
+        groups.append((cold, {"period": period}))
+    if stale:
+        last_session = min(stored.index[-1] for stored in stale.values())
+        groups.append((list(stale), {"start": last_session.strftime('%Y-%m-%d')}))
+
+    for group, window in groups:
+        try:
+            fetched = _download_history(group, **window)
+        except Exception as e:
+            print(f"Error fetching batch stock data: {e}")
+            for formatted_symbol in group:
+                if formatted_symbol in stale:
+                    # Stored history is still a valid answer without the newest bars
+                    results[formatted_symbol] = _slice_period(stale[formatted_symbol], start)
+                else:
+                    results[formatted_symbol] = _to_service_error(e, formatted_symbol)
+            continue
+
+        for formatted_symbol in group:
+            bars = fetched[formatted_symbol]
+            if bars.empty and formatted_symbol in cold:
+                results[formatted_symbol] = DataNotAvailableError(
+                    f"No data available for symbol: {formatted_symbol}"
+                )
+                continue
+            merged = _tag_history(history_store.merge(formatted_symbol, bars, start), formatted_symbol)
+            results[formatted_symbol] = _slice_period(merged, start)
+
+    return {symbol: rejected[symbol] if symbol in rejected else results[formatted[symbol]]
+            for symbol in symbols}
+
+
+@market_hours_cache(open_ttl=300, cacheable=_all_succeeded)  # 5 minutes in session, until the next open after close
+def get_current_prices(symbols: List[str]) -> Dict[str, Union[Dict, DataServiceError]]:
+    """Fetch current price and key metrics for many symbols at once.
+
+    Args:
+        symbols: Stock symbols (will be formatted for Indian stocks)
+
+    Returns:
+        Dictionary mapping each requested symbol to its price data, or to the
+        DataServiceError raised for that symbol alone
+    """
+    formatted, results = _resolve_symbols(symbols)
+    unique_symbols = sorted(set(formatted.values()))
+    if not unique_symbols:
+        return results
+
+    try:
+        fetched = _download_history(unique_symbols, period="5d")
+    except Exception as e:
+        print(f"Error fetching batch prices: {e}")
+        results.update({symbol: _to_service_error(e, symbol) for symbol in formatted})
+        return results
+
+    for symbol, formatted_symbol in formatted.items():
+        hist = fetched[formatted_symbol]
+        if hist.empty:
+            results[symbol] = DataNotAvailableError(
+                f"No current data available for symbol: {formatted_symbol}"
+            )
+            continue
+        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else None
+        record = symbol_index.lookup(formatted_symbol)
+        name = record["name"] if record else formatted_symbol
+        results[symbol] = _build_quote(formatted_symbol, hist, name, prev_close)
+
+    return {symbol: results[symbol] for symbol in symbols}
+
+
+def get_live_indicators(symbols: List[str]) -> Dict[str, Union[Dict, DataServiceError]]:
+    """Get current indicator values for a watchlist from the live quotes.
+
+    Each symbol's streaming indicator state is brought up to date with its
+    cached daily history (only unseen bars are replayed), then the quote is
+    applied as the latest bar in O(1).
+
+    Args:
+        symbols: Stock symbols (will be formatted for Indian stocks)
+
+    Returns:
+        Dictionary mapping each requested symbol to its indicator values
+        (MA_<period>, RSI, MACD, MACD_signal, MACD_hist, as_of), or to the
+        DataServiceError raised for that symbol alone
+    """
+    results = {}
+    for symbol, quote in get_current_prices(symbols).items():
+        if isinstance(quote, DataServiceError):
+            results[symbol] = quote
+            continue
+        formatted_symbol = quote["symbol"]
+        try:
+            state = indicator_states.sync(formatted_symbol, get_stock_data(formatted_symbol, period="1y"))
+        except DataServiceError as e:
+            results[symbol] = e
+            continue
+        if quote.get("bar_time") is not None:
+            results[symbol] = indicator_states.update(formatted_symbol, quote["bar_time"],
+                                                      quote["current_price"])
+        else:
+            results[symbol] = state.values()
+    return results
+
+
 def clear_cache():
     """Clear all cached data for refresh functionality."""
     st.cache_data.clear()
+    with _history_frames_lock:
+        _history_frames.clear()
+    indicator_states.clear()
+    get_cache_backend().clear()
+    history_store.invalidate()
 
 
 def format_inr(amount: float) -> str:
@@ -26,3 +26,13 @@ class NetworkError(DataServiceError):
 class DataNotAvailableError(DataServiceError):
     """Raised when data is not available for the requested symbol."""
     pass
+
+
+class CircuitOpenError(APIRateLimitError):
+    """Raised when upstream calls are suspended because the API is throttling us."""
+    pass
+
+
+class InvalidQueryError(DataServiceError):
+    """Raised when a screener expression cannot be parsed or evaluated."""
+    pass
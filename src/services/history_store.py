@@ -0,0 +1,245 @@
+"""
+Persistent on-disk store for daily OHLCV history.
+
+Each symbol is kept in its own Parquet partition so that only bars newer than
+the last stored timestamp have to be fetched from the upstream API. The
+symbol's streaming indicator state is saved alongside it.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import pandas as pd
+from src.services.market_calendar import nse_calendar
+
+
+def _write_atomically(path: str, write: Callable[[str], None]):
+    """Write a file under a temporary name and rename it into place.
+
+    Readers (including other replicas sharing the store) see either the old
+    or the new file, never a partially written one.
+
+    Args:
+        path: Destination path
+        write: Function writing the content to the path it is given
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_json(path: str, data: Dict):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+class HistoryStore:
+    """Columnar per-symbol storage for historical price data."""
+
+    def __init__(self, store_dir: str = "data/cache/history"):
+        """Initialize the history store.
+
+        Args:
+            store_dir: Directory holding one Parquet file per symbol
+        """
+        self.store_dir = store_dir
+        self._lock = threading.Lock()
+        self._invalidated_at = datetime.min
+
+    def _symbol_key(self, symbol: str) -> str:
+        """Convert a symbol to a filesystem-safe partition name."""
+        return symbol.upper().replace('.', '_').replace('^', 'IDX_')
+
+    def _data_path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{self._symbol_key(symbol)}.parquet")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{self._symbol_key(symbol)}.json")
+
+    def _indicator_state_path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{self._symbol_key(symbol)}.indicators.json")
+
+    def _load_meta(self, symbol: str) -> Dict:
+        """Load partition metadata (coverage and last update time)."""
+        try:
+            with open(self._meta_path(symbol), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def load(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Load the stored history for a symbol.
+
+        Args:
+            symbol: Formatted stock symbol
+
+        Returns:
+            DataFrame with stored history, or None if nothing is stored
+        """
+        try:
+            data = pd.read_parquet(self._data_path(symbol))
+            return data if not data.empty else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading stored history for {symbol}: {e}")
+            return None
+
+    def covers(self, symbol: str, start: Optional[pd.Timestamp]) -> bool:
+        """Check whether the stored history reaches back to a start date.
+
+        Args:
+            symbol: Formatted stock symbol
+            start: Earliest date required, or None for the full history
+
+        Returns:
+            True if the stored partition already covers the requested window
+        """
+        covered_from = self._load_meta(symbol).get("covered_from")
+        if covered_from is None:
+            return False
+        if covered_from == "max":
+            return True
+        if start is None:
+            return False
+        return pd.Timestamp(covered_from) <= start.tz_localize(None)
+
+    def last_updated(self, symbol: str) -> Optional[datetime]:
+        """Get the time of the last upstream refresh of a partition.
+
+        Args:
+            symbol: Formatted stock symbol
+
+        Returns:
+            Local time of the last merge, or None if nothing is stored
+        """
+        updated_at = self._load_meta(symbol).get("updated_at")
+        return datetime.fromisoformat(updated_at) if updated_at is not None else None
+
+    def is_fresh(self, symbol: str, max_age_seconds: float) -> bool:
+        """Check whether the stored partition was refreshed recently.
+
+        A partition refreshed after the last NSE session ended stays fresh
+        until the next session opens.
+
+        Args:
+            symbol: Formatted stock symbol
+            max_age_seconds: Maximum age of the last upstream refresh while
+                             the market is open
+
+        Returns:
+            True if the partition can be served without an upstream fetch
+        """
+        updated_at = self.last_updated(symbol)
+        if updated_at is None or updated_at <= self._invalidated_at:
+            return False
+        return nse_calendar.is_fresh(updated_at, max_age_seconds)
+
+    def invalidate(self):
+        """Force the next read of every partition to check upstream for new bars."""
+        self._invalidated_at = datetime.now()
+
+    def merge(self, symbol: str, new_data: pd.DataFrame,
+              start: Optional[pd.Timestamp]) -> pd.DataFrame:
+        """Merge freshly fetched bars into the stored history and persist it.
+
+        Bars that overlap existing timestamps replace the stored ones, so a
+        partially formed bar for the current session is always refreshed.
+
+        Args:
+            symbol: Formatted stock symbol
+            new_data: Newly fetched bars
+            start: Start of the window the fetch covered, or None for full history
+
+        Returns:
+            The merged history
+        """
+        with self._lock:
+            stored = self.load(symbol)
+            if stored is None or stored.empty:
+                merged = new_data
+            elif new_data.empty:
+                merged = stored
+            else:
+                merged = pd.concat([stored, new_data])
+                merged = merged[~merged.index.duplicated(keep='last')]
+            merged = merged.sort_index()
+
+            meta = self._load_meta(symbol)
+            covered_from = meta.get("covered_from")
+            if start is None:
+                covered_from = "max"
+            elif covered_from != "max":
+                requested = start.tz_localize(None)
+                if covered_from is None or requested < pd.Timestamp(covered_from):
+                    covered_from = requested.isoformat()
+
+            try:
+                os.makedirs(self.store_dir, exist_ok=True)
+                _write_atomically(self._data_path(symbol), merged.to_parquet)
+                _write_atomically(self._meta_path(symbol), lambda path: _write_json(path, {
+                    "covered_from": covered_from,
+                    "updated_at": datetime.now().isoformat()
+                }))
+            except Exception as e:
+                print(f"Error writing stored history for {symbol}: {e}")
+
+            return merged
+
+    def load_indicator_state(self, symbol: str) -> Optional[Dict]:
+        """Load the saved streaming indicator state for a symbol.
+
+        Args:
+            symbol: Formatted stock symbol
+
+        Returns:
+            Serialized state, or None if nothing is saved
+        """
+        try:
+            with open(self._indicator_state_path(symbol), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_indicator_state(self, symbol: str, state: Dict):
+        """Save a symbol's streaming indicator state next to its history.
+
+        Args:
+            symbol: Formatted stock symbol
+            state: JSON-serializable state
+        """
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            _write_atomically(self._indicator_state_path(symbol), lambda path: _write_json(path, state))
+        except Exception as e:
+            print(f"Error writing indicator state for {symbol}: {e}")
+
+    def clear(self, symbol: Optional[str] = None):
+        """Remove stored history for one symbol, or for every symbol.
+
+        Args:
+            symbol: Formatted stock symbol, or None to clear the whole store
+        """
+        with self._lock:
+            if symbol is not None:
+                paths = [self._data_path(symbol), self._meta_path(symbol),
+                         self._indicator_state_path(symbol)]
+            elif os.path.isdir(self.store_dir):
+                paths = [os.path.join(self.store_dir, f) for f in os.listdir(self.store_dir)]
+            else:
+                paths = []
+
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+# Global instance
+history_store = HistoryStore()
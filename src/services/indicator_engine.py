@@ -0,0 +1,560 @@
+"""
+Vectorized indicator engine.
+
+Computes every requested indicator series from one float64 copy of the close
+array and returns them as columns of a single frame, so the metric cards and
+the charts share one computation. Definitions match the `ta` library.
+
+The kernels work along the first axis, so a (dates x symbols) array of a
+whole universe is processed in the same single pass as one symbol.
+"""
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+PIVOT_LEVELS = ['pivot', 'resistance_1', 'resistance_2', 'resistance_3',
+                'support_1', 'support_2', 'support_3']
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _rows(x: np.ndarray) -> np.ndarray:
+    """Row numbers shaped to broadcast against x along the first axis."""
+    return np.arange(x.shape[0]).reshape((-1,) + (1,) * (x.ndim - 1))
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """Row of the first non-NaN value of each column (0 for all-NaN columns)."""
+    return np.argmax(~np.isnan(x), axis=0)
+
+
+def forward_fill(values) -> np.ndarray:
+    """Carry the last observation forward over NaNs along the first axis.
+
+    Leading NaNs are kept.
+
+    Args:
+        values: 1-D series or 2-D (dates x symbols) array
+
+    Returns:
+        Filled float64 array
+    """
+    x = _as_float(values)
+    if x.shape[0] == 0:
+        return x.copy()
+    source = np.where(np.isnan(x), 0, _rows(x))
+    np.maximum.accumulate(source, axis=0, out=source)
+    return np.take_along_axis(x, source, axis=0)
+
+
+def ema(values, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """Exponential moving average, equivalent to pandas ewm(adjust=False).
+
+    The recursion y[t] = alpha * x[t] + (1 - alpha) * y[t-1] runs as a single
+    IIR filter along the first axis, starting at each column's first non-NaN
+    value. Interior gaps are carried forward.
+
+    Args:
+        values: 1-D series or 2-D (dates x symbols) array
+        alpha: Smoothing factor (2 / (span + 1) for a span, 1 / n for Wilder)
+        min_periods: Observations required before a value is produced
+
+    Returns:
+        Array shaped like values, NaN where undefined
+    """
+    x = _as_float(values)
+    if x.shape[0] == 0:
+        return x.copy()
+
+    if np.isnan(x).any():
+        # Seeding the leading gap with the first observation makes the filter
+        # output start exactly there
+        first = _first_valid(x)
+        filled = forward_fill(x)
+        filled = np.where(np.isnan(filled), np.take_along_axis(x, np.expand_dims(first, 0), axis=0), filled)
+    else:
+        first, filled = 0, x
+
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], filled, axis=0, zi=(1.0 - alpha) * filled[:1])
+    out[np.broadcast_to(_rows(x) < first + max(min_periods - 1, 0), x.shape)] = np.nan
+    return out
+
+
+def sma(values, window: int) -> np.ndarray:
+    """Simple moving average, equivalent to pandas rolling(window).mean().
+
+    Args:
+        values: 1-D series or 2-D (dates x symbols) array
+        window: Number of observations per average
+
+    Returns:
+        Array shaped like values, NaN until a full window is available or
+        while the window contains a NaN
+    """
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if window <= 0 or x.shape[0] < window:
+        return out
+
+    missing = np.isnan(x)
+    start = np.zeros((1,) + x.shape[1:])
+    sums = np.concatenate((start, np.cumsum(np.where(missing, 0.0, x), axis=0)))
+    gaps = np.concatenate((start, np.cumsum(missing, axis=0)))
+    means = (sums[window:] - sums[:-window]) / window
+    means[(gaps[window:] - gaps[:-window]) > 0] = np.nan
+    out[window - 1:] = means
+    return out
+
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing.
+
+    Args:
+        close: Closing prices (1-D, or 2-D dates x symbols)
+        window: Lookback window
+
+    Returns:
+        RSI values in [0, 100]; 100 where there were no down moves
+    """
+    x = _as_float(close)
+    diff = np.diff(x, axis=0, prepend=np.nan)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    # Smoothing starts at each column's first close, not at the top of the array
+    before_first = np.broadcast_to(_rows(x) < _first_valid(x), x.shape)
+    up[before_first] = np.nan
+    down[before_first] = np.nan
+
+    avg_up = ema(up, 1.0 / window, window)
+    avg_down = ema(down, 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        strength = avg_up / avg_down
+        return np.where(avg_down == 0, 100.0, 100.0 - 100.0 / (1.0 + strength))
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """Moving Average Convergence Divergence.
+
+    Args:
+        close: Closing prices (1-D, or 2-D dates x symbols)
+        fast: Fast EMA span
+        slow: Slow EMA span
+        signal: Signal line EMA span
+
+    Returns:
+        Tuple of (macd line, signal line, histogram) arrays
+    """
+    x = _as_float(close)
+    line = ema(x, 2.0 / (fast + 1), fast) - ema(x, 2.0 / (slow + 1), slow)
+    signal_line = ema(line, 2.0 / (signal + 1), signal)
+    return line, signal_line, line - signal_line
+
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    """Previous row of x (NaN for the first row)."""
+    shifted = np.empty_like(x)
+    shifted[:1] = np.nan
+    shifted[1:] = x[:-1]
+    return shifted
+
+
+def _rolling_extreme(x: np.ndarray, window: int, extreme: np.ufunc, identity: float) -> np.ndarray:
+    """Rolling min or max in O(n) regardless of the window (van Herk/Gil-Werman).
+
+    The rows are cut into blocks of `window`; every window spans the tail of
+    one block and the head of the next, so it is the extreme of a suffix
+    scan and a prefix scan.
+    """
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    if not 0 < window <= n:
+        return out
+    blocks = -(-n // window)
+    padded = np.concatenate((x, np.full((blocks * window - n,) + x.shape[1:], identity)))
+    shaped = padded.reshape((blocks, window) + x.shape[1:])
+    prefix = extreme.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = extreme.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    out[window - 1:] = extreme(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    """Rolling minimum, equivalent to pandas rolling(window).min()."""
+    return _rolling_extreme(_as_float(values), window, np.minimum, np.inf)
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """Rolling maximum, equivalent to pandas rolling(window).max()."""
+    return _rolling_extreme(_as_float(values), window, np.maximum, -np.inf)
+
+
+def rolling_std(values, window: int) -> np.ndarray:
+    """Rolling population standard deviation, equivalent to pandas rolling(window).std(ddof=0).
+
+    Squared deviations from each window's mean are summed one lag at a time,
+    which avoids the cancellation of the sum-of-squares shortcut.
+    """
+    x = _as_float(values)
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    if not 0 < window <= n:
+        return out
+    mean = sma(x, window)[window - 1:]
+    total = np.zeros(mean.shape)
+    for lag in range(window):
+        total += (x[window - 1 - lag:n - lag] - mean) ** 2
+    out[window - 1:] = np.sqrt(total / window)
+    return out
+
+
+def _recurse(values: np.ndarray, start: int, seed, decay: float, gain: float) -> np.ndarray:
+    """Run y[t] = decay * y[t-1] + gain * x[t] from y[start] = seed along the first axis."""
+    out = np.full(values.shape, np.nan)
+    if start >= values.shape[0]:
+        return out
+    out[start] = seed
+    if start + 1 < values.shape[0]:
+        zi = np.reshape(decay * np.asarray(seed), (1,) + values.shape[1:])
+        out[start + 1:], _ = lfilter([gain], [1.0, -decay], values[start + 1:], axis=0, zi=zi)
+    return out
+
+
+def bollinger_bands(close, window: int = 20, window_dev: float = 2) -> tuple:
+    """Bollinger Bands.
+
+    Args:
+        close: Closing prices
+        window: Moving average window
+        window_dev: Band width in population standard deviations
+
+    Returns:
+        Tuple of (middle, upper, lower) band arrays
+    """
+    x = _as_float(close)
+    middle = sma(x, window)
+    deviation = window_dev * rolling_std(x, window)
+    return middle, middle + deviation, middle - deviation
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range: the bar's range extended to the previous close (high - low on the first bar)."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = _shift(close)
+    return np.fmax(high, prev_close) - np.fmin(low, prev_close)
+
+
+def atr(high, low, close, window: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing, seeded with the mean of the first window.
+
+    Args:
+        high: Bar highs
+        low: Bar lows
+        close: Closing prices
+        window: Smoothing window
+
+    Returns:
+        ATR values, NaN for the first window - 1 bars
+    """
+    tr = true_range(high, low, close)
+    if tr.shape[0] < window:
+        return np.full(tr.shape, np.nan)
+    seed = tr[:window].mean(axis=0)
+    return _recurse(tr, window - 1, seed, (window - 1) / window, 1.0 / window)
+
+
+def vwap(high, low, close, volume, window: int = 14) -> np.ndarray:
+    """Rolling volume-weighted average of the typical price (high + low + close) / 3.
+
+    Args:
+        high: Bar highs
+        low: Bar lows
+        close: Closing prices
+        volume: Bar volumes
+        window: Number of bars per average
+
+    Returns:
+        VWAP values, NaN until a full window is available
+    """
+    typical = (_as_float(high) + _as_float(low) + _as_float(close)) / 3.0
+    volume = _as_float(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sma(typical * volume, window) / sma(volume, window)
+
+
+def stochastic(high, low, close, window: int = 14, smooth_window: int = 3) -> tuple:
+    """Stochastic oscillator.
+
+    Args:
+        high: Bar highs
+        low: Bar lows
+        close: Closing prices
+        window: Lookback window for the high-low range
+        smooth_window: Moving average window of the signal line
+
+    Returns:
+        Tuple of (%K, %D) arrays
+    """
+    lowest = rolling_min(low, window)
+    highest = rolling_max(high, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = 100.0 * (_as_float(close) - lowest) / (highest - lowest)
+    return k, sma(k, smooth_window)
+
+
+def adx(high, low, close, window: int = 14) -> tuple:
+    """Average Directional Index with the plus and minus directional indicators.
+
+    Directional movement and true range are Wilder-summed from bar 1; the
+    indicators start at bar `window` and ADX, the Wilder average of DX, at
+    bar 2 * window - 1.
+
+    Args:
+        high: Bar highs
+        low: Bar lows
+        close: Closing prices
+        window: Smoothing window
+
+    Returns:
+        Tuple of (ADX, +DI, -DI) arrays
+    """
+    high, low = _as_float(high), _as_float(low)
+    nan = np.full(high.shape, np.nan)
+    if high.shape[0] <= window:
+        return nan, nan.copy(), nan.copy()
+
+    up = high - _shift(high)
+    down = _shift(low) - low
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    tr = true_range(high, low, close)
+
+    decay = 1.0 - 1.0 / window
+    smoothed = [_recurse(x, window, x[1:window + 1].sum(axis=0), decay, 1.0)
+                for x in (tr, plus_dm, minus_dm)]
+    tr_sum, plus_sum, minus_sum = smoothed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = np.where(tr_sum != 0, 100.0 * plus_sum / tr_sum, 0.0)
+        minus_di = np.where(tr_sum != 0, 100.0 * minus_sum / tr_sum, 0.0)
+        total = plus_di + minus_di
+        dx = np.where(total != 0, 100.0 * np.abs(plus_di - minus_di) / total, 0.0)
+    plus_di[:window] = minus_di[:window] = dx[:window] = np.nan
+
+    start = 2 * window - 1
+    if start >= dx.shape[0]:
+        return nan, plus_di, minus_di
+    adx_values = _recurse(dx, start, dx[window:start + 1].mean(axis=0), decay, 1.0 / window)
+    return adx_values, plus_di, minus_di
+
+
+def obv(close, volume) -> np.ndarray:
+    """On-balance volume: cumulative volume, subtracted on bars that close lower.
+
+    As in `ta`, unchanged closes and the first bar add their volume.
+
+    Args:
+        close: Closing prices
+        volume: Bar volumes
+
+    Returns:
+        OBV values
+    """
+    close, volume = _as_float(close), _as_float(volume)
+    return np.cumsum(np.where(close < _shift(close), -volume, volume), axis=0)
+
+
+def swing_points(high, low, order: int = 5) -> tuple:
+    """Find swing highs and lows: bars whose high (low) is the extreme of the
+    `order` bars on either side.
+
+    Centered extremes are the trailing rolling extremes of 2 * order + 1 bars
+    shifted back by `order`, so detection is O(n) for any order. On a flat
+    top (or bottom) only the first bar counts. The last `order` bars cannot
+    be confirmed yet and are never swings.
+
+    Args:
+        high: High prices
+        low: Low prices
+        order: Bars on each side a swing must dominate
+
+    Returns:
+        Tuple of (is_swing_high, is_swing_low) boolean arrays
+    """
+    high, low = _as_float(high), _as_float(low)
+    n, span = high.shape[0], 2 * order + 1
+    is_high, is_low = np.zeros(high.shape, dtype=bool), np.zeros(low.shape, dtype=bool)
+    if order < 1 or n < span:
+        return is_high, is_low
+
+    center = slice(order, n - order)
+    # Extremes of the bars before each center, which must be strictly beaten
+    before = slice(order - 1, n - order - 1)
+    with np.errstate(invalid='ignore'):
+        is_high[center] = (high[center] == rolling_max(high, span)[span - 1:]) \
+            & (high[center] > rolling_max(high, order)[before])
+        is_low[center] = (low[center] == rolling_min(low, span)[span - 1:]) \
+            & (low[center] < rolling_min(low, order)[before])
+    return is_high, is_low
+
+
+def compute_indicator_frame(data: pd.DataFrame, ma_periods: Iterable[int] = (20, 50, 200),
+                            rsi_window: int = 14, macd_windows: tuple = (12, 26, 9)) -> pd.DataFrame:
+    """Compute every indicator series for a frame of daily bars.
+
+    Args:
+        data: DataFrame with a Close column
+        ma_periods: Simple moving average windows
+        rsi_window: RSI lookback window
+        macd_windows: MACD (fast, slow, signal) spans
+
+    Returns:
+        DataFrame indexed like data with MA_<n>, RSI, MACD, MACD_signal and
+        MACD_hist columns
+    """
+    close = _as_float(data['Close'])
+    columns = {f"MA_{period}": sma(close, period) for period in ma_periods}
+    columns["RSI"] = rsi(close, rsi_window)
+    columns["MACD"], columns["MACD_signal"], columns["MACD_hist"] = macd(close, *macd_windows)
+    return pd.DataFrame(columns, index=data.index)
+
+
+def compute_extended_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Compute the volatility, volume and trend-strength indicator series.
+
+    Args:
+        data: DataFrame with High, Low, Close and Volume columns
+
+    Returns:
+        DataFrame indexed like data with BB_middle, BB_upper, BB_lower, ATR,
+        VWAP, STOCH_K, STOCH_D, ADX, ADX_pos, ADX_neg and OBV columns
+    """
+    high, low, close = _as_float(data['High']), _as_float(data['Low']), _as_float(data['Close'])
+    volume = _as_float(data['Volume'])
+    columns = {}
+    columns["BB_middle"], columns["BB_upper"], columns["BB_lower"] = bollinger_bands(close)
+    columns["ATR"] = atr(high, low, close)
+    columns["VWAP"] = vwap(high, low, close, volume)
+    columns["STOCH_K"], columns["STOCH_D"] = stochastic(high, low, close)
+    columns["ADX"], columns["ADX_pos"], columns["ADX_neg"] = adx(high, low, close)
+    columns["OBV"] = obv(close, volume)
+    return pd.DataFrame(columns, index=data.index)
+
+
+def pivot_levels(high, low, close) -> Dict[str, np.ndarray]:
+    """Classic floor-trader pivot point with three support and resistance levels.
+
+    Args:
+        high: Bar high (scalar or array)
+        low: Bar low
+        close: Bar close
+
+    Returns:
+        Dictionary keyed by PIVOT_LEVELS
+    """
+    pivot = (high + low + close) / 3
+    return {
+        "pivot": pivot,
+        "resistance_1": 2 * pivot - low,
+        "resistance_2": pivot + (high - low),
+        "resistance_3": high + 2 * (pivot - low),
+        "support_1": 2 * pivot - high,
+        "support_2": pivot - (high - low),
+        "support_3": low - 2 * (high - pivot)
+    }
+
+
+def align_universe(frames: Dict[str, pd.DataFrame],
+                   columns: Iterable[str] = ('High', 'Low', 'Close')) -> Dict[str, pd.DataFrame]:
+    """Align per-symbol bars into (dates x symbols) frames.
+
+    Args:
+        frames: Bars keyed by symbol
+        columns: Bar columns to align
+
+    Returns:
+        Dictionary mapping each column to a frame indexed by the union of all
+        dates with one column per symbol; NaN where a symbol has no bar
+    """
+    columns = list(columns)
+    symbols = list(frames)
+    index = next(iter(frames.values())).index if frames else pd.DatetimeIndex([])
+    for frame in frames.values():
+        if not frame.index.equals(index):
+            index = index.union(frame.index)
+
+    # Scatter each symbol's bars into preallocated arrays; symbols trading on
+    # every date of the union take the plain copy path
+    arrays = {column: np.full((len(index), len(symbols)), np.nan) for column in columns}
+    for position, frame in enumerate(frames.values()):
+        rows = slice(None) if frame.index.equals(index) else index.get_indexer(frame.index)
+        for column in columns:
+            arrays[column][rows, position] = frame[column].to_numpy()
+    return {column: pd.DataFrame(values, index=index, columns=symbols) for column, values in arrays.items()}
+
+
+def compute_universe_indicators(frames: Dict[str, pd.DataFrame], ma_periods: Iterable[int] = (20, 50, 200),
+                                rsi_window: int = 14,
+                                macd_windows: tuple = (12, 26, 9)) -> Dict[str, pd.DataFrame]:
+    """Compute indicator series for a whole universe in one vectorized pass.
+
+    Missing bars inside a symbol's history carry its last close forward for
+    the computation and are reported as NaN. Each symbol's values match a
+    per-symbol computation over its own bars when it has no gaps.
+
+    Args:
+        frames: Bars keyed by symbol
+        ma_periods: Simple moving average windows
+        rsi_window: RSI lookback window
+        macd_windows: MACD (fast, slow, signal) spans
+
+    Returns:
+        Dictionary of (dates x symbols) frames: the aligned High, Low and
+        Close, plus MA_<n>, RSI, MACD, MACD_signal and MACD_hist
+    """
+    aligned = align_universe(frames)
+    index, symbols = aligned['Close'].index, aligned['Close'].columns
+    close = aligned['Close'].to_numpy()
+    missing = np.isnan(close)
+    filled = forward_fill(close)
+
+    columns = {f"MA_{period}": sma(filled, period) for period in ma_periods}
+    columns["RSI"] = rsi(filled, rsi_window)
+    columns["MACD"], columns["MACD_signal"], columns["MACD_hist"] = macd(filled, *macd_windows)
+
+    result = dict(aligned)
+    for name, values in columns.items():
+        values[missing] = np.nan
+        result[name] = pd.DataFrame(values, index=index, columns=symbols)
+    return result
+
+
+def latest_indicator_table(series: Dict[str, pd.DataFrame], offset: int = 0) -> pd.DataFrame:
+    """Collect each symbol's values at its latest bar, plus its pivot levels.
+
+    Args:
+        series: Output of compute_universe_indicators
+        offset: Number of the symbol's own bars to step back from its latest
+                (1 gives the previous bar)
+
+    Returns:
+        DataFrame with one row per symbol and a column per indicator (Close,
+        High, Low, MA_<n>, RSI, MACD, MACD_signal, MACD_hist and the pivot
+        levels); all NaN for symbols without enough bars
+    """
+    close = series['Close']
+    if close.empty:
+        return pd.DataFrame(np.nan, index=close.columns, columns=list(series) + PIVOT_LEVELS)
+    observed = ~np.isnan(close.to_numpy())[::-1]
+    target = observed & (np.cumsum(observed, axis=0) == offset + 1)
+    last = len(close) - 1 - np.argmax(target, axis=0)
+    has_bars = target.any(axis=0)
+    columns = np.arange(close.shape[1])
+
+    table = {}
+    for name, frame in series.items():
+        table[name] = np.where(has_bars, frame.to_numpy()[last, columns], np.nan)
+    table.update(pivot_levels(table['High'], table['Low'], table['Close']))
+    return pd.DataFrame(table, index=close.columns)
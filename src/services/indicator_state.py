@@ -0,0 +1,440 @@
+"""
+Streaming indicator state with constant-time updates per bar.
+
+Each symbol keeps the running state of its moving averages, RSI and MACD.
+A new or revised bar updates that state in O(1) instead of recomputing the
+series over the whole history, so live quote refreshes can keep indicators
+current for a whole watchlist. States are plain dictionaries when
+serialized and are persisted next to the symbol's price history.
+"""
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional
+import pandas as pd
+from src.services.history_store import HistoryStore, history_store
+
+
+class EMAState:
+    """Exponential moving average with pandas ewm(adjust=False) semantics."""
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value: Optional[float] = None
+        self.count = 0
+
+    def _next(self, x: float) -> float:
+        return x if self.value is None else self.value + self.alpha * (x - self.value)
+
+    def update(self, x: float) -> Optional[float]:
+        """Add an observation and return the new average."""
+        self.value = self._next(x)
+        self.count += 1
+        return self.current()
+
+    def peek(self, x: float) -> Optional[float]:
+        """Get the average if x were added, without adding it."""
+        return self._next(x) if self.count + 1 >= self.min_periods else None
+
+    def current(self) -> Optional[float]:
+        """Get the average, or None before min_periods observations."""
+        return self.value if self.count >= self.min_periods else None
+
+    def to_dict(self) -> Dict:
+        return {"alpha": self.alpha, "min_periods": self.min_periods,
+                "value": self.value, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "EMAState":
+        ema = cls(state["alpha"], state["min_periods"])
+        ema.value, ema.count = state["value"], state["count"]
+        return ema
+
+
+class RollingMeanState:
+    """Simple moving average over a fixed window."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.total = 0.0
+        self._since_resum = 0
+
+    def update(self, x: float) -> Optional[float]:
+        """Add an observation and return the new average."""
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+        # Re-summing once per window keeps rounding drift bounded at amortized O(1)
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self.total = math.fsum(self.values)
+            self._since_resum = 0
+        return self.current()
+
+    def peek(self, x: float) -> Optional[float]:
+        """Get the average if x were added, without adding it."""
+        if len(self.values) + 1 < self.window:
+            return None
+        dropped = self.values[0] if len(self.values) == self.window else 0.0
+        return (self.total - dropped + x) / self.window
+
+    def current(self) -> Optional[float]:
+        """Get the average, or None before a full window."""
+        return self.total / self.window if len(self.values) == self.window else None
+
+    def to_dict(self) -> Dict:
+        return {"window": self.window, "values": list(self.values)}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "RollingMeanState":
+        mean = cls(state["window"])
+        mean.values.extend(state["values"])
+        mean.total = math.fsum(mean.values)
+        return mean
+
+
+class RSIState:
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_close: Optional[float] = None
+        self.up = EMAState(1.0 / window, window)
+        self.down = EMAState(1.0 / window, window)
+
+    def _moves(self, close: float) -> tuple:
+        change = 0.0 if self.prev_close is None else close - self.prev_close
+        return max(change, 0.0), max(-change, 0.0)
+
+    @staticmethod
+    def _rsi(avg_up: Optional[float], avg_down: Optional[float]) -> Optional[float]:
+        if avg_up is None or avg_down is None:
+            return None
+        if avg_down == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+    def update(self, close: float) -> Optional[float]:
+        """Add a close and return the new RSI."""
+        up, down = self._moves(close)
+        self.prev_close = close
+        return self._rsi(self.up.update(up), self.down.update(down))
+
+    def peek(self, close: float) -> Optional[float]:
+        """Get the RSI if close were added, without adding it."""
+        up, down = self._moves(close)
+        return self._rsi(self.up.peek(up), self.down.peek(down))
+
+    def to_dict(self) -> Dict:
+        return {"window": self.window, "prev_close": self.prev_close,
+                "up": self.up.to_dict(), "down": self.down.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "RSIState":
+        rsi = cls(state["window"])
+        rsi.prev_close = state["prev_close"]
+        rsi.up = EMAState.from_dict(state["up"])
+        rsi.down = EMAState.from_dict(state["down"])
+        return rsi
+
+
+class MACDState:
+    """MACD line, signal line and histogram."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.windows = (fast, slow, signal)
+        self.fast = EMAState(2.0 / (fast + 1), fast)
+        self.slow = EMAState(2.0 / (slow + 1), slow)
+        self.signal = EMAState(2.0 / (signal + 1), signal)
+
+    @staticmethod
+    def _result(line: Optional[float], signal: Optional[float]) -> Dict:
+        histogram = line - signal if line is not None and signal is not None else None
+        return {"MACD": line, "MACD_signal": signal, "MACD_hist": histogram}
+
+    def update(self, close: float) -> Dict:
+        """Add a close and return the new MACD values."""
+        fast, slow = self.fast.update(close), self.slow.update(close)
+        line = fast - slow if fast is not None and slow is not None else None
+        # The signal line starts at the first defined MACD value
+        signal = self.signal.update(line) if line is not None else None
+        return self._result(line, signal)
+
+    def peek(self, close: float) -> Dict:
+        """Get the MACD values if close were added, without adding it."""
+        fast, slow = self.fast.peek(close), self.slow.peek(close)
+        line = fast - slow if fast is not None and slow is not None else None
+        signal = self.signal.peek(line) if line is not None else None
+        return self._result(line, signal)
+
+    def to_dict(self) -> Dict:
+        return {"windows": list(self.windows), "fast": self.fast.to_dict(),
+                "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "MACDState":
+        macd = cls(*state["windows"])
+        macd.fast = EMAState.from_dict(state["fast"])
+        macd.slow = EMAState.from_dict(state["slow"])
+        macd.signal = EMAState.from_dict(state["signal"])
+        return macd
+
+
+class StreamingIndicators:
+    """Indicator state for one symbol, fed one bar at a time.
+
+    Completed bars are folded into the running state. The latest bar stays
+    open: updates with the same timestamp revise it, and a later timestamp
+    completes it. Values always reflect the completed bars plus the open one.
+    """
+
+    def __init__(self, symbol: str, ma_periods: tuple = (20, 50, 200), rsi_window: int = 14,
+                 macd_windows: tuple = (12, 26, 9)):
+        """Initialize empty indicator state.
+
+        Args:
+            symbol: Formatted stock symbol
+            ma_periods: Simple moving average windows
+            rsi_window: RSI lookback window
+            macd_windows: MACD (fast, slow, signal) spans
+        """
+        self.symbol = symbol
+        self.moving_averages = {period: RollingMeanState(period) for period in ma_periods}
+        self.rsi = RSIState(rsi_window)
+        self.macd = MACDState(*macd_windows)
+        self.open_time: Optional[pd.Timestamp] = None
+        self.open_close: Optional[float] = None
+        self.last_closed: Optional[tuple] = None
+
+    @property
+    def params(self) -> Dict:
+        """Parameters the state was built with."""
+        return {"ma_periods": list(self.moving_averages), "rsi_window": self.rsi.window,
+                "macd_windows": list(self.macd.windows)}
+
+    def _commit(self, close: float):
+        for mean in self.moving_averages.values():
+            mean.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+
+    def update(self, timestamp, close: float) -> bool:
+        """Feed a bar, completing the open bar if this one is newer.
+
+        Args:
+            timestamp: Bar start time
+            close: Bar close (or the latest price while the bar is forming)
+
+        Returns:
+            True if a bar was completed, False for a revision or an ignored
+            bar (older than the open one, or a missing close)
+        """
+        timestamp = pd.Timestamp(timestamp)
+        close = float(close)
+        if math.isnan(close) or (self.open_time is not None and timestamp < self.open_time):
+            return False
+        if self.open_time is not None and timestamp == self.open_time:
+            self.open_close = close
+            return False
+
+        completed = self.open_time is not None
+        if completed:
+            self._commit(self.open_close)
+            self.last_closed = (self.open_time, self.open_close)
+        self.open_time, self.open_close = timestamp, close
+        return completed
+
+    def values(self) -> Dict:
+        """Get the latest indicator values, including the open bar.
+
+        Returns:
+            Dictionary with MA_<period>, RSI, MACD, MACD_signal and MACD_hist
+            (None while undefined) and the open bar's timestamp as "as_of"
+        """
+        if self.open_close is None:
+            result = {f"MA_{period}": None for period in self.moving_averages}
+            result.update({"RSI": None, **MACDState._result(None, None), "as_of": None})
+            return result
+
+        close = self.open_close
+        result = {f"MA_{period}": mean.peek(close) for period, mean in self.moving_averages.items()}
+        result["RSI"] = self.rsi.peek(close)
+        result.update(self.macd.peek(close))
+        result["as_of"] = self.open_time.isoformat()
+        return result
+
+    def catch_up(self, data: pd.DataFrame) -> bool:
+        """Feed the bars of a history frame that the state has not seen.
+
+        Args:
+            data: Daily bars covering at least the open bar
+
+        Returns:
+            False if the frame no longer agrees with the completed bars
+            (e.g. prices were adjusted for a split) and the state must be
+            rebuilt, True otherwise
+        """
+        if self.open_time is not None:
+            if self.last_closed is not None:
+                closed_time, closed_close = self.last_closed
+                position = data.index.searchsorted(closed_time)
+                if position >= len(data) or data.index[position] != closed_time or \
+                        not math.isclose(float(data['Close'].iloc[position]), closed_close, rel_tol=1e-6):
+                    return False
+            start = data.index.searchsorted(self.open_time)
+            if start >= len(data) or data.index[start] != self.open_time:
+                return False
+            data = data.iloc[start:]
+
+        for timestamp, close in zip(data.index, data['Close'].to_numpy()):
+            self.update(timestamp, close)
+        return True
+
+    @classmethod
+    def from_history(cls, symbol: str, data: pd.DataFrame, **params) -> "StreamingIndicators":
+        """Build the state by replaying a history frame.
+
+        Args:
+            symbol: Formatted stock symbol
+            data: Daily bars, oldest first
+            **params: ma_periods, rsi_window and macd_windows
+
+        Returns:
+            StreamingIndicators whose open bar is the last bar of data
+        """
+        state = cls(symbol, **params)
+        state.catch_up(data)
+        return state
+
+    def to_dict(self) -> Dict:
+        """Serialize the state to JSON-compatible types."""
+        return {
+            "symbol": self.symbol,
+            "params": self.params,
+            "moving_averages": [mean.to_dict() for mean in self.moving_averages.values()],
+            "rsi": self.rsi.to_dict(),
+            "macd": self.macd.to_dict(),
+            "open_time": self.open_time.isoformat() if self.open_time is not None else None,
+            "open_close": self.open_close,
+            "last_closed": [self.last_closed[0].isoformat(), self.last_closed[1]]
+                           if self.last_closed is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "StreamingIndicators":
+        """Restore a state serialized with to_dict."""
+        restored = cls(state["symbol"], ma_periods=(), rsi_window=state["params"]["rsi_window"],
+                       macd_windows=tuple(state["params"]["macd_windows"]))
+        for mean_state in state["moving_averages"]:
+            mean = RollingMeanState.from_dict(mean_state)
+            restored.moving_averages[mean.window] = mean
+        restored.rsi = RSIState.from_dict(state["rsi"])
+        restored.macd = MACDState.from_dict(state["macd"])
+        if state["open_time"] is not None:
+            restored.open_time = pd.Timestamp(state["open_time"])
+            restored.open_close = state["open_close"]
+        if state["last_closed"] is not None:
+            restored.last_closed = (pd.Timestamp(state["last_closed"][0]), state["last_closed"][1])
+        return restored
+
+
+class IndicatorStateStore:
+    """Per-symbol streaming indicator states, persisted with the price history."""
+
+    def __init__(self, store: HistoryStore = history_store, ma_periods: tuple = (20, 50, 200),
+                 rsi_window: int = 14, macd_windows: tuple = (12, 26, 9)):
+        """Initialize the state store.
+
+        Args:
+            store: History store the states are saved alongside
+            ma_periods: Simple moving average windows
+            rsi_window: RSI lookback window
+            macd_windows: MACD (fast, slow, signal) spans
+        """
+        self.store = store
+        self.params = {"ma_periods": tuple(ma_periods), "rsi_window": rsi_window,
+                       "macd_windows": tuple(macd_windows)}
+        self._states: Dict[str, StreamingIndicators] = {}
+        self._lock = threading.Lock()
+
+    def _matches(self, state: StreamingIndicators) -> bool:
+        return state.params == {name: list(value) if isinstance(value, tuple) else value
+                                for name, value in self.params.items()}
+
+    def get(self, symbol: str) -> Optional[StreamingIndicators]:
+        """Get a symbol's state from memory or disk, or None if there is none."""
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None:
+                saved = self.store.load_indicator_state(symbol)
+                if saved is not None:
+                    try:
+                        state = StreamingIndicators.from_dict(saved)
+                    except (KeyError, TypeError, ValueError) as e:
+                        print(f"Discarding unreadable indicator state for {symbol}: {e}")
+                        state = None
+                if state is not None and self._matches(state):
+                    self._states[symbol] = state
+                else:
+                    state = None
+            return state
+
+    def _save(self, state: StreamingIndicators):
+        self.store.save_indicator_state(state.symbol, state.to_dict())
+
+    def sync(self, symbol: str, data: pd.DataFrame) -> StreamingIndicators:
+        """Bring a symbol's state up to date with its history frame.
+
+        Only bars newer than the state are replayed; the state is rebuilt
+        when none exists or the history no longer agrees with it.
+
+        Args:
+            symbol: Formatted stock symbol
+            data: Daily bars, oldest first
+
+        Returns:
+            Up-to-date StreamingIndicators
+        """
+        state = self.get(symbol)
+        with self._lock:
+            closed = state.last_closed if state is not None else None
+            if state is None or not state.catch_up(data):
+                state = StreamingIndicators.from_history(symbol, data, **self.params)
+            self._states[symbol] = state
+            if state.last_closed != closed:
+                self._save(state)
+        return state
+
+    def update(self, symbol: str, timestamp, close: float) -> Optional[Dict]:
+        """Feed a live price for a symbol in O(1).
+
+        The state is saved only when a bar is completed; revisions of the
+        open bar are recovered from the price history on the next sync.
+
+        Args:
+            symbol: Formatted stock symbol
+            timestamp: Start time of the bar the price belongs to
+            close: Latest price
+
+        Returns:
+            Latest indicator values, or None if the symbol has no state yet
+        """
+        state = self.get(symbol)
+        if state is None:
+            return None
+        with self._lock:
+            if state.update(timestamp, close):
+                self._save(state)
+            return state.values()
+
+    def clear(self):
+        """Drop the in-memory states (saved states are kept)."""
+        with self._lock:
+            self._states.clear()
+
+
+# Global instance
+indicator_states = IndicatorStateStore()
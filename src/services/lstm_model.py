@@ -1,7 +1,9 @@
 """
 LSTM model architecture for stock price prediction.
 """
+from typing import Callable
 import numpy as np
+import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
@@ -46,6 +48,41 @@ def create_lstm_model(lookback_window: int = 60, features: int = 1) -> Sequentia
     return model
 
 
+def create_rollout(model: keras.Model, lookback_window: int = 60) -> Callable:
+    """Compile an autoregressive multi-step forecast for a model into one graph.
+    
+    Each step feeds the last lookback_window values (observed, then
+    predicted) back into the model. The windows live in one buffer allocated
+    up front with room for every forecast, so the whole rollout is a single
+    graph call instead of one model.predict call per day.
+    
+    Args:
+        model: Trained Keras model mapping (batch, lookback_window, 1) to (batch, 1)
+        lookback_window: Number of previous values the model reads
+    
+    Returns:
+        Function taking scaled windows of shape (batch, lookback_window, 1)
+        and a number of steps, returning the scaled forecasts with shape
+        (batch, steps)
+    """
+    @tf.function(input_signature=[
+        tf.TensorSpec([None, lookback_window, 1], tf.float32),
+        tf.TensorSpec([], tf.int32)
+    ])
+    def rollout(windows, steps):
+        length = lookback_window + steps
+        buffer = tf.concat([windows, tf.zeros([tf.shape(windows)[0], steps, 1], windows.dtype)], axis=1)
+        for i in tf.range(steps):
+            window = tf.ensure_shape(buffer[:, i:i + lookback_window, :], [None, lookback_window, 1])
+            next_value = model(window, training=False)
+            # Write the forecast into its slot so the next window picks it up
+            slot = tf.one_hot(lookback_window + i, length, dtype=windows.dtype)
+            buffer += slot[None, :, None] * next_value[:, None, :]
+        return buffer[:, lookback_window:, 0]
+    
+    return rollout
+
+
 def train_model(model: Sequential, X_train: np.ndarray, y_train: np.ndarray, 
                 epochs: int = 50, batch_size: int = 32, validation_split: float = 0.1):
     """Train the LSTM model.
@@ -0,0 +1,130 @@
+"""
+TensorFlow-free inference runtime for the LSTM price models.
+
+model_trainer exports each trained Keras model's weights to a .npz file next
+to its .h5 (see model_trainer.export_numpy_model). NumpyLSTM runs the same
+forward pass with NumPy, so serving workers can predict without importing
+TensorFlow.
+"""
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+FORMAT_VERSION = 1
+
+# Weights stored for each supported layer kind, in Keras get_weights() order
+LAYER_WEIGHTS = {"lstm": ("kernel", "recurrent_kernel", "bias"), "dense": ("kernel", "bias")}
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1 + np.tanh(0.5 * x))
+
+
+def _lstm(inputs: np.ndarray, kernel: np.ndarray, recurrent_kernel: np.ndarray, bias: np.ndarray,
+          return_sequences: bool) -> np.ndarray:
+    """Keras LSTM layer (tanh activation, sigmoid gates in i, f, c, o order)."""
+    batch, steps, _ = inputs.shape
+    units = recurrent_kernel.shape[0]
+    # Input projections for every timestep at once; only the recurrence is sequential
+    projected = inputs @ kernel + bias
+    h = np.zeros((batch, units), dtype=inputs.dtype)
+    c = np.zeros((batch, units), dtype=inputs.dtype)
+    outputs = np.empty((batch, steps, units), dtype=inputs.dtype) if return_sequences else None
+
+    for t in range(steps):
+        z = projected[:, t] + h @ recurrent_kernel
+        i, f, o = _sigmoid(z[:, :units]), _sigmoid(z[:, units:2 * units]), _sigmoid(z[:, 3 * units:])
+        c = f * c + i * np.tanh(z[:, 2 * units:3 * units])
+        h = o * np.tanh(c)
+        if outputs is not None:
+            outputs[:, t] = h
+    return outputs if outputs is not None else h
+
+
+class NumpyLSTM:
+    """Stacked LSTM and dense layers evaluated with NumPy."""
+
+    def __init__(self, layers: List[Tuple[str, Dict[str, np.ndarray]]]):
+        """Initialize the network.
+
+        Args:
+            layers: (kind, weights) pairs in order, kind being "lstm" or
+                    "dense"; LSTM weights also hold "return_sequences"
+        """
+        for kind, _ in layers:
+            if kind not in LAYER_WEIGHTS:
+                raise ValueError(f"Unsupported layer kind '{kind}'")
+        self.layers = layers
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyLSTM":
+        """Load a network exported by model_trainer.
+
+        Args:
+            path: Path of the .npz file
+
+        Returns:
+            The network
+        """
+        with np.load(path) as archive:
+            if int(archive["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported model format {int(archive['format_version'])} in {path}")
+            layers = []
+            for index, kind in enumerate(archive["layers"].tolist()):
+                weights = {name: archive[f"{index}_{name}"].astype(np.float32) for name in LAYER_WEIGHTS[kind]}
+                if kind == "lstm":
+                    weights["return_sequences"] = bool(archive[f"{index}_return_sequences"])
+                layers.append((kind, weights))
+        return cls(layers)
+
+    def save(self, path: str):
+        """Save the network as a .npz file.
+
+        Args:
+            path: Destination path
+        """
+        arrays = {"format_version": np.array(FORMAT_VERSION),
+                  "layers": np.array([kind for kind, _ in self.layers])}
+        for index, (kind, weights) in enumerate(self.layers):
+            for name, value in weights.items():
+                arrays[f"{index}_{name}"] = np.asarray(value)
+        np.savez(path, **arrays)
+
+    def __call__(self, windows: np.ndarray) -> np.ndarray:
+        """Run the forward pass.
+
+        Args:
+            windows: Inputs with shape (batch, timesteps, features)
+
+        Returns:
+            Outputs with shape (batch, units of the last layer)
+        """
+        x = np.asarray(windows, dtype=np.float32)
+        for kind, weights in self.layers:
+            if kind == "lstm":
+                x = _lstm(x, weights["kernel"], weights["recurrent_kernel"], weights["bias"],
+                          weights["return_sequences"])
+            else:
+                x = x @ weights["kernel"] + weights["bias"]
+        return x
+
+    def rollout(self, windows: np.ndarray, steps: int) -> np.ndarray:
+        """Forecast autoregressively, feeding each prediction back as the newest input.
+
+        Works like lstm_model.create_rollout: the windows and a slot for every
+        forecast share one buffer allocated up front.
+
+        Args:
+            windows: Scaled inputs with shape (batch, lookback_window, 1)
+            steps: Number of values to forecast
+
+        Returns:
+            Scaled forecasts with shape (batch, steps)
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        batch, lookback, _ = windows.shape
+        buffer = np.empty((batch, lookback + steps, 1), dtype=np.float32)
+        buffer[:, :lookback] = windows
+        for i in range(steps):
+            buffer[:, lookback + i] = self(buffer[:, i:i + lookback])
+        return buffer[:, lookback:, 0]
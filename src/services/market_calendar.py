@@ -0,0 +1,210 @@
+"""
+NSE trading calendar and market-hours-aware cache expiry.
+
+Daily bars, quotes, indicators and predictions can only change while the
+exchange is trading. Caches use short TTLs during the session and hold their
+entries from the close until the next session opens.
+"""
+import csv
+import functools
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Iterable, Optional
+from zoneinfo import ZoneInfo
+from src.services.cache_backend import CacheEntry, cache_key, get_cache_backend
+
+
+IST = ZoneInfo("Asia/Kolkata")
+
+# Regular NSE equity session
+SESSION_OPEN = time(9, 15)
+SESSION_CLOSE = time(15, 30)
+
+# Keep refreshing briefly after the bell while closing prices settle upstream
+POST_CLOSE_GRACE = timedelta(minutes=int(os.getenv("MARKET_POST_CLOSE_GRACE_MINUTES", 30)))
+
+# Upper bound on how long an off-hours cache entry is held (covers long weekends)
+CLOSED_HOLD_SECONDS = 4 * 86400
+
+
+class TradingCalendar:
+    """Exchange trading days and session hours."""
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        """Initialize the trading calendar.
+
+        Args:
+            holidays: Weekday dates on which the exchange is closed
+        """
+        self.holidays = set(holidays)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "TradingCalendar":
+        """Load exchange holidays from a CSV with a date column (YYYY-MM-DD).
+
+        A missing file gives a calendar with weekends only.
+
+        Args:
+            path: Path to the holiday CSV
+
+        Returns:
+            Populated TradingCalendar
+        """
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                return cls(date.fromisoformat(row["date"].strip()) for row in csv.DictReader(f))
+        except FileNotFoundError:
+            print(f"Holiday calendar not found: {path}")
+            return cls()
+
+    def _now(self, now: Optional[datetime]) -> datetime:
+        if now is None:
+            return datetime.now(IST)
+        return now.astimezone(IST) if now.tzinfo is not None else now.replace(tzinfo=IST)
+
+    def is_trading_day(self, day: date) -> bool:
+        """Check whether the exchange holds a session on a date."""
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session_bounds(self, day: date) -> tuple:
+        """Get the open and the end of the post-close grace for a session day."""
+        opens = datetime.combine(day, SESSION_OPEN, tzinfo=IST)
+        ends = datetime.combine(day, SESSION_CLOSE, tzinfo=IST) + POST_CLOSE_GRACE
+        return opens, ends
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """Check whether the market is in session (including the post-close grace).
+
+        Args:
+            now: Time to check (default: current time)
+
+        Returns:
+            True if prices can still change
+        """
+        now = self._now(now)
+        if not self.is_trading_day(now.date()):
+            return False
+        opens, ends = self.session_bounds(now.date())
+        return opens <= now < ends
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        """Get the start of the next session strictly after now.
+
+        Args:
+            now: Reference time (default: current time)
+
+        Returns:
+            Timezone-aware IST datetime of the next session open
+        """
+        now = self._now(now)
+        day = now.date()
+        while True:
+            if self.is_trading_day(day):
+                opens, _ = self.session_bounds(day)
+                if opens > now:
+                    return opens
+            day += timedelta(days=1)
+
+    def last_close(self, now: Optional[datetime] = None) -> datetime:
+        """Get the end of the most recent session that finished at or before now.
+
+        Args:
+            now: Reference time (default: current time)
+
+        Returns:
+            Timezone-aware IST datetime of the last session end (with grace)
+        """
+        now = self._now(now)
+        day = now.date()
+        while True:
+            if self.is_trading_day(day):
+                _, ends = self.session_bounds(day)
+                if ends <= now:
+                    return ends
+            day -= timedelta(days=1)
+
+    def is_fresh(self, updated_at: Optional[datetime], max_age_seconds: float,
+                 now: Optional[datetime] = None) -> bool:
+        """Decide whether data refreshed at updated_at can still be served.
+
+        During the session data expires after max_age_seconds. Outside it, data
+        refreshed after the last session ended stays fresh until the next open.
+
+        Args:
+            updated_at: Time of the last upstream refresh (naive times are local)
+            max_age_seconds: Maximum age while the market is open
+            now: Reference time (default: current time)
+
+        Returns:
+            True if no upstream refresh is needed
+        """
+        if updated_at is None:
+            return False
+        now = self._now(now)
+        updated_at = updated_at.astimezone(IST)
+        if self.is_open(now):
+            return (now - updated_at).total_seconds() < max_age_seconds
+        return updated_at >= self.last_close(now)
+
+
+NSE_HOLIDAYS_PATH = os.getenv("NSE_HOLIDAYS_PATH", "data/nse_holidays.csv")
+
+# Global instance
+nse_calendar = TradingCalendar.from_csv(NSE_HOLIDAYS_PATH)
+
+
+def is_cacheable(value: Any) -> bool:
+    """Default test of whether a result may be cached: anything but None or an error."""
+    return value is not None and not isinstance(value, Exception)
+
+
+def market_hours_cache(open_ttl: int, cacheable: Callable[[Any], bool] = is_cacheable) -> Callable:
+    """Cache a function under the NSE expiry policy.
+
+    While the market is open entries expire after open_ttl seconds. Once it
+    closes, results are computed once after the close and held until the next
+    session opens.
+
+    Results are kept in the active cache backend, which other processes on
+    the host can read, so arguments must have a faithful repr (strings,
+    numbers, lists). Failed results are never stored: they would otherwise be
+    served until the next open after the provider recovers.
+
+    The cached function also gets lookup(*args) returning the fresh
+    CacheEntry or None, and store(value, *args) caching a result computed
+    elsewhere (e.g. in a batch).
+
+    Args:
+        open_ttl: Time to live in seconds during the trading session
+        cacheable: Returns False for results that must not be stored
+                   (default: None and exceptions)
+
+    Returns:
+        Decorator producing the cached function (with a clear() method)
+    """
+    def decorator(fn: Callable) -> Callable:
+        namespace = f"{fn.__module__}.{fn.__qualname__}"
+
+        def lookup(*args, **kwargs) -> Optional[CacheEntry]:
+            entry = get_cache_backend().get(cache_key(namespace, *args, **kwargs))
+            return entry if entry is not None and nse_calendar.is_fresh(entry.stored_at, open_ttl) else None
+
+        def store(value: Any, *args, **kwargs):
+            if cacheable(value):
+                get_cache_backend().set(cache_key(namespace, *args, **kwargs), value, CLOSED_HOLD_SECONDS)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            entry = lookup(*args, **kwargs)
+            if entry is not None:
+                return entry.value
+            value = fn(*args, **kwargs)
+            store(value, *args, **kwargs)
+            return value
+
+        wrapper.clear = lambda: get_cache_backend().clear(namespace)
+        wrapper.lookup = lookup
+        wrapper.store = store
+        return wrapper
+
+    return decorator
@@ -0,0 +1,287 @@
+"""
+Market data providers behind the data service.
+
+The data service talks to a MarketDataProvider instead of yfinance directly, so
+the dashboard can be benchmarked and tested offline against recorded data.
+"""
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+import pandas as pd
+import yfinance as yf
+
+
+# Columns kept from downloaded history, matching Ticker.history output
+HISTORY_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+
+
+def period_start(period: str) -> Optional[pd.Timestamp]:
+    """Convert a yfinance period string to the first date it covers.
+
+    Args:
+        period: Time period string (e.g. 1mo, 1y, ytd, max)
+
+    Returns:
+        Naive start timestamp, or None for the full history ("max")
+    """
+    today = pd.Timestamp.now().normalize()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return today.replace(month=1, day=1)
+
+    unit = period.lstrip("0123456789")
+    count = int(period[:len(period) - len(unit)])
+    offsets = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+    if unit not in offsets:
+        raise ValueError(f"Unsupported period: {period}")
+    return today - pd.DateOffset(**{offsets[unit]: count})
+
+
+class MarketDataProvider(ABC):
+    """Source of historical bars and company information."""
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, period: Optional[str] = None,
+                start: Optional[str] = None) -> pd.DataFrame:
+        """Fetch daily bars for one symbol.
+
+        Args:
+            symbol: Formatted stock symbol
+            period: yfinance period string (e.g. 1y), used when start is not given
+            start: First date to fetch (YYYY-MM-DD)
+
+        Returns:
+            DataFrame of daily bars, empty if the symbol has no data
+        """
+
+    @abstractmethod
+    def download(self, symbols: List[str], period: Optional[str] = None,
+                 start: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Fetch daily bars for many symbols in one batched request.
+
+        Args:
+            symbols: Formatted stock symbols
+            period: yfinance period string, used when start is not given
+            start: First date to fetch (YYYY-MM-DD)
+
+        Returns:
+            Dictionary mapping each symbol to its bars (empty if unavailable)
+        """
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict:
+        """Fetch the company information record for one symbol.
+
+        Args:
+            symbol: Formatted stock symbol
+
+        Returns:
+            Dictionary of yfinance-style info fields
+        """
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Provider backed by the Yahoo Finance API via yfinance."""
+
+    name = "yfinance"
+
+    def __init__(self, max_workers: int = 8):
+        """Initialize the yfinance provider.
+
+        Args:
+            max_workers: Upper bound on threads used by batched downloads
+        """
+        self.max_workers = max_workers
+
+    def history(self, symbol: str, period: Optional[str] = None,
+                start: Optional[str] = None) -> pd.DataFrame:
+        if start is not None:
+            return yf.Ticker(symbol).history(start=start)
+        return yf.Ticker(symbol).history(period=period)
+
+    def download(self, symbols: List[str], period: Optional[str] = None,
+                 start: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        window = {"start": start} if start is not None else {"period": period}
+        frame = yf.download(
+            symbols,
+            group_by='ticker',
+            threads=min(self.max_workers, len(symbols)),
+            actions=True,
+            ignore_tz=False,
+            progress=False,
+            **window
+        )
+
+        result = {}
+        tickers = set(frame.columns.get_level_values(0)) if frame is not None else set()
+        for symbol in symbols:
+            if symbol not in tickers:
+                result[symbol] = pd.DataFrame()
+                continue
+            bars = frame[symbol].dropna(subset=['Close'])
+            result[symbol] = bars[[c for c in HISTORY_COLUMNS if c in bars.columns]]
+
+        return result
+
+    def info(self, symbol: str) -> Dict:
+        return yf.Ticker(symbol).info
+
+
+class ReplayProvider(MarketDataProvider):
+    """Provider serving recorded OHLCV and info snapshots from disk.
+
+    Each symbol is recorded as {key}.parquet (daily bars) and {key}.json
+    (info record). An artificial latency can be added to every request to
+    mimic the production upstream.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str, latency_seconds: float = 0.0,
+                 rebase_dates: bool = False):
+        """Initialize the replay provider.
+
+        Args:
+            fixtures_dir: Directory holding recorded snapshots
+            latency_seconds: Artificial delay added to every request
+            rebase_dates: Shift recorded bars so the last one falls on today,
+                          keeping old recordings inside period windows
+        """
+        self.fixtures_dir = fixtures_dir
+        self.latency_seconds = latency_seconds
+        self.rebase_dates = rebase_dates
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def _key(self, symbol: str) -> str:
+        return symbol.upper().replace('.', '_').replace('^', 'IDX_')
+
+    def _load(self, symbol: str) -> pd.DataFrame:
+        """Load (and memoize) the recorded bars for a symbol."""
+        if symbol not in self._frames:
+            path = os.path.join(self.fixtures_dir, f"{self._key(symbol)}.parquet")
+            data = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+            if self.rebase_dates and not data.empty:
+                today = pd.Timestamp.now(tz=data.index.tz).normalize()
+                data.index = data.index + (today - data.index[-1].normalize())
+            self._frames[symbol] = data
+        return self._frames[symbol]
+
+    def _window(self, data: pd.DataFrame, period: Optional[str],
+                start: Optional[str]) -> pd.DataFrame:
+        """Restrict recorded bars to a start date or a trailing period."""
+        if data.empty:
+            return data
+        if start is not None:
+            first = pd.Timestamp(start)
+        else:
+            first = period_start(period or "max")
+            if first is None:
+                return data
+        if data.index.tz is not None:
+            first = first.tz_localize(data.index.tz)
+        return data[data.index >= first]
+
+    def history(self, symbol: str, period: Optional[str] = None,
+                start: Optional[str] = None) -> pd.DataFrame:
+        time.sleep(self.latency_seconds)
+        return self._window(self._load(symbol), period, start).copy()
+
+    def download(self, symbols: List[str], period: Optional[str] = None,
+                 start: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        time.sleep(self.latency_seconds)
+        return {symbol: self._window(self._load(symbol), period, start).copy() for symbol in symbols}
+
+    def info(self, symbol: str) -> Dict:
+        time.sleep(self.latency_seconds)
+        try:
+            with open(os.path.join(self.fixtures_dir, f"{self._key(symbol)}.json"), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, symbol: str, data: pd.DataFrame, info: Optional[Dict] = None):
+        """Write a snapshot for a symbol into the fixtures directory.
+
+        Args:
+            symbol: Formatted stock symbol
+            data: Daily bars to record
+            info: Info record to record, if any
+        """
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        data.to_parquet(os.path.join(self.fixtures_dir, f"{self._key(symbol)}.parquet"))
+        if info is not None:
+            with open(os.path.join(self.fixtures_dir, f"{self._key(symbol)}.json"), 'w') as f:
+                json.dump(info, f, indent=2, default=str)
+        self._frames.pop(symbol, None)
+
+
+def record_fixtures(symbols: List[str], fixtures_dir: str, period: str = "5y",
+                    source: Optional[MarketDataProvider] = None):
+    """Record snapshots from a live provider for later offline replay.
+
+    Args:
+        symbols: Formatted stock symbols to record
+        fixtures_dir: Directory to write snapshots into
+        period: History period to record
+        source: Provider to record from (default: yfinance)
+    """
+    source = source or YFinanceProvider()
+    replay = ReplayProvider(fixtures_dir)
+    for symbol in symbols:
+        try:
+            replay.save(symbol, source.history(symbol, period=period), source.info(symbol))
+            print(f"Recorded {symbol}")
+        except Exception as e:
+            print(f"Error recording {symbol}: {e}")
+
+
+def create_provider_from_env() -> MarketDataProvider:
+    """Create the provider selected by environment variables.
+
+    MARKET_DATA_PROVIDER selects "yfinance" (default) or "replay". The yfinance
+    provider reads BATCH_MAX_WORKERS; the replay provider reads
+    MARKET_DATA_FIXTURES_DIR and MARKET_DATA_REPLAY_LATENCY.
+
+    Returns:
+        Configured MarketDataProvider
+    """
+    provider = os.getenv("MARKET_DATA_PROVIDER", "yfinance").lower()
+    if provider == "replay":
+        return ReplayProvider(
+            os.getenv("MARKET_DATA_FIXTURES_DIR", "data/fixtures/market_data"),
+            latency_seconds=float(os.getenv("MARKET_DATA_REPLAY_LATENCY", 0.0)),
+            rebase_dates=True
+        )
+    if provider != "yfinance":
+        raise ValueError(f"Unknown market data provider: {provider}")
+    return YFinanceProvider(max_workers=int(os.getenv("BATCH_MAX_WORKERS", "8")))
+
+
+_provider: MarketDataProvider = create_provider_from_env()
+
+
+def get_provider() -> MarketDataProvider:
+    """Get the active market data provider."""
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider):
+    """Replace the active market data provider (e.g. for tests or benchmarks).
+
+    Args:
+        provider: Provider to use for all subsequent data service fetches
+    """
+    global _provider
+    _provider = provider
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python -m src.services.market_data_provider FIXTURES_DIR SYMBOL [SYMBOL ...]
+    record_fixtures(sys.argv[2:], sys.argv[1])
@@ -0,0 +1,157 @@
+"""
+In-process registry of trained prediction models.
+
+The models directory is indexed once (and again only when files are added or
+removed), and loaded models are kept in a bounded LRU keyed by artifact path
+and modification time. A request costs one stat of the directory and of the
+model file; a model is deserialized again only when its file changes.
+
+A model's NumPy export (.npz, see model_trainer.export_numpy_model) is
+preferred over its Keras .h5, so serving it never imports TensorFlow.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from src.services.lstm_runtime import NumpyLSTM
+from src.services.single_flight import SingleFlight
+
+
+MODEL_SUFFIX = "_lstm"
+GENERAL_MODEL = "general_model"
+
+# Artifact formats, most preferred first
+MODEL_EXTENSIONS = (".npz", ".h5")
+
+
+def model_key(symbol: str) -> str:
+    """Convert a formatted symbol to the name its model is saved under (e.g. TCS_NS)."""
+    return symbol.replace('.', '_').replace('^', '')
+
+
+def load_model_artifact(path: str) -> Any:
+    """Load a model file: .npz exports with the NumPy runtime, anything else with Keras."""
+    if path.endswith(".npz"):
+        return NumpyLSTM.load(path)
+    from tensorflow import keras
+    return keras.models.load_model(path)
+
+
+class ModelRegistry:
+    """Indexes saved models and caches the loaded ones."""
+
+    def __init__(self, models_dir: str = "models", maxsize: int = 4,
+                 loader: Optional[Callable[[str], Any]] = None):
+        """Initialize the model registry.
+
+        Args:
+            models_dir: Directory holding <SYMBOL>_lstm and general_model files
+                        (.npz or .h5)
+            maxsize: Maximum number of models kept in memory
+            loader: Function loading a model from a path (default: load_model_artifact)
+        """
+        self.models_dir = models_dir
+        self.maxsize = maxsize
+        self.loader = loader or load_model_artifact
+        self.hits = 0
+        self.loads = 0
+        self._index: Dict[str, str] = {}
+        self._indexed_mtime: Optional[float] = None
+        self._models: "OrderedDict[Tuple[str, float], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("model_registry")
+
+    def _refresh_index(self):
+        """Rescan the models directory if files were added or removed since the last scan."""
+        try:
+            mtime = os.stat(self.models_dir).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._indexed_mtime:
+            return
+
+        index = {}
+        if mtime is not None:
+            names = os.listdir(self.models_dir)
+            # Preferred formats are indexed last and replace the others
+            for extension in reversed(MODEL_EXTENSIONS):
+                for name in names:
+                    if not name.endswith(extension):
+                        continue
+                    stem = name[:-len(extension)]
+                    if stem.endswith(MODEL_SUFFIX):
+                        index[stem[:-len(MODEL_SUFFIX)]] = os.path.join(self.models_dir, name)
+                    elif stem == GENERAL_MODEL:
+                        index[GENERAL_MODEL] = os.path.join(self.models_dir, name)
+        with self._lock:
+            self._index, self._indexed_mtime = index, mtime
+
+    def artifact_path(self, symbol: str) -> Optional[str]:
+        """Get the model file used for a symbol.
+
+        Args:
+            symbol: Formatted stock symbol
+
+        Returns:
+            Path of the symbol's own model, else of the general model, or
+            None if neither exists
+        """
+        self._refresh_index()
+        with self._lock:
+            return self._index.get(model_key(symbol)) or self._index.get(GENERAL_MODEL)
+
+    def get(self, symbol: str) -> Optional[Any]:
+        """Get the loaded model for a symbol.
+
+        The model is loaded on first use and again whenever its file changes;
+        concurrent requests for the same file share one load.
+
+        Args:
+            symbol: Formatted stock symbol
+
+        Returns:
+            Loaded model, or None if no model file exists
+        """
+        path = self.artifact_path(symbol)
+        if path is None:
+            return None
+        try:
+            key = (path, os.stat(path).st_mtime)
+        except FileNotFoundError:
+            # Removed since the last scan; the directory mtime changed too
+            return self.get(symbol) if self.artifact_path(symbol) != path else None
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+        return self._flight.do(key, self._load, key)
+
+    def _load(self, key: Tuple[str, float]) -> Any:
+        model = self.loader(key[0])
+        with self._lock:
+            self.loads += 1
+            # A changed file replaces the stale version of the same artifact
+            for stale in [k for k in self._models if k[0] == key[0]]:
+                del self._models[stale]
+            self._models[key] = model
+            while len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+        return model
+
+    def cached(self) -> Dict[Hashable, Any]:
+        """Get the loaded models keyed by (path, mtime), least recently used first."""
+        with self._lock:
+            return dict(self._models)
+
+    def clear(self):
+        """Drop every loaded model and the directory index."""
+        with self._lock:
+            self._models.clear()
+            self._index, self._indexed_mtime = {}, None
+
+
+# Global instance
+model_registry = ModelRegistry(maxsize=int(os.getenv("MODEL_CACHE_SIZE", "4")))
@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 from src.services.lstm_model import create_lstm_model
+from src.services.lstm_runtime import NumpyLSTM
 from src.services.data_service import get_stock_data
 import os
 
@@ -28,6 +29,53 @@ def create_training_data(data: np.ndarray, lookback: int = 60):
     return np.array(X), np.array(y)
 
 
+def export_numpy_model(model, path: str):
+    """Export a trained model's weights for the TensorFlow-free NumPy runtime.
+    
+    Args:
+        model: Trained Keras model built by create_lstm_model
+        path: Destination .npz path
+    
+    Raises:
+        ValueError: If the model has a layer the NumPy runtime cannot run
+    """
+    layers = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        config = layer.get_config()
+        if kind == "Dropout":
+            # Inactive at inference
+            continue
+        if kind == "LSTM" and config["activation"] == "tanh" and config["recurrent_activation"] == "sigmoid" \
+                and config["use_bias"] and not config["go_backwards"]:
+            kernel, recurrent_kernel, bias = layer.get_weights()
+            layers.append(("lstm", {"kernel": kernel, "recurrent_kernel": recurrent_kernel, "bias": bias,
+                                    "return_sequences": config["return_sequences"]}))
+        elif kind == "Dense" and config["activation"] == "linear" and config["use_bias"]:
+            kernel, bias = layer.get_weights()
+            layers.append(("dense", {"kernel": kernel, "bias": bias}))
+        else:
+            raise ValueError(f"Cannot export layer {layer.name} ({kind}) to the NumPy runtime")
+    
+    NumpyLSTM(layers).save(path)
+
+
+def export_saved_models(models_dir: str = "models"):
+    """Export every saved .h5 model in a directory for the NumPy runtime.
+    
+    Args:
+        models_dir: Directory holding the .h5 models
+    """
+    from tensorflow import keras
+    
+    for name in sorted(os.listdir(models_dir)):
+        if name.endswith(".h5"):
+            model_path = os.path.join(models_dir, name)
+            export_path = f"{model_path[:-len('.h5')]}.npz"
+            export_numpy_model(keras.models.load_model(model_path), export_path)
+            print(f"Exported {model_path} to {export_path}")
+
+
 def train_and_save_model(symbol: str, model_name: str, epochs: int = 50):
     """Train and save an LSTM model for a stock.
     
@@ -70,9 +118,20 @@ def train_and_save_model(symbol: str, model_name: str, epochs: int = 50):
     model_path = f"models/{model_name}.h5"
     model.save(model_path)
     print(f"Model saved to {model_path}")
+    
+    # Export for serving without TensorFlow
+    export_numpy_model(model, f"models/{model_name}.npz")
+    print(f"Weights exported to models/{model_name}.npz")
 
 
 if __name__ == "__main__":
+    import sys
+    
+    if "--export" in sys.argv:
+        # Convert models trained earlier
+        export_saved_models()
+        sys.exit(0)
+    
     # Train models for major indices
     print("Creating placeholder models...")
     print("Note: These are basic models. For production, train with more data and tuning.")
@@ -6,6 +6,11 @@ from typing import List, Dict
 from datetime import datetime, timedelta
 import feedparser
 from urllib.parse import quote
+from src.services.single_flight import SingleFlight
+
+
+# Coalesces concurrent fetches of the same news feed across sessions
+news_flight = SingleFlight("news_fetcher")
 
 
 def fetch_google_news(stock_name: str, limit: int = 10) -> List[Dict]:
@@ -24,8 +29,8 @@ def fetch_google_news(stock_name: str, limit: int = 10) -> List[Dict]:
         encoded_query = quote(query)
         url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-IN&gl=IN&ceid=IN:en"
         
-        # Parse RSS feed
-        feed = feedparser.parse(url)
+        # Parse RSS feed, sharing the request with concurrent callers
+        feed = news_flight.do(url, feedparser.parse, url)
         
         news_list = []
         cutoff_date = datetime.now() - timedelta(hours=48)  # Last 48 hours
@@ -1,53 +1,52 @@
 """
 Prediction service for stock price forecasting using LSTM models.
+
+Models exported for the NumPy runtime (.npz) are served without importing
+TensorFlow; it is imported only when a Keras .h5 model has to be run.
 """
-import os
+import threading
+import weakref
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
-from tensorflow import keras
-import streamlit as st
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
-from src.services.data_service import get_stock_data, format_indian_stock_symbol
+from src.services.data_service import get_stock_data, get_stock_data_batch, format_indian_stock_symbol
+from src.services.lstm_runtime import NumpyLSTM
+from src.services.market_calendar import market_hours_cache
+from src.services.model_registry import ModelRegistry, model_registry
 
 
 class PredictionService:
     """Service for predicting stock prices using LSTM models."""
     
-    def __init__(self, models_dir: str = "models"):
+    def __init__(self, models_dir: str = "models", registry: Optional[ModelRegistry] = None):
         """Initialize the prediction service.
         
         Args:
             models_dir: Directory containing pre-trained models
+            registry: Registry caching the loaded models (default: a new one for models_dir)
         """
         self.models_dir = models_dir
+        self.registry = registry or ModelRegistry(models_dir)
         self.lookback_window = 60
         self.scaler = MinMaxScaler(feature_range=(0, 1))
+        # Compiled rollouts, dropped with their model when it leaves the registry
+        self._rollouts = weakref.WeakKeyDictionary()
+        self._rollouts_lock = threading.Lock()
     
-    def load_model(self, stock_symbol: str) -> Optional[keras.Model]:
+    def load_model(self, stock_symbol: str) -> Optional[Any]:
         """Load pre-trained model for a stock symbol.
         
         Args:
             stock_symbol: Stock symbol to load model for
         
         Returns:
-            Loaded Keras model or None if not found
+            Loaded NumpyLSTM or Keras model, or None if not found
         """
         try:
-            # Format symbol for filename
-            symbol_clean = stock_symbol.replace('.', '_').replace('^', '')
-            model_path = os.path.join(self.models_dir, f"{symbol_clean}_lstm.h5")
-            
-            if os.path.exists(model_path):
-                return keras.models.load_model(model_path)
-            
-            # Try general model as fallback
-            general_model_path = os.path.join(self.models_dir, "general_model.h5")
-            if os.path.exists(general_model_path):
-                return keras.models.load_model(general_model_path)
-            
-            return None
+            # The symbol's own model, else the general model, loaded once per file version
+            return self.registry.get(stock_symbol)
         
         except Exception as e:
             print(f"Error loading model: {e}")
@@ -86,6 +85,31 @@ class PredictionService:
         
         return np.array(sequences)
     
+    def forecast(self, model: Any, windows: np.ndarray, days: int) -> np.ndarray:
+        """Roll a model forward from scaled windows.
+        
+        NumPy runtime models roll forward directly; Keras models run in one
+        compiled graph call.
+        
+        Args:
+            model: Loaded NumpyLSTM or Keras model
+            windows: Scaled closing prices with shape (batch, lookback_window, 1)
+            days: Number of days to forecast
+        
+        Returns:
+            Scaled forecasts with shape (batch, days)
+        """
+        if isinstance(model, NumpyLSTM):
+            return model.rollout(windows, days)
+        
+        from src.services.lstm_model import create_rollout
+        with self._rollouts_lock:
+            rollout = self._rollouts.get(model)
+            if rollout is None:
+                rollout = create_rollout(model, self.lookback_window)
+                self._rollouts[model] = rollout
+        return rollout(np.asarray(windows, dtype=np.float32), np.int32(days)).numpy()
+    
     def predict_prices(self, symbol: str, days: int = 5) -> Optional[Dict]:
         """Generate price predictions for the next N days.
         
@@ -113,50 +137,107 @@ class PredictionService:
                 # Use simple linear regression as fallback
                 return self._simple_prediction(original_data, days)
             
-            # Make predictions
-            predictions = []
-            current_sequence = scaled_data[-self.lookback_window:].copy()
-            
-            for _ in range(days):
-                # Reshape for model input
-                X = current_sequence.reshape(1, self.lookback_window, 1)
-                
-                # Predict next value
-                pred_scaled = model.predict(X, verbose=0)[0, 0]
-                predictions.append(pred_scaled)
-                
-                # Update sequence for next prediction
-                current_sequence = np.append(current_sequence[1:], [[pred_scaled]], axis=0)
-            
-            # Inverse transform predictions
-            predictions_array = np.array(predictions).reshape(-1, 1)
-            predictions_actual = scaler.inverse_transform(predictions_array).flatten()
+            # Make predictions, feeding each day back in for the next
+            window = scaled_data[-self.lookback_window:].reshape(1, self.lookback_window, 1)
+            predictions = self.forecast(model, window, days)[0]
             
-            # Generate prediction dates
-            last_date = historical_data.index[-1]
-            prediction_dates = [(last_date + timedelta(days=i+1)).strftime('%Y-%m-%d') 
-                               for i in range(days)]
-            
-            # Calculate confidence intervals (±5%)
-            confidence_lower = predictions_actual * 0.95
-            confidence_upper = predictions_actual * 1.05
-            
-            return {
-                "predictions": [round(p, 2) for p in predictions_actual],
-                "dates": prediction_dates,
-                "confidence_interval": {
-                    "lower": [round(l, 2) for l in confidence_lower],
-                    "upper": [round(u, 2) for u in confidence_upper]
-                },
-                "historical_actual": original_data[-30:].flatten().tolist(),
-                "historical_dates": [d.strftime('%Y-%m-%d') for d in historical_data.index[-30:]],
-                "model_type": "LSTM"
-            }
+            return self._lstm_result(historical_data, original_data, scaler, predictions)
         
         except Exception as e:
             print(f"Error predicting prices: {e}")
             return None
     
+    def predict_prices_batch(self, symbols: List[str], days: int = 5) -> Dict[str, Optional[Dict]]:
+        """Generate price predictions for many symbols with one batched rollout per model.
+        
+        Each symbol is scaled with its own scaler; symbols using the same model
+        file are stacked into one (symbols, lookback_window, 1) batch, so every
+        forecast day is a single forward pass for the whole group.
+        
+        Args:
+            symbols: Stock symbols
+            days: Number of days to predict (1-5)
+        
+        Returns:
+            Dictionary mapping each symbol to its predictions (as returned by
+            predict_prices), or to None if it could not be predicted
+        """
+        results = {symbol: None for symbol in symbols}
+        groups = {}
+        
+        for symbol, historical_data in get_stock_data_batch(symbols, period="1y").items():
+            try:
+                if isinstance(historical_data, Exception) or len(historical_data) < self.lookback_window:
+                    continue
+                
+                original_data = historical_data['Close'].values.reshape(-1, 1)
+                scaler = MinMaxScaler(feature_range=(0, 1))
+                scaled_data = scaler.fit_transform(original_data)
+                
+                formatted_symbol = format_indian_stock_symbol(symbol)
+                model_path = self.registry.artifact_path(formatted_symbol)
+                if model_path is None:
+                    results[symbol] = self._simple_prediction(original_data, days)
+                else:
+                    groups.setdefault(model_path, []).append(
+                        (symbol, formatted_symbol, historical_data, original_data, scaled_data, scaler)
+                    )
+            except Exception as e:
+                print(f"Error preparing predictions for {symbol}: {e}")
+        
+        for model_path, members in groups.items():
+            try:
+                model = self.load_model(members[0][1])
+                if model is None:
+                    raise ValueError(f"model {model_path} could not be loaded")
+                windows = np.stack([scaled_data[-self.lookback_window:] for *_, scaled_data, _ in members])
+                forecasts = self.forecast(model, windows, days)
+                
+                for (symbol, _, historical_data, original_data, _, scaler), predictions in zip(members, forecasts):
+                    results[symbol] = self._lstm_result(historical_data, original_data, scaler, predictions)
+            except Exception as e:
+                print(f"Error predicting prices with {model_path}: {e}")
+        
+        return results
+    
+    def _lstm_result(self, historical_data: pd.DataFrame, original_data: np.ndarray,
+                     scaler: MinMaxScaler, predictions: np.ndarray) -> Dict:
+        """Build the prediction result from scaled LSTM forecasts.
+        
+        Args:
+            historical_data: DataFrame with historical stock data
+            original_data: Closing prices the scaler was fitted on
+            scaler: Scaler fitted on the symbol's closing prices
+            predictions: Scaled forecasts, one per day
+        
+        Returns:
+            Dictionary with predictions and metadata
+        """
+        # Inverse transform predictions
+        predictions_array = predictions.reshape(-1, 1)
+        predictions_actual = scaler.inverse_transform(predictions_array).flatten()
+        
+        # Generate prediction dates
+        last_date = historical_data.index[-1]
+        prediction_dates = [(last_date + timedelta(days=i+1)).strftime('%Y-%m-%d') 
+                           for i in range(len(predictions_actual))]
+        
+        # Calculate confidence intervals (±5%)
+        confidence_lower = predictions_actual * 0.95
+        confidence_upper = predictions_actual * 1.05
+        
+        return {
+            "predictions": [round(p, 2) for p in predictions_actual],
+            "dates": prediction_dates,
+            "confidence_interval": {
+                "lower": [round(l, 2) for l in confidence_lower],
+                "upper": [round(u, 2) for u in confidence_upper]
+            },
+            "historical_actual": original_data[-30:].flatten().tolist(),
+            "historical_dates": [d.strftime('%Y-%m-%d') for d in historical_data.index[-30:]],
+            "model_type": "LSTM"
+        }
+    
     def _simple_prediction(self, data: np.ndarray, days: int) -> Dict:
         """Simple linear regression prediction as fallback.
         
@@ -201,13 +282,21 @@ class PredictionService:
 
 
 # Global instance
-prediction_service = PredictionService()
+prediction_service = PredictionService(registry=model_registry)
+
+
+@market_hours_cache(open_ttl=3600)  # 1 hour in session, until the next open after close
+def _cached_predictions(formatted_symbol: str, days: int) -> Optional[Dict]:
+    return prediction_service.predict_prices(formatted_symbol, days)
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_price_predictions(symbol: str, days: int = 5) -> Optional[Dict]:
     """Get cached price predictions for a stock.
     
+    Entries are keyed by the formatted symbol, so every name for a stock
+    (and the prefetch scheduler) shares one cache entry. Failed predictions
+    (None) are not cached.
+    
     Args:
         symbol: Stock symbol
         days: Number of days to predict
@@ -215,4 +304,36 @@ def get_price_predictions(symbol: str, days: int = 5) -> Optional[Dict]:
     Returns:
         Prediction results
     """
-    return prediction_service.predict_prices(symbol, days)
+    return _cached_predictions(format_indian_stock_symbol(symbol), days)
+
+
+def get_price_predictions_batch(symbols: List[str], days: int = 5) -> Dict[str, Optional[Dict]]:
+    """Get cached price predictions for many stocks.
+    
+    Symbols already in the prediction cache are served from it; the rest are
+    predicted together with predict_prices_batch and cached individually, so
+    get_price_predictions finds them afterwards. Symbols that could not be
+    predicted are not cached and are retried on the next call.
+    
+    Args:
+        symbols: Stock symbols
+        days: Number of days to predict
+    
+    Returns:
+        Dictionary mapping each requested symbol to its prediction results
+    """
+    formatted = {symbol: format_indian_stock_symbol(symbol) for symbol in symbols}
+    predictions, missing = {}, []
+    for formatted_symbol in dict.fromkeys(formatted.values()):
+        entry = _cached_predictions.lookup(formatted_symbol, days)
+        if entry is not None:
+            predictions[formatted_symbol] = entry.value
+        else:
+            missing.append(formatted_symbol)
+    
+    if missing:
+        for formatted_symbol, result in prediction_service.predict_prices_batch(missing, days).items():
+            _cached_predictions.store(result, formatted_symbol, days)
+            predictions[formatted_symbol] = result
+    
+    return {symbol: predictions[formatted_symbol] for symbol, formatted_symbol in formatted.items()}
@@ -0,0 +1,243 @@
+"""
+Pre-market prefetch scheduler that warms caches for popular symbols.
+
+Before each NSE session opens, and on a fixed cadence while it trades, the
+scheduler fetches history, quotes, indicators, news sentiment and predictions
+for a configured universe so the first user of a symbol hits a warm cache.
+
+Run it inside the Streamlit process (PREFETCH_ON_STARTUP=true in app.py) to
+warm the in-process caches, or standalone to keep the shared on-disk history
+store warm:
+
+    python -m src.services.prefetch_scheduler [--once]
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from src.services.data_service import (
+    STOCK_SYMBOL_MAP,
+    format_indian_stock_symbol,
+    get_current_price,
+    get_stock_data
+)
+from src.services.indicator_state import indicator_states
+from src.services.market_calendar import IST, TradingCalendar, nse_calendar
+from src.services.prediction_service import get_price_predictions_batch
+from src.services.sentiment_service import get_sentiment_analysis
+from src.services.technical_indicators import calculate_all_indicators
+
+
+# Indices warmed in addition to the names in STOCK_SYMBOL_MAP
+PREFETCH_INDICES = ["^NSEI", "^NSEBANK", "^BSESN"]
+
+# Cache layers the scheduler can warm, in the order they are filled
+PREFETCH_STAGES = ("data", "indicators", "sentiment", "predictions")
+
+
+def default_universe() -> List[str]:
+    """Get the names users most often search for: the symbol map plus indices."""
+    return list(STOCK_SYMBOL_MAP) + [i for i in PREFETCH_INDICES if i.lower() not in STOCK_SYMBOL_MAP]
+
+
+class PrefetchScheduler:
+    """Background warm-up of the data, indicator, sentiment and prediction caches."""
+
+    def __init__(self, universe: Optional[List[str]] = None, max_workers: int = 4,
+                 interval_seconds: float = 900, lead_minutes: float = 30,
+                 stages: tuple = PREFETCH_STAGES, calendar: TradingCalendar = None):
+        """Initialize the prefetch scheduler.
+
+        Args:
+            universe: Stock names or symbols to warm (default: default_universe())
+            max_workers: Maximum number of symbols warmed concurrently
+            interval_seconds: Seconds between warm-ups while the market is open
+            lead_minutes: Minutes before the session open to run the pre-market warm-up
+            stages: Cache layers to warm, any of PREFETCH_STAGES
+            calendar: Trading calendar deciding when to run (default: NSE)
+        """
+        self.universe = universe if universe is not None else default_universe()
+        self.max_workers = max_workers
+        self.interval = timedelta(seconds=interval_seconds)
+        self.lead = timedelta(minutes=lead_minutes)
+        self.stages = tuple(stages)
+        self.calendar = calendar or nse_calendar
+        self.last_run: Optional[Dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "PrefetchScheduler":
+        """Create a scheduler configured from environment variables.
+
+        Reads PREFETCH_SYMBOLS (comma-separated, default: default_universe()),
+        PREFETCH_MAX_WORKERS, PREFETCH_INTERVAL_SECONDS, PREFETCH_LEAD_MINUTES
+        and PREFETCH_STAGES (comma-separated).
+
+        Returns:
+            Configured PrefetchScheduler
+        """
+        symbols = os.getenv("PREFETCH_SYMBOLS")
+        stages = os.getenv("PREFETCH_STAGES")
+        return cls(
+            universe=[s.strip() for s in symbols.split(",") if s.strip()] if symbols else None,
+            max_workers=int(os.getenv("PREFETCH_MAX_WORKERS", 4)),
+            interval_seconds=float(os.getenv("PREFETCH_INTERVAL_SECONDS", 900)),
+            lead_minutes=float(os.getenv("PREFETCH_LEAD_MINUTES", 30)),
+            stages=tuple(s.strip() for s in stages.split(",")) if stages else PREFETCH_STAGES
+        )
+
+    def _groups(self) -> Dict[str, List[str]]:
+        """Group the universe by formatted symbol, keeping every name used for it."""
+        groups: Dict[str, List[str]] = {}
+        for name in self.universe:
+            groups.setdefault(format_indian_stock_symbol(name), []).append(name)
+        return groups
+
+    def warm_symbol(self, formatted_symbol: str, names: List[str]) -> Dict[str, str]:
+        """Warm every configured per-symbol cache layer for one symbol.
+
+        Data is fetched once per symbol; sentiment is warmed for each name,
+        since news is searched by the name the user typed. Predictions are
+        warmed for the whole universe at once (see warm_predictions).
+
+        Args:
+            formatted_symbol: Formatted stock symbol
+            names: Names in the universe resolving to the symbol
+
+        Returns:
+            Dictionary mapping each failed stage to its error message
+        """
+        errors = {}
+        history = None
+
+        if "data" in self.stages or "indicators" in self.stages:
+            try:
+                history = get_stock_data(formatted_symbol, period="1y")
+                get_current_price(formatted_symbol)
+            except Exception as e:
+                errors["data"] = str(e)
+
+        if "indicators" in self.stages and history is not None:
+            try:
+                calculate_all_indicators(history)
+                indicator_states.sync(formatted_symbol, history)
+            except Exception as e:
+                errors["indicators"] = str(e)
+
+        if "sentiment" in self.stages:
+            try:
+                for name in names:
+                    get_sentiment_analysis(name)
+            except Exception as e:
+                errors["sentiment"] = str(e)
+
+        return errors
+
+    def warm_predictions(self, symbols: List[str]) -> Dict[str, Dict[str, str]]:
+        """Warm the prediction cache with one batched forecast per model.
+
+        Args:
+            symbols: Formatted stock symbols
+
+        Returns:
+            Dictionary mapping each symbol that failed to its stage errors
+        """
+        try:
+            get_price_predictions_batch(symbols, days=5)
+            return {}
+        except Exception as e:
+            return {symbol: {"predictions": str(e)} for symbol in symbols}
+
+    def run_once(self) -> Dict:
+        """Warm the whole universe once with bounded concurrency.
+
+        Returns:
+            Summary with the number of symbols warmed, failures per symbol,
+            elapsed seconds and completion time
+        """
+        started = time.perf_counter()
+        groups = self._groups()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch") as pool:
+            results = dict(zip(groups, pool.map(lambda item: self.warm_symbol(*item), groups.items())))
+        if "predictions" in self.stages:
+            for symbol, errors in self.warm_predictions(list(groups)).items():
+                results[symbol] = {**results[symbol], **errors}
+
+        failed = {symbol: errors for symbol, errors in results.items() if errors}
+        self.last_run = {
+            "symbols": len(groups),
+            "failed": failed,
+            "seconds": round(time.perf_counter() - started, 2),
+            "finished_at": datetime.now().isoformat()
+        }
+        print(f"Prefetch warmed {len(groups) - len(failed)}/{len(groups)} symbols "
+              f"in {self.last_run['seconds']}s")
+        return self.last_run
+
+    def next_run(self, now: Optional[datetime] = None) -> datetime:
+        """Get the time of the next warm-up after a run finished at now.
+
+        While the market is open runs repeat every interval. Otherwise the next
+        run is lead_minutes before the next session opens, or the open itself
+        if that pre-market window has already started.
+
+        Args:
+            now: Reference time (default: current time)
+
+        Returns:
+            Timezone-aware time of the next run
+        """
+        now = now.astimezone(IST) if now is not None else datetime.now(IST)
+        if self.calendar.is_open(now):
+            return now + self.interval
+        opens = self.calendar.next_open(now)
+        return opens - self.lead if opens - self.lead > now else opens
+
+    def _loop(self, run_immediately: bool):
+        if run_immediately:
+            self.run_once()
+        while not self._stop.is_set():
+            delay = (self.next_run() - datetime.now(IST)).total_seconds()
+            if self._stop.wait(max(delay, 0)):
+                break
+            self.run_once()
+
+    def start(self, run_immediately: bool = True) -> threading.Thread:
+        """Start warming on a daemon thread (no-op if already running).
+
+        Args:
+            run_immediately: Warm the universe once before waiting for the schedule
+
+        Returns:
+            The scheduler thread
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(run_immediately,),
+                                            name="prefetch-scheduler", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the scheduler after the current warm-up finishes.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    import sys
+
+    scheduler = PrefetchScheduler.from_env()
+    if "--once" in sys.argv:
+        scheduler.run_once()
+    else:
+        scheduler.start().join()
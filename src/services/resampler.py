@@ -0,0 +1,173 @@
+"""
+Multi-timeframe resampling of OHLCV bars.
+
+Derives daily, weekly and monthly bars from stored daily (or intraday) bars.
+Results are cached per symbol: every period before the current one is kept,
+and only the bars of the still-open period are aggregated again when new
+bars arrive.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+import numpy as np
+import pandas as pd
+
+
+def _day_start(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    return index.normalize()
+
+
+def _week_start(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    return index.normalize() - pd.to_timedelta(index.weekday, unit='D')
+
+
+def _month_start(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    return index.normalize() - pd.to_timedelta(index.day - 1, unit='D')
+
+
+# Timeframes by yfinance interval name, mapped to the start of each bar's period
+TIMEFRAMES: Dict[str, Callable[[pd.DatetimeIndex], pd.DatetimeIndex]] = {
+    "1d": _day_start,
+    "1wk": _week_start,
+    "1mo": _month_start
+}
+
+
+def aggregate_bars(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate bars into one bar per period.
+
+    Open is the first bar's open, High and Low the extremes (ignoring missing
+    values), Close the last bar's close and Volume the sum. Each bar is
+    labelled with the start of its period in the bars' timezone.
+
+    Args:
+        data: DataFrame with OHLCV bars, sorted by time
+        timeframe: Key of TIMEFRAMES
+
+    Returns:
+        DataFrame with one row per period present in data
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe '{timeframe}'. Use one of: {', '.join(TIMEFRAMES)}")
+    if data.empty:
+        return data.iloc[:0].copy()
+
+    periods = TIMEFRAMES[timeframe](data.index)
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    ends = np.r_[starts[1:], len(data)] - 1
+
+    columns = {}
+    for column in data.columns:
+        values = data[column].to_numpy()
+        if column == 'Open':
+            columns[column] = values[starts]
+        elif column == 'High':
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif column == 'Low':
+            columns[column] = np.fmin.reduceat(values, starts)
+        elif column == 'Volume':
+            columns[column] = np.add.reduceat(np.nan_to_num(values), starts).astype(values.dtype)
+        else:
+            columns[column] = values[ends]
+    return pd.DataFrame(columns, index=periods[starts])
+
+
+def period_is_open(start: pd.Timestamp, timeframe: str, now: Optional[pd.Timestamp] = None) -> bool:
+    """Check whether a period has not ended yet.
+
+    Args:
+        start: Label of the period (its start, as produced by aggregate_bars)
+        timeframe: Key of TIMEFRAMES
+        now: Reference time (default: current time)
+
+    Returns:
+        True if now falls inside the period, so it may still receive bars
+    """
+    now = pd.Timestamp.now(tz=start.tz) if now is None else now
+    if start.tz is not None:
+        now = now.tz_convert(start.tz) if now.tz is not None else now.tz_localize(start.tz)
+    return TIMEFRAMES[timeframe](pd.DatetimeIndex([now]))[0] == start
+
+
+class BarResampler:
+    """Bounded LRU of resampled bars that recomputes only the open period.
+
+    Entries are keyed by the symbol and interval recorded in the frame's attrs
+    by the data service, the target timeframe and the first bar, so different
+    history windows of a symbol are cached separately. Frames without a symbol
+    are aggregated directly.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """Initialize the resampler.
+
+        Args:
+            maxsize: Maximum number of cached series
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resample(self, data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """Get the bars of a frame at another timeframe.
+
+        Args:
+            data: DataFrame with OHLCV bars, sorted by time
+            timeframe: Key of TIMEFRAMES ("1d", "1wk" or "1mo")
+
+        Returns:
+            DataFrame with one bar per period. Its attrs are those of data
+            with "interval" set to timeframe, so indicator caches can key on it.
+        """
+        if timeframe == data.attrs.get("interval"):
+            return data
+
+        symbol = data.attrs.get("symbol")
+        if symbol is None or data.empty:
+            result = aggregate_bars(data, timeframe)
+        else:
+            result = self._resample_cached(
+                (symbol, data.attrs.get("interval"), timeframe, data.index[0]), data, timeframe
+            )
+        result.attrs = {**data.attrs, "interval": timeframe}
+        return result
+
+    def _resample_cached(self, key: Hashable, data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        open_pos = entry["open_pos"] if entry is not None else None
+        if open_pos is not None and open_pos < len(data) and data.index[open_pos] == entry["open_start"]:
+            # Periods before the open one cannot change; aggregate only the rest
+            recent = aggregate_bars(data.iloc[open_pos:], timeframe)
+            result = pd.concat([entry["closed"], recent]) if len(entry["closed"]) else recent
+        else:
+            open_pos = 0
+            result = aggregate_bars(data, timeframe)
+
+        # The last period may still receive bars; remember where it starts
+        last_period = TIMEFRAMES[timeframe](data.index[-1:])[0]
+        periods = TIMEFRAMES[timeframe](data.index[open_pos:])
+        open_pos += int(np.searchsorted(periods, last_period))
+
+        with self._lock:
+            self._entries[key] = {
+                "closed": result.iloc[:-1],
+                "open_pos": open_pos,
+                "open_start": data.index[open_pos]
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Remove every cached series."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+bar_resampler = BarResampler()
@@ -0,0 +1,274 @@
+"""
+Indicator-based stock screener.
+
+Keeps a precomputed table of the latest indicator values for a universe of
+symbols and evaluates filter and sort expressions against every row at once.
+Expressions use a small, safe subset of Python parsed with `ast`, e.g.
+
+    rsi < 30 and close > ma_200 and crosses_above(macd_hist, 0)
+
+Names refer to table columns (see Screener.columns). prev_<name> is the value
+at the symbol's previous bar; arithmetic, comparisons, and/or/not and the
+functions in FUNCTIONS are supported. Nothing else can be evaluated.
+"""
+import ast
+import functools
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from src.services.data_service import HISTORY_CACHE_SECONDS, get_stock_data_batch
+from src.services.exceptions import DataServiceError, InvalidQueryError
+from src.services.indicator_engine import compute_universe_indicators, latest_indicator_table
+from src.services.market_calendar import nse_calendar
+from src.services.symbol_index import symbol_index
+
+
+_COMPARISONS = {
+    ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater,
+    ast.GtE: np.greater_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal
+}
+
+_ARITHMETIC = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide,
+    ast.BitAnd: np.logical_and, ast.BitOr: np.logical_or
+}
+
+FUNCTIONS: Dict[str, Callable] = {"abs": np.abs, "min": np.minimum, "max": np.maximum}
+
+# Functions comparing the latest bar with the previous one; arguments must be
+# column names or numbers
+CROSSINGS = {
+    "crosses_above": lambda now, before: np.greater(now[0], now[1]) & np.less_equal(before[0], before[1]),
+    "crosses_below": lambda now, before: np.less(now[0], now[1]) & np.greater_equal(before[0], before[1])
+}
+
+
+@functools.lru_cache(maxsize=256)
+def parse_expression(expression: str) -> ast.Expression:
+    """Parse a screener expression.
+
+    Args:
+        expression: Expression text
+
+    Returns:
+        Parsed expression tree
+
+    Raises:
+        InvalidQueryError: If the text is not a valid expression
+    """
+    try:
+        return ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise InvalidQueryError(f"Invalid expression: {e.msg}")
+
+
+def _lookup(name: str, columns: Dict[str, np.ndarray]) -> np.ndarray:
+    values = columns.get(name.lower())
+    if values is None:
+        raise InvalidQueryError(f"Unknown column '{name}'. Available: {', '.join(sorted(columns))}")
+    return values
+
+
+def _evaluate(node: ast.AST, columns: Dict[str, np.ndarray]):
+    """Evaluate an expression node over whole columns."""
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body, columns)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.Name):
+        return _lookup(node.id, columns)
+    if isinstance(node, ast.BoolOp):
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return functools.reduce(combine, (_evaluate(value, columns) for value in node.values))
+    if isinstance(node, ast.UnaryOp):
+        operand = _evaluate(node.operand, columns)
+        if isinstance(node.op, ast.Not):
+            return np.logical_not(operand)
+        if isinstance(node.op, ast.USub):
+            return np.negative(operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        return _ARITHMETIC[type(node.op)](_evaluate(node.left, columns), _evaluate(node.right, columns))
+    if isinstance(node, ast.Compare):
+        # Chained comparisons (20 < rsi < 30) hold only if every link holds
+        result, left = True, _evaluate(node.left, columns)
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in _COMPARISONS:
+                break
+            right = _evaluate(comparator, columns)
+            result = np.logical_and(result, _COMPARISONS[type(op)](left, right))
+            left = right
+        else:
+            return result
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        name = node.func.id.lower()
+        if name in FUNCTIONS:
+            return FUNCTIONS[name](*(_evaluate(arg, columns) for arg in node.args))
+        if name in CROSSINGS and len(node.args) == 2:
+            return CROSSINGS[name](
+                [_evaluate(arg, columns) for arg in node.args],
+                [_previous(arg, columns) for arg in node.args]
+            )
+    raise InvalidQueryError(f"Unsupported expression: {ast.unparse(node)}")
+
+
+def _previous(node: ast.AST, columns: Dict[str, np.ndarray]):
+    """Evaluate a crossing argument at the previous bar."""
+    if isinstance(node, ast.Name):
+        return _lookup(f"prev_{node.id}", columns)
+    if isinstance(node, ast.Constant):
+        return _evaluate(node, columns)
+    raise InvalidQueryError(f"Crossing arguments must be column names or numbers: {ast.unparse(node)}")
+
+
+def evaluate_expression(expression: str, table: pd.DataFrame) -> np.ndarray:
+    """Evaluate an expression against every row of an indicator table.
+
+    Args:
+        expression: Screener expression
+        table: Indicator table with lowercase column names
+
+    Returns:
+        Array with one value per row (NaN comparisons are False)
+
+    Raises:
+        InvalidQueryError: If the expression is invalid or uses unknown names
+    """
+    columns = {name: table[name].to_numpy() for name in table.columns if table[name].dtype.kind == 'f'}
+    result = _evaluate(parse_expression(expression), columns)
+    return np.broadcast_to(result, (len(table),))
+
+
+def default_universe() -> List[str]:
+    """Get the screener universe: SCREENER_UNIVERSE (comma-separated) or every NSE equity in the symbol master."""
+    configured = os.getenv("SCREENER_UNIVERSE")
+    if configured:
+        return [s.strip() for s in configured.split(",") if s.strip()]
+    return [record["symbol"] for record in symbol_index.records
+            if "NSE" in record["exchanges"] and not record["symbol"].startswith("^")]
+
+
+def build_indicator_table(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Build the screener table from daily bars in one vectorized pass.
+
+    Args:
+        frames: Daily bars keyed by formatted symbol
+
+    Returns:
+        DataFrame indexed by symbol with a name column, lowercase indicator
+        columns, prev_<indicator> columns for the previous bar and change_pct
+    """
+    series = compute_universe_indicators(frames)
+    latest = latest_indicator_table(series)
+    previous = latest_indicator_table(series, offset=1)[list(series)]
+
+    table = latest.rename(columns=str.lower)
+    table = table.join(previous.rename(columns=lambda name: f"prev_{name.lower()}"))
+    table["change_pct"] = (table["close"] / table["prev_close"] - 1) * 100
+    names = [(symbol_index.lookup(symbol) or {}).get("name", symbol) for symbol in table.index]
+    table.insert(0, "name", names)
+    table.index.name = "symbol"
+    return table
+
+
+class Screener:
+    """Filters a universe of symbols by indicator expressions."""
+
+    def __init__(self, universe: Optional[List[str]] = None, period: str = "1y",
+                 max_age_seconds: float = HISTORY_CACHE_SECONDS):
+        """Initialize the screener.
+
+        Args:
+            universe: Symbols to screen (default: default_universe())
+            period: History loaded per symbol (enough bars for MA 200)
+            max_age_seconds: Maximum age of the table while the market is open
+        """
+        self.universe = universe
+        self.period = period
+        self.max_age_seconds = max_age_seconds
+        self.errors: Dict[str, str] = {}
+        self.built_at: Optional[datetime] = None
+        self._table: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> pd.DataFrame:
+        """Rebuild the indicator table from the cached daily history.
+
+        Symbols that cannot be loaded are left out and listed in errors. A
+        table missing symbols is not held as fresh: the next use rebuilds it,
+        so symbols lost to a transient failure return once the provider
+        recovers.
+
+        Returns:
+            The new indicator table
+        """
+        universe = self.universe if self.universe is not None else default_universe()
+        frames, errors = {}, {}
+        for symbol, data in get_stock_data_batch(universe, self.period).items():
+            if isinstance(data, DataServiceError):
+                errors[symbol] = str(data)
+            elif not data.empty:
+                frames[data.attrs.get("symbol", symbol)] = data
+
+        table = build_indicator_table(frames)
+        built_at = datetime.now() if not errors else None
+        with self._lock:
+            self._table, self.errors, self.built_at = table, errors, built_at
+        return table
+
+    def table(self) -> pd.DataFrame:
+        """Get the indicator table, rebuilding it once new bars may exist."""
+        with self._lock:
+            table, built_at = self._table, self.built_at
+        if table is not None and nse_calendar.is_fresh(built_at, self.max_age_seconds):
+            return table
+        return self.refresh()
+
+    @property
+    def columns(self) -> List[str]:
+        """Names usable in expressions."""
+        return [name for name in self.table().columns if name != "name"]
+
+    def screen(self, where: str = "", sort_by: Optional[str] = None, descending: bool = True,
+               limit: Optional[int] = 50) -> pd.DataFrame:
+        """Find the symbols matching a filter expression.
+
+        Args:
+            where: Filter expression (empty for every symbol)
+            sort_by: Expression to sort the matches by (e.g. "rsi" or "close / ma_200")
+            descending: Sort from the largest value; rows without a value come last
+            limit: Maximum number of rows returned (None for all)
+
+        Returns:
+            Matching rows of the indicator table; when sort_by is not a plain
+            column its values are added as a column named after it
+
+        Raises:
+            InvalidQueryError: If an expression is invalid
+        """
+        table = self.table()
+        if where.strip():
+            mask = evaluate_expression(where, table)
+            if mask.dtype != bool:
+                raise InvalidQueryError(f"Filter must be a condition: {where}")
+            matches = table[mask]
+        else:
+            matches = table
+
+        if sort_by:
+            keys = np.asarray(evaluate_expression(sort_by, matches), dtype=float)
+            order = np.argsort(-keys if descending else keys, kind="stable")
+            matches = matches.iloc[order]
+            if sort_by.lower() not in matches.columns:
+                matches = matches.assign(**{sort_by: keys[order]})
+
+        return matches if limit is None else matches.head(limit)
+
+
+# Global instance
+screener = Screener()
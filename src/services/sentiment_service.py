@@ -4,7 +4,7 @@ Sentiment analysis service using VADER for financial text analysis.
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from typing import Dict, List
 from datetime import datetime
-import streamlit as st
+from src.services.market_calendar import market_hours_cache
 from src.services.news_fetcher import fetch_news
 
 
@@ -159,14 +159,21 @@ class SentimentService:
 sentiment_service = SentimentService()
 
 
-@st.cache_data(ttl=1800)  # Cache for 30 minutes
+@market_hours_cache(open_ttl=1800)  # 30 minutes in session, until the next open after close
+def _cached_sentiment(query: str) -> Dict:
+    return sentiment_service.get_overall_sentiment(query)
+
+
 def get_sentiment_analysis(stock_name: str) -> Dict:
     """Get cached sentiment analysis for a stock.
     
+    Names differing only in case or spacing share one cache entry, so the
+    prefetch scheduler can warm them ahead of users.
+    
     Args:
         stock_name: Name of the stock
     
     Returns:
         Sentiment analysis results
     """
-    return sentiment_service.get_overall_sentiment(stock_name)
+    return _cached_sentiment(" ".join(stock_name.lower().split()))
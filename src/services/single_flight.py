@@ -0,0 +1,96 @@
+"""
+Single-flight request coalescing for upstream fetches.
+
+Concurrent callers asking for the same key share one in-flight call instead of
+each hitting the upstream API.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Process-wide de-duplication of concurrent calls by key."""
+
+    def __init__(self, name: str):
+        """Initialize the single-flight group.
+
+        Args:
+            name: Name of the group, used when reporting statistics
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._requests = 0
+        self._executions = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn once for all concurrent callers with the same key.
+
+        The first caller executes fn; callers arriving while it is in flight
+        block until it finishes and receive the same result or exception.
+
+        Args:
+            key: Identity of the upstream request
+            fn: Function performing the request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn
+        """
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        """Get request coalescing counters.
+
+        Returns:
+            Dictionary with total requests, upstream executions, calls saved
+            by coalescing, and calls currently in flight
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "requests": self._requests,
+                "upstream_calls": self._executions,
+                "calls_saved": self._requests - self._executions,
+                "in_flight": len(self._calls)
+            }
+
+    def reset_stats(self):
+        """Reset the request counters."""
+        with self._lock:
+            self._requests = 0
+            self._executions = 0
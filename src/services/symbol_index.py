@@ -0,0 +1,269 @@
+"""
+Symbol master with prefix and fuzzy search for NSE/BSE stocks and indices.
+
+Names are resolved locally, so typos and unknown tickers are rejected before
+any upstream request is made.
+"""
+import csv
+import os
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+
+def _normalize(text: str) -> str:
+    """Lower-case text and collapse whitespace."""
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text: str) -> List[str]:
+    """Split text into padded character trigrams of its alphanumeric words."""
+    padded = f"  {re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class _TrieNode:
+    """Prefix trie node holding the records reachable below it."""
+
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: List[int] = []
+
+
+class SymbolIndex:
+    """In-memory symbol master with exact, prefix and trigram fuzzy lookup."""
+
+    def __init__(self, records: Iterable[Dict] = ()):
+        """Initialize the symbol index.
+
+        Args:
+            records: Symbol records with ticker, name, exchanges and aliases
+        """
+        self.records: List[Dict] = []
+        self._exact: Dict[str, str] = {}
+        self._by_ticker: Dict[str, Dict] = {}
+        self._root = _TrieNode()
+        self._keys: List[tuple] = []
+        self._grams: Dict[str, List[int]] = defaultdict(list)
+
+        for record in records:
+            self.add(record["ticker"], record["name"], record.get("exchanges", ["NSE"]),
+                     record.get("aliases", []))
+
+    @classmethod
+    def from_csv(cls, path: str) -> "SymbolIndex":
+        """Load a symbol master CSV (ticker, name, exchanges, aliases).
+
+        Multi-valued columns are separated by "|". A missing file gives an
+        empty index.
+
+        Args:
+            path: Path to the symbol master CSV
+
+        Returns:
+            Populated SymbolIndex
+        """
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except FileNotFoundError:
+            print(f"Symbol master not found: {path}")
+            return cls()
+
+        return cls({
+            "ticker": row["ticker"].strip(),
+            "name": row["name"].strip(),
+            "exchanges": [e for e in row.get("exchanges", "NSE").split("|") if e],
+            "aliases": [a for a in (row.get("aliases") or "").split("|") if a]
+        } for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, ticker: str, name: str, exchanges: List[str], aliases: List[str] = ()):
+        """Add a symbol to the index.
+
+        Args:
+            ticker: Exchange ticker (e.g. RELIANCE) or Yahoo index symbol (e.g. ^NSEI)
+            name: Company or index name
+            exchanges: Listings, any of NSE, BSE and INDEX
+            aliases: Extra search names (e.g. "ril")
+        """
+        is_index = ticker.startswith("^")
+        symbol = ticker.upper() if is_index else f"{ticker.upper()}.{'NS' if 'NSE' in exchanges else 'BO'}"
+        record = {
+            "ticker": ticker.upper(),
+            "name": name,
+            "exchanges": list(exchanges),
+            "aliases": list(aliases),
+            "symbol": symbol
+        }
+        record_id = len(self.records)
+        self.records.append(record)
+        self._by_ticker[record["ticker"]] = record
+
+        keys = [ticker, name] + list(aliases)
+        for key in keys:
+            self._exact.setdefault(_normalize(key), symbol)
+        if not is_index:
+            for exchange, suffix in (("NSE", "NS"), ("BSE", "BO")):
+                if exchange in exchanges:
+                    self._exact[f"{ticker.lower()}.{suffix.lower()}"] = f"{ticker.upper()}.{suffix}"
+
+        # Every word of the name is searchable as a prefix, e.g. "bank" -> HDFC Bank
+        prefixes = set(keys) | set(name.split())
+        for key in prefixes:
+            self._insert(_normalize(key), record_id)
+
+        for key in keys:
+            key_id = len(self._keys)
+            grams = set(_trigrams(key))
+            self._keys.append((record_id, len(grams)))
+            for gram in grams:
+                self._grams[gram].append(key_id)
+
+    def _insert(self, key: str, record_id: int):
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            if not node.ids or node.ids[-1] != record_id:
+                node.ids.append(record_id)
+
+    def resolve(self, query: str) -> Optional[str]:
+        """Resolve a ticker, company name, alias or Yahoo symbol exactly.
+
+        Args:
+            query: User input (e.g. "Reliance", "tcs", "INFY.BO", "^NSEI")
+
+        Returns:
+            Yahoo Finance symbol, or None if the input is not a known symbol
+        """
+        return self._exact.get(_normalize(query))
+
+    def lookup(self, symbol: str) -> Optional[Dict]:
+        """Get the record for a resolved Yahoo Finance symbol."""
+        ticker = symbol.upper()
+        if not ticker.startswith("^"):
+            ticker = ticker.rsplit(".", 1)[0]
+        return self._by_ticker.get(ticker)
+
+    def prefix_search(self, query: str, limit: int = 8) -> List[Dict]:
+        """Find symbols whose ticker, name, name word or alias starts with query.
+
+        Args:
+            query: Typed prefix
+            limit: Maximum number of results
+
+        Returns:
+            Matching symbol records in insertion order
+        """
+        node = self._root
+        for char in _normalize(query):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.records[i] for i in node.ids[:limit]]
+
+    def fuzzy_search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Dict]:
+        """Find symbols with names similar to query by trigram overlap.
+
+        Args:
+            query: Possibly misspelled ticker or name
+            limit: Maximum number of results
+            min_score: Minimum Jaccard similarity of trigram sets
+
+        Returns:
+            Matching symbol records, best match first
+        """
+        grams = set(_trigrams(query))
+        if not grams:
+            return []
+
+        shared = defaultdict(int)
+        for gram in grams:
+            for key_id in self._grams.get(gram, ()):
+                shared[key_id] += 1
+
+        best: Dict[int, float] = {}
+        for key_id, common in shared.items():
+            record_id, key_size = self._keys[key_id]
+            score = common / (len(grams) + key_size - common)
+            if score >= min_score and score > best.get(record_id, 0.0):
+                best[record_id] = score
+
+        ranked = sorted(best.items(), key=lambda item: -item[1])
+        return [self.records[record_id] for record_id, _ in ranked[:limit]]
+
+    def search(self, query: str, limit: int = 8) -> List[Dict]:
+        """Autocomplete search: prefix matches first, then fuzzy matches.
+
+        Args:
+            query: Typed text
+            limit: Maximum number of results
+
+        Returns:
+            Matching symbol records
+        """
+        results = self.prefix_search(query, limit)
+        if len(results) < limit:
+            seen = {record["symbol"] for record in results}
+            for record in self.fuzzy_search(query, limit):
+                if record["symbol"] not in seen and len(results) < limit:
+                    results.append(record)
+        return results
+
+
+def import_nse_equity_list(path: str) -> List[Dict]:
+    """Read the NSE equity list (EQUITY_L.csv) into symbol records.
+
+    Args:
+        path: Path to the EQUITY_L.csv file published by NSE
+
+    Returns:
+        Symbol records listed on NSE
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    return [{
+        "ticker": row["SYMBOL"].strip(),
+        "name": row["NAME OF COMPANY"].strip().replace(" Limited", ""),
+        "exchanges": ["NSE"],
+        "aliases": []
+    } for row in rows]
+
+
+def write_symbol_master(records: List[Dict], path: str):
+    """Merge records into a symbol master CSV, keeping existing entries and aliases.
+
+    Args:
+        records: Symbol records to add
+        path: Path to the symbol master CSV
+    """
+    existing = SymbolIndex.from_csv(path).records
+    known = {record["ticker"] for record in existing}
+    merged = existing + [r for r in records if r["ticker"].upper() not in known]
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["ticker", "name", "exchanges", "aliases"])
+        for record in merged:
+            writer.writerow([record["ticker"], record["name"], "|".join(record["exchanges"]),
+                             "|".join(record["aliases"])])
+
+
+SYMBOL_MASTER_PATH = os.getenv("SYMBOL_MASTER_PATH", "data/symbols.csv")
+
+# Global instance
+symbol_index = SymbolIndex.from_csv(SYMBOL_MASTER_PATH)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python -m src.services.symbol_index EQUITY_L.csv
+    imported = import_nse_equity_list(sys.argv[1])
+    write_symbol_master(imported, SYMBOL_MASTER_PATH)
+    print(f"Imported {len(imported)} NSE symbols into {SYMBOL_MASTER_PATH}")
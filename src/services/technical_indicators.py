@@ -1,15 +1,154 @@
 """
 Technical indicators service for stock analysis.
 """
+import copy
+import functools
+import inspect
+import os
+import threading
+from collections import OrderedDict
 import pandas as pd
-import streamlit as st
-from typing import Dict
+from typing import Callable, Dict, Hashable, Optional
 import numpy as np
-from ta.momentum import RSIIndicator
-from ta.trend import MACD
+from src.services.indicator_engine import (
+    compute_extended_frame,
+    compute_indicator_frame,
+    compute_universe_indicators,
+    latest_indicator_table,
+    pivot_levels
+)
+from src.services.resampler import bar_resampler, period_is_open
+from src.services.support_resistance import support_resistance_zones
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+class IndicatorCache:
+    """Bounded LRU of indicator results keyed by the identity of the bars.
+
+    A frame is identified by the symbol and interval recorded in its attrs by
+    the data service, plus its first and last bar, length and latest close.
+    Building the key is O(1) regardless of how many bars the frame holds, and
+    it changes as soon as a new bar arrives or today's bar is updated.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        """Initialize the indicator cache.
+
+        Args:
+            maxsize: Maximum number of cached results
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def frame_key(data: pd.DataFrame) -> Optional[tuple]:
+        """Identify a frame of bars without hashing its contents.
+
+        Args:
+            data: DataFrame with stock data
+
+        Returns:
+            Hashable key, or None if the frame carries no symbol in its attrs
+        """
+        symbol = data.attrs.get("symbol")
+        if symbol is None or data.empty:
+            return None
+        return (symbol, data.attrs.get("interval"), data.index[0], data.index[-1],
+                len(data), float(data['Close'].iloc[-1]))
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Get a cached result, or None on a miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def set(self, key: Hashable, result: Dict):
+        """Store a result, evicting the least recently used one when full."""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Get hit and miss counters and the number of cached results."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                    "maxsize": self.maxsize}
+
+
+# Global instance
+indicator_cache = IndicatorCache(int(os.getenv("INDICATOR_CACHE_SIZE", 512)))
+
+
+def cached_indicator(fn: Callable) -> Callable:
+    """Cache an indicator function taking the bars as its first argument.
+
+    Frames without a symbol in their attrs are computed without caching.
+    Arguments are keyed after defaults are applied, so positional, keyword
+    and default spellings of the same call share one entry. Callers receive
+    copies (shallow for frames, which copy-on-write protects), so mutating a
+    result never affects the cache.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(data: pd.DataFrame, *args, **kwargs):
+        frame_key = IndicatorCache.frame_key(data)
+        if frame_key is None:
+            return fn(data, *args, **kwargs)
+
+        bound = signature.bind(data, *args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__, frame_key, repr(list(bound.arguments.items())[1:]))
+        result = indicator_cache.get(key)
+        if result is None:
+            result = fn(data, *args, **kwargs)
+            indicator_cache.set(key, result)
+        if isinstance(result, pd.DataFrame):
+            return result.copy(deep=False)
+        return copy.deepcopy(result)
+
+    return wrapper
+
+
+@cached_indicator
+def calculate_indicator_series(data: pd.DataFrame, ma_periods: tuple = (20, 50, 200),
+                               rsi_period: int = 14) -> pd.DataFrame:
+    """Calculate full indicator series in one vectorized pass.
+
+    The metric cards read the latest values and the charts plot the series,
+    so a page render computes each indicator once.
+
+    Args:
+        data: DataFrame with stock data
+        ma_periods: Periods for moving averages
+        rsi_period: RSI lookback period
+
+    Returns:
+        DataFrame indexed like data with MA_<period>, RSI, MACD, MACD_signal
+        and MACD_hist columns
+    """
+    return compute_indicator_frame(data, ma_periods=tuple(ma_periods), rsi_window=rsi_period)
+
+
+def _latest(series: pd.DataFrame, column: str) -> float:
+    return float(series[column].iloc[-1])
+
+
+@cached_indicator
 def calculate_moving_averages(data: pd.DataFrame, periods: list = [20, 50, 200]) -> Dict:
     """Calculate moving averages for given periods.
     
@@ -22,10 +161,10 @@ def calculate_moving_averages(data: pd.DataFrame, periods: list = [20, 50, 200])
     """
     try:
         result = {}
+        series = calculate_indicator_series(data, ma_periods=tuple(periods))
         for period in periods:
             if len(data) >= period:
-                ma = data['Close'].rolling(window=period).mean().iloc[-1]
-                result[f"MA_{period}"] = round(ma, 2)
+                result[f"MA_{period}"] = round(_latest(series, f"MA_{period}"), 2)
             else:
                 result[f"MA_{period}"] = None
         
@@ -35,15 +174,13 @@ def calculate_moving_averages(data: pd.DataFrame, periods: list = [20, 50, 200])
         return {f"MA_{p}": None for p in periods}
 
 
-@st.cache_data(ttl=3600)
+@cached_indicator
 def calculate_rsi(data: pd.DataFrame, period: int = 14) -> Dict:
     try:
         if len(data) < period:
             return {"current": None, "overbought": 70, "oversold": 30}
 
-        rsi_indicator = RSIIndicator(close=data['Close'], window=period)
-        rsi_series = rsi_indicator.rsi()
-        current_rsi = rsi_series.iloc[-1]
+        current_rsi = _latest(calculate_indicator_series(data, rsi_period=period), "RSI")
 
         return {
             "current": round(current_rsi, 2),
@@ -56,17 +193,16 @@ def calculate_rsi(data: pd.DataFrame, period: int = 14) -> Dict:
         print(f"Error calculating RSI: {e}")
         return {"current": None, "overbought": 70, "oversold": 30, "signal": "N/A"}
 
-@st.cache_data(ttl=3600)
+@cached_indicator
 def calculate_macd(data: pd.DataFrame) -> Dict:
     try:
         if len(data) < 26:
             return {"macd": None, "signal": None, "histogram": None}
 
-        macd_indicator = MACD(close=data['Close'])
-
-        macd_line = macd_indicator.macd().iloc[-1]
-        signal_line = macd_indicator.macd_signal().iloc[-1]
-        histogram = macd_indicator.macd_diff().iloc[-1]
+        series = calculate_indicator_series(data)
+        macd_line = _latest(series, "MACD")
+        signal_line = _latest(series, "MACD_signal")
+        histogram = _latest(series, "MACD_hist")
 
         return {
             "macd": round(macd_line, 2),
@@ -80,89 +216,146 @@ def calculate_macd(data: pd.DataFrame) -> Dict:
         return {"macd": None, "signal": None, "histogram": None, "trend": "N/A"}
 
 
-@st.cache_data(ttl=3600)
-def calculate_pivot_points(data: pd.DataFrame) -> Dict:
+@cached_indicator
+def calculate_extended_series(data: pd.DataFrame) -> pd.DataFrame:
+    """Calculate Bollinger Bands, ATR, VWAP, Stochastic, ADX and OBV series.
+
+    Args:
+        data: DataFrame with stock data (High, Low, Close and Volume)
+
+    Returns:
+        DataFrame indexed like data with BB_middle, BB_upper, BB_lower, ATR,
+        VWAP, STOCH_K, STOCH_D, ADX, ADX_pos, ADX_neg and OBV columns
+    """
+    return compute_extended_frame(data)
+
+
+def _rounded(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+@cached_indicator
+def calculate_extended_indicators(data: pd.DataFrame) -> Dict:
+    """Calculate the latest volatility, momentum, trend-strength and volume indicators.
+
+    Args:
+        data: DataFrame with stock data
+
+    Returns:
+        Dictionary with Bollinger Bands, ATR, VWAP, Stochastic, ADX and OBV
+        values (None while not enough bars are available)
+    """
+    try:
+        if data.empty:
+            raise ValueError("no bars")
+        latest = calculate_extended_series(data).iloc[-1]
+        k, adx = _rounded(latest["STOCH_K"]), _rounded(latest["ADX"])
+        return {
+            "bollinger": {"middle": _rounded(latest["BB_middle"]), "upper": _rounded(latest["BB_upper"]),
+                          "lower": _rounded(latest["BB_lower"])},
+            "atr": _rounded(latest["ATR"]),
+            "vwap": _rounded(latest["VWAP"]),
+            "stochastic": {
+                "k": k,
+                "d": _rounded(latest["STOCH_D"]),
+                "signal": "N/A" if k is None else "Overbought" if k > 80 else "Oversold" if k < 20 else "Neutral"
+            },
+            "adx": {
+                "adx": adx,
+                "plus_di": _rounded(latest["ADX_pos"]),
+                "minus_di": _rounded(latest["ADX_neg"]),
+                "trend": "N/A" if adx is None else "Strong" if adx > 25 else "Weak"
+            },
+            "obv": _rounded(latest["OBV"])
+        }
+    except Exception as e:
+        print(f"Error calculating extended indicators: {e}")
+        return {"bollinger": {"middle": None, "upper": None, "lower": None}, "atr": None, "vwap": None,
+                "stochastic": {"k": None, "d": None, "signal": "N/A"},
+                "adx": {"adx": None, "plus_di": None, "minus_di": None, "trend": "N/A"}, "obv": None}
+
+
+@cached_indicator
+def calculate_pivot_points(data: pd.DataFrame, timeframe: str = "1d") -> Dict:
     """Calculate pivot points for support and resistance levels.
     
+    Daily levels use the last bar. Weekly and monthly levels use the last
+    completed week or month, so they do not move during the current one.
+    
     Args:
         data: DataFrame with stock data
+        timeframe: Bar timeframe the levels are based on ("1d", "1wk" or "1mo")
     
     Returns:
         Dictionary with pivot points
     """
     try:
+        data = bar_resampler.resample(data, timeframe)
         if len(data) < 1:
             return {}
         
-        # Use last day's data
-        high = data['High'].iloc[-1]
-        low = data['Low'].iloc[-1]
-        close = data['Close'].iloc[-1]
-        
-        # Calculate pivot point
-        pivot = (high + low + close) / 3
-        
-        # Calculate support and resistance levels
-        r1 = 2 * pivot - low
-        r2 = pivot + (high - low)
-        r3 = high + 2 * (pivot - low)
+        # Skip a week or month that is still in progress
+        position = -1
+        if timeframe != "1d" and len(data) > 1 and period_is_open(data.index[-1], timeframe):
+            position = -2
+        high = data['High'].iloc[position]
+        low = data['Low'].iloc[position]
+        close = data['Close'].iloc[position]
         
-        s1 = 2 * pivot - high
-        s2 = pivot - (high - low)
-        s3 = low - 2 * (high - pivot)
-        
-        return {
-            "pivot": round(pivot, 2),
-            "resistance_1": round(r1, 2),
-            "resistance_2": round(r2, 2),
-            "resistance_3": round(r3, 2),
-            "support_1": round(s1, 2),
-            "support_2": round(s2, 2),
-            "support_3": round(s3, 2)
-        }
+        # Calculate pivot point and support and resistance levels
+        return {name: round(level, 2) for name, level in pivot_levels(high, low, close).items()}
     except Exception as e:
         print(f"Error calculating pivot points: {e}")
         return {}
 
 
-@st.cache_data(ttl=3600)
-def calculate_support_resistance(data: pd.DataFrame) -> Dict:
-    """Calculate support and resistance levels based on pivot points.
+@cached_indicator
+def calculate_support_resistance(data: pd.DataFrame, timeframe: str = "1d") -> Dict:
+    """Calculate support and resistance levels where price actually turned.
+    
+    Swing highs and lows are clustered into price zones weighted by touches
+    and volume (see support_resistance_zones).
     
     Args:
         data: DataFrame with stock data
+        timeframe: Bar timeframe the swings are found on ("1d", "1wk" or "1mo")
     
     Returns:
-        Dictionary with support and resistance levels
+        Dictionary with support and resistance levels (nearest first) and the
+        zones they come from
     """
     try:
-        pivot_points = calculate_pivot_points(data)
-        
-        if not pivot_points:
-            return {"support_levels": [], "resistance_levels": []}
-        
-        support_levels = [
-            pivot_points.get("support_1"),
-            pivot_points.get("support_2"),
-            pivot_points.get("support_3")
-        ]
-        
-        resistance_levels = [
-            pivot_points.get("resistance_1"),
-            pivot_points.get("resistance_2"),
-            pivot_points.get("resistance_3")
-        ]
+        zones = support_resistance_zones(bar_resampler.resample(data, timeframe))
         
         return {
-            "support_levels": [s for s in support_levels if s is not None],
-            "resistance_levels": [r for r in resistance_levels if r is not None]
+            "support_levels": [zone["level"] for zone in zones["support"]],
+            "resistance_levels": [zone["level"] for zone in zones["resistance"]],
+            "support_zones": zones["support"],
+            "resistance_zones": zones["resistance"]
         }
     except Exception as e:
         print(f"Error calculating support/resistance: {e}")
-        return {"support_levels": [], "resistance_levels": []}
+        return {"support_levels": [], "resistance_levels": [], "support_zones": [], "resistance_zones": []}
+
+
+def calculate_universe_indicators(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Calculate the latest indicators for many symbols in one vectorized pass.
+
+    The universe is aligned into (dates x symbols) arrays instead of calling
+    calculate_all_indicators once per symbol. Missing bars are skipped.
+
+    Args:
+        data: DataFrames with stock data keyed by symbol
+
+    Returns:
+        DataFrame with one row per symbol and columns Close, High, Low,
+        MA_20, MA_50, MA_200, RSI, MACD, MACD_signal, MACD_hist and the
+        pivot levels (pivot, resistance_1..3, support_1..3)
+    """
+    return latest_indicator_table(compute_universe_indicators(data))
 
 
-@st.cache_data(ttl=3600)
+@cached_indicator
 def calculate_all_indicators(data: pd.DataFrame) -> Dict:
     """Calculate all technical indicators at once.
     
@@ -177,5 +370,6 @@ def calculate_all_indicators(data: pd.DataFrame) -> Dict:
         "rsi": calculate_rsi(data),
         "macd": calculate_macd(data),
         "pivot_points": calculate_pivot_points(data),
-        "support_resistance": calculate_support_resistance(data)
+        "support_resistance": calculate_support_resistance(data),
+        "extended": calculate_extended_indicators(data)
     }
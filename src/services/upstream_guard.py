@@ -0,0 +1,240 @@
+"""
+Rate limiting, retries and circuit breaking for upstream API calls.
+"""
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from src.services.exceptions import CircuitOpenError
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available and take it.
+
+        Returns:
+            Seconds spent waiting for the token
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Circuit breaker that stops calls after repeated upstream failures."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current breaker state (closed, open or half_open)."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Check whether a call may go upstream.
+
+        Once the reset timeout has passed a single trial call is let through;
+        its outcome closes or re-opens the circuit.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class UpstreamGuard:
+    """Rate limiter, jittered retry and circuit breaker around upstream calls."""
+
+    def __init__(self, name: str, rate: float = 2.0, burst: int = 5,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 failure_threshold: int = 5, reset_timeout: float = 60.0,
+                 is_transient: Optional[Callable[[Exception], bool]] = None):
+        """Initialize the upstream guard.
+
+        Args:
+            name: Name of the upstream, used when reporting statistics
+            rate: Sustained upstream requests per second
+            burst: Maximum burst of requests above the sustained rate
+            max_retries: Retries for transient errors before giving up
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum delay in seconds between retries
+            failure_threshold: Consecutive failed calls that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            is_transient: Predicate deciding whether an error is worth retrying
+        """
+        self.name = name
+        self.limiter = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.is_transient = is_transient or (lambda e: False)
+        self._lock = threading.Lock()
+        self._counters = {
+            "calls": 0,
+            "upstream_requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "rejected": 0,
+            "stale_served": 0,
+            "rate_limit_wait_seconds": 0.0
+        }
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, **kwargs) -> "UpstreamGuard":
+        """Create a guard configured from environment variables.
+
+        Reads {prefix}_RATE_LIMIT, {prefix}_BURST, {prefix}_MAX_RETRIES,
+        {prefix}_BACKOFF_BASE, {prefix}_BACKOFF_MAX, {prefix}_BREAKER_THRESHOLD
+        and {prefix}_BREAKER_RESET_SECONDS, falling back to the defaults.
+
+        Args:
+            name: Name of the upstream
+            prefix: Environment variable prefix
+            **kwargs: Extra constructor arguments (e.g. is_transient)
+
+        Returns:
+            Configured UpstreamGuard
+        """
+        def env(key: str, default: float) -> float:
+            return float(os.getenv(f"{prefix}_{key}", default))
+
+        return cls(
+            name,
+            rate=env("RATE_LIMIT", 2.0),
+            burst=int(env("BURST", 5)),
+            max_retries=int(env("MAX_RETRIES", 3)),
+            backoff_base=env("BACKOFF_BASE", 0.5),
+            backoff_max=env("BACKOFF_MAX", 8.0),
+            failure_threshold=int(env("BREAKER_THRESHOLD", 5)),
+            reset_timeout=env("BREAKER_RESET_SECONDS", 60.0),
+            **kwargs
+        )
+
+    def _count(self, counter: str, amount: float = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Call an upstream function under rate limiting, retries and the breaker.
+
+        Args:
+            fn: Function performing the upstream request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn
+
+        Raises:
+            CircuitOpenError: If the circuit is open and the call was not attempted
+        """
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(
+                f"{self.name} is throttling requests. Showing the most recent cached data."
+            )
+
+        attempt = 0
+        while True:
+            self._count("rate_limit_wait_seconds", self.limiter.acquire())
+            self._count("upstream_requests")
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not self.is_transient(e):
+                    # Not an upstream health problem (e.g. unknown symbol)
+                    self.breaker.record_success()
+                    raise
+                if attempt >= self.max_retries:
+                    self._count("failures")
+                    self.breaker.record_failure()
+                    raise
+                attempt += 1
+                self._count("retries")
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def record_stale_served(self):
+        """Count a response answered from stale cached data."""
+        self._count("stale_served")
+
+    def stats(self) -> Dict:
+        """Get guard counters and breaker state.
+
+        Returns:
+            Dictionary with call, retry, failure, rejection and stale-serve
+            counts, total rate limiter wait time and current breaker state
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats["name"] = self.name
+        stats["rate_limit_wait_seconds"] = round(stats["rate_limit_wait_seconds"], 3)
+        stats["breaker_state"] = self.breaker.state
+        return stats
@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 from typing import Dict, Optional
+from src.services.indicator_engine import compute_indicator_frame
 
 
 # Custom color theme
@@ -20,13 +21,16 @@ COLORS = {
 
 
 def create_price_chart(data: pd.DataFrame, indicators: Optional[Dict] = None, 
-                       title: str = "Stock Price History") -> go.Figure:
+                       title: str = "Stock Price History",
+                       series: Optional[pd.DataFrame] = None) -> go.Figure:
     """Create interactive price chart with technical indicators.
     
     Args:
         data: DataFrame with stock price data
         indicators: Dictionary with technical indicators
         title: Chart title
+        series: Indicator series from calculate_indicator_series (computed
+                here if not given)
     
     Returns:
         Plotly Figure object
@@ -49,15 +53,17 @@ def create_price_chart(data: pd.DataFrame, indicators: Optional[Dict] = None,
     if indicators and 'moving_averages' in indicators:
         mas = indicators['moving_averages']
         colors = ['#3498db', '#9b59b6', '#e67e22']
+        periods = [int(key.split('_')[1]) for key in mas if key.startswith('MA_')]
+        if series is None or any(f'MA_{p}' not in series for p in periods):
+            series = compute_indicator_frame(data, ma_periods=periods)
         
         for i, (period, value) in enumerate(mas.items()):
             if value is not None and period.startswith('MA_'):
                 period_num = int(period.split('_')[1])
                 if len(data) >= period_num:
-                    ma_series = data['Close'].rolling(window=period_num).mean()
                     fig.add_trace(go.Scatter(
                         x=data.index,
-                        y=ma_series,
+                        y=series[period],
                         name=f'MA {period_num}',
                         line=dict(color=colors[i % len(colors)], width=2)
                     ))
@@ -195,33 +201,29 @@ def create_prediction_chart(prediction_data: Dict) -> go.Figure:
     
     return fig
 
-from ta.trend import MACD
 def create_technical_indicator_chart(indicator_name: str, data: pd.DataFrame, 
-                                     indicator_data: Dict) -> go.Figure:
+                                     indicator_data: Dict,
+                                     series: Optional[pd.DataFrame] = None) -> go.Figure:
     """Create chart for technical indicators (RSI, MACD).
     
     Args:
         indicator_name: Name of the indicator ('RSI' or 'MACD')
         data: DataFrame with stock data
         indicator_data: Dictionary with indicator values
+        series: Indicator series from calculate_indicator_series (computed
+                here if not given)
     
     Returns:
         Plotly Figure object
     """
     fig = go.Figure()
+    if series is None:
+        series = compute_indicator_frame(data, ma_periods=())
                                          
     if indicator_name == 'RSI':
-        # Calculate RSI series
-        from ta.momentum import RSIIndicator
-
-        rsi_series = RSIIndicator(
-            close=data['Close'],
-            window=14
-        ).rsi()
-
         fig.add_trace(go.Scatter(
             x=data.index,
-            y=rsi_series,
+            y=series['RSI'],
             name='RSI',
             line=dict(color=COLORS['primary'], width=2)
         ))
@@ -256,28 +258,21 @@ def create_technical_indicator_chart(indicator_name: str, data: pd.DataFrame,
             )
             return fig
 
-        # Calculate MACD
-        macd_indicator = MACD(close=data['Close'])
-
-        macd_line = macd_indicator.macd()
-        signal_line = macd_indicator.macd_signal()
-        histogram = macd_indicator.macd_diff()
-
         fig.add_trace(go.Scatter(
             x=data.index,
-            y=macd_line,
+            y=series['MACD'],
             name='MACD'
         ))
 
         fig.add_trace(go.Scatter(
             x=data.index,
-            y=signal_line,
+            y=series['MACD_signal'],
             name='Signal'
         ))
 
         fig.add_trace(go.Bar(
             x=data.index,
-            y=histogram,
+            y=series['MACD_hist'],
             name='Histogram'
         ))
 
@@ -0,0 +1,38 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+from src.services import cache_backend, data_service
+from src.services.cache_backend import MemoryCacheBackend
+from src.services.history_store import history_store
+from src.services.market_data_provider import ReplayProvider, get_provider, set_provider
+from src.services.technical_indicators import indicator_cache
+from src.services.upstream_guard import UpstreamGuard
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep cached and stored market data from leaking between tests."""
+    # Replaced without creating the default backend, which would open the shared database
+    monkeypatch.setattr(cache_backend, "_backend", MemoryCacheBackend())
+    monkeypatch.setattr(history_store, "store_dir", str(tmp_path / "history"))
+    monkeypatch.setattr(data_service, "yahoo_guard", UpstreamGuard(
+        "Yahoo Finance", rate=1000, burst=1000, backoff_base=0,
+        is_transient=data_service._is_transient
+    ))
+    data_service._last_known_info.clear()
+    data_service.clear_cache()
+    indicator_cache.clear()
+    yield
+    data_service.data_refresher.wait()
+    data_service.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def replay_provider(tmp_path):
+    """Serve market data from per-test recorded fixtures instead of the network."""
+    original = get_provider()
+    provider = ReplayProvider(str(tmp_path / "fixtures"))
+    set_provider(provider)
+    yield provider
+    set_provider(original)
@@ -0,0 +1,147 @@
+"""
+Unit tests for the shared cache backends.
+"""
+import os
+import subprocess
+import sys
+import time
+import pandas as pd
+import pytest
+from src.services.cache_backend import (
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    set_cache_backend,
+    shared_cache
+)
+from src.services.market_calendar import market_hours_cache
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend(max_bytes=10_000)
+    return SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), max_bytes=10_000, access_resolution_seconds=0)
+
+
+def test_set_and_get_round_trip(backend):
+    """Test that values come back as equal copies with a store time."""
+    frame = pd.DataFrame({'Close': [1.0, 2.0]})
+    backend.set("history:TCS.NS", frame, 60)
+
+    entry = backend.get("history:TCS.NS")
+
+    pd.testing.assert_frame_equal(entry.value, frame)
+    assert entry.value is not frame
+    assert backend.get("history:INFY.NS") is None
+    assert backend.stats()["hits"] == 1 and backend.stats()["misses"] == 1
+
+
+def test_expired_entries_are_not_returned(backend):
+    """Test TTL expiry."""
+    backend.set("quote:TCS.NS", {"current_price": 1}, 0.01)
+    time.sleep(0.02)
+
+    assert backend.get("quote:TCS.NS") is None
+
+
+def test_size_limit_evicts_least_recently_used(backend):
+    """Test that the oldest unused entries are evicted over the size limit."""
+    for key in ("a", "b", "c"):
+        backend.set(key, b"x" * 4000, 60)
+        time.sleep(0.001)
+        backend.get("a")
+
+    assert backend.get("a") is not None
+    assert backend.get("b") is None
+    assert backend.get("c") is not None
+    assert backend.stats()["evictions"] == 1
+
+
+def test_clear_by_prefix(backend):
+    """Test that clearing a namespace leaves other entries alone."""
+    backend.set("quote:TCS.NS", 1, 60)
+    backend.set("info:TCS.NS", 2, 60)
+
+    backend.clear("quote:")
+
+    assert backend.get("quote:TCS.NS") is None
+    assert backend.get("info:TCS.NS").value == 2
+
+
+def test_sqlite_hits_rarely_write(tmp_path):
+    """Test that repeated hits record the access time at most once per resolution interval."""
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), access_resolution_seconds=60)
+    backend.set("quote:TCS.NS", 1, 60)
+    writes = backend._connect().total_changes
+
+    for _ in range(10):
+        assert backend.get("quote:TCS.NS").value == 1
+
+    assert backend._connect().total_changes == writes
+
+
+def test_sqlite_usage_is_tracked_incrementally(tmp_path):
+    """Test that the running totals follow inserts, replacements, deletes and evictions."""
+    path = str(tmp_path / "cache.sqlite")
+    backend = SQLiteCacheBackend(path, max_bytes=10_000)
+    for key in ("a", "b", "c"):
+        backend.set(key, b"x" * 3000, 60)
+    backend.set("a", b"x" * 100, 60)
+    backend.set("d", b"x" * 5000, 60)
+    backend.delete("d")
+    replica = SQLiteCacheBackend(path, max_bytes=10_000)
+
+    conn = backend._connect()
+    expected = conn.execute("SELECT COUNT(*), SUM(size) FROM cache").fetchone()
+    assert backend.stats()["evictions"] == 1
+    assert backend._usage() == replica._usage() == expected
+
+
+def test_sqlite_is_shared_between_processes_and_restarts(tmp_path):
+    """Test that a second backend on the same file (another replica) sees the entries."""
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteCacheBackend(path).set("quote:TCS.NS", {"current_price": 3500.0}, 60)
+
+    replica = SQLiteCacheBackend(path)
+
+    assert replica.get("quote:TCS.NS").value == {"current_price": 3500.0}
+
+
+def test_shared_caches_compute_once_across_replicas(tmp_path):
+    """Test that replicas sharing a database reuse each other's results."""
+    path = str(tmp_path / "cache.sqlite")
+    calls = []
+
+    @market_hours_cache(open_ttl=300)
+    def sentiment(name):
+        calls.append(name)
+        return {"score": 0.5}
+
+    @shared_cache(ttl_seconds=60)
+    def info(symbol):
+        calls.append(symbol)
+        return {"name": symbol}
+
+    set_cache_backend(SQLiteCacheBackend(path))
+    sentiment("tcs")
+    info("TCS.NS")
+    set_cache_backend(SQLiteCacheBackend(path))
+
+    assert sentiment("tcs") == {"score": 0.5}
+    assert info("TCS.NS") == {"name": "TCS.NS"}
+    assert calls == ["tcs", "TCS.NS"]
+
+
+def test_default_backend_is_created_on_first_use(tmp_path):
+    """Test that importing the services does not open the shared database."""
+    path = tmp_path / "shared_cache.sqlite"
+    script = (
+        "import os\n"
+        "from src.services import cache_backend, data_service\n"
+        f"assert not os.path.exists({str(path)!r})\n"
+        "assert cache_backend.get_cache_backend().name == 'sqlite'\n"
+        f"assert os.path.exists({str(path)!r})\n"
+    )
+
+    subprocess.run([sys.executable, "-c", script], check=True,
+                   env={**os.environ, "CACHE_BACKEND": "sqlite", "CACHE_DB_PATH": str(path)})
@@ -0,0 +1,50 @@
+"""
+Unit tests for the dashboard search flow.
+"""
+from unittest.mock import patch
+from streamlit.testing.v1 import AppTest
+from src.dashboard import dashboard
+from src.services import data_service
+from src.services.exceptions import DataNotAvailableError
+
+
+def _app():
+    from src.dashboard.dashboard import render_dashboard
+    render_dashboard()
+
+
+def _search(text: str, suggestion=None):
+    """Type a search, optionally pick a suggestion and press Analyze."""
+    with patch.object(dashboard, 'get_current_price', return_value={}), \
+            patch.object(dashboard, 'get_stock_data', side_effect=DataNotAvailableError("stop")) as get_stock_data:
+        app = AppTest.from_function(_app).run()
+        app.text_input(key="stock_search").input(text).run()
+        if suggestion is not None:
+            app.selectbox(key="symbol_suggestion").select_index(suggestion).run()
+        next(button for button in app.button if button.label.endswith("Analyze")).click().run()
+    return app, get_stock_data
+
+
+def test_unlisted_ticker_is_searched_as_typed():
+    """Test that a ticker missing from the symbol master is not swapped for a suggestion."""
+    for ticker in ("HDFCAMC", "RVNL"):
+        app, get_stock_data = _search(ticker)
+
+        get_stock_data.assert_called_once_with(ticker, period="1y")
+        assert app.session_state['last_symbol'] == ticker
+
+
+def test_suggestion_is_used_once_picked():
+    """Test that picking a suggestion searches the suggested symbol."""
+    app, get_stock_data = _search("HDFCAMC", suggestion=1)
+
+    get_stock_data.assert_called_once_with("HDFCBANK.NS", period="1y")
+
+
+def test_strict_validation_offers_only_known_symbols(monkeypatch):
+    """Test that the typed input is not offered when strict validation would reject it."""
+    monkeypatch.setattr(data_service, "STRICT_SYMBOL_VALIDATION", True)
+
+    _, get_stock_data = _search("HDFCAMC")
+
+    get_stock_data.assert_called_once_with("HDFCBANK.NS", period="1y")
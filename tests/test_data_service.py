@@ -1,21 +1,74 @@
 """
 Unit tests for data service.
 """
+import os
+import time
+from datetime import datetime
 import pytest
 from unittest.mock import Mock, patch
 import pandas as pd
+import numpy as np
+import requests
 from src.services.data_service import (
     format_indian_stock_symbol,
     format_inr,
     get_stock_data,
     get_current_price,
-    get_stock_info
+    get_stock_info,
+    get_stock_data_batch,
+    get_current_prices,
+    resolve_symbol,
+    search_symbols
 )
 from src.services.exceptions import (
     InvalidSymbolError,
     DataNotAvailableError,
-    NetworkError
+    NetworkError,
+    APIRateLimitError
 )
+from src.services import data_service
+from src.services.history_store import history_store
+from src.services.market_data_provider import (
+    MarketDataProvider,
+    ReplayProvider,
+    create_provider_from_env,
+    set_provider
+)
+from src.services.technical_indicators import calculate_indicator_series
+
+
+def _recent_dates(count: int) -> pd.DatetimeIndex:
+    """Build a daily index ending today, as returned by yfinance."""
+    return pd.date_range(end=pd.Timestamp.now().normalize(), periods=count, freq='D',
+                         tz='Asia/Kolkata')
+
+
+def _bars(close, high=None, low=None, volume=None, dates=None) -> pd.DataFrame:
+    """Build daily OHLCV bars ending today."""
+    count = len(close)
+    return pd.DataFrame({
+        'Open': [float(c) for c in close],
+        'High': [float(h) for h in (high or [c + 5 for c in close])],
+        'Low': [float(l) for l in (low or [c - 5 for c in close])],
+        'Close': [float(c) for c in close],
+        'Volume': volume or [1000000 + i * 100000 for i in range(count)]
+    }, index=dates if dates is not None else _recent_dates(count))
+
+
+@pytest.fixture
+def strict_symbols(monkeypatch):
+    """Reject symbols missing from the symbol master (SYMBOL_VALIDATION=strict)."""
+    monkeypatch.setattr(data_service, "STRICT_SYMBOL_VALIDATION", True)
+
+
+def _throttled_provider() -> Mock:
+    """Create a provider whose every request is rate limited."""
+    error = requests.exceptions.HTTPError(response=Mock(status_code=429))
+    provider = Mock(spec=MarketDataProvider)
+    provider.history.side_effect = error
+    provider.download.side_effect = error
+    provider.info.side_effect = error
+    return provider
 
 
 def test_format_indian_stock_symbol_common_names():
@@ -63,99 +116,171 @@ def test_format_inr_small_amounts():
     assert format_inr(99.99) == "₹99.99"
 
 
-@patch('src.services.data_service.yf.Ticker')
-def test_get_stock_data_success(mock_ticker):
+def test_get_stock_data_success(replay_provider):
     """Test successful stock data retrieval."""
-    # Mock data
-    mock_data = pd.DataFrame({
-        'Open': [100, 101, 102],
-        'High': [105, 106, 107],
-        'Low': [95, 96, 97],
-        'Close': [102, 103, 104],
-        'Volume': [1000000, 1100000, 1200000]
-    })
-    
-    mock_instance = Mock()
-    mock_instance.history.return_value = mock_data
-    mock_ticker.return_value = mock_instance
-    
+    replay_provider.save("RELIANCE.NS", _bars([102, 103, 104]))
+
     result = get_stock_data("RELIANCE")
-    
+
     assert result is not None
     assert len(result) == 3
     assert 'Close' in result.columns
 
 
-@patch('src.services.data_service.yf.Ticker')
-def test_get_stock_data_empty_data(mock_ticker):
+def test_get_stock_data_empty_data():
     """Test handling of empty data."""
-    mock_instance = Mock()
-    mock_instance.history.return_value = pd.DataFrame()
-    mock_ticker.return_value = mock_instance
-    
     with pytest.raises(DataNotAvailableError):
-        get_stock_data("INVALID")
+        get_stock_data("NTPC")
+
+
+def test_get_stock_data_unknown_symbol_rejected_before_fetch(replay_provider, strict_symbols):
+    """Test that unknown symbols never reach the market data provider."""
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history:
+        with pytest.raises(InvalidSymbolError, match="Did you mean: Reliance Industries"):
+            get_stock_data("Relaince")
+
+    history.assert_not_called()
+
 
+def test_resolve_symbol_uses_symbol_master(strict_symbols):
+    """Test resolution of tickers, company names, aliases and exchange suffixes."""
+    assert resolve_symbol("Larsen & Toubro") == "LT.NS"
+    assert resolve_symbol("ril") == "RELIANCE.NS"
+    assert resolve_symbol("infy.bo") == "INFY.BO"
+    assert resolve_symbol("^NSEI") == "^NSEI"
+    with pytest.raises(InvalidSymbolError):
+        resolve_symbol("UNKNOWN")
 
-@patch('src.services.data_service.yf.Ticker')
-def test_get_current_price_success(mock_ticker):
+
+def test_resolve_symbol_lenient_by_default(replay_provider):
+    """Test that tickers outside the bundled symbol master are still fetched."""
+    replay_provider.save("RVNL.NS", _bars([400, 410]))
+
+    assert resolve_symbol("RVNL") == "RVNL.NS"
+    assert resolve_symbol("cdsl.bo") == "CDSL.BO"
+    assert list(get_stock_data("RVNL")['Close']) == [400.0, 410.0]
+
+
+def test_search_symbols_autocomplete():
+    """Test prefix autocomplete with fuzzy fallback."""
+    assert search_symbols("hdfc")[0]['symbol'] == "HDFCBANK.NS"
+    assert "TATASTEEL.NS" in [r['symbol'] for r in search_symbols("tata")]
+    assert search_symbols("infosis")[0]['symbol'] == "INFY.NS"
+    assert search_symbols("  ") == []
+
+
+def test_get_current_price_success(replay_provider):
     """Test successful current price retrieval."""
-    # Mock data
-    mock_hist = pd.DataFrame({
-        'Close': [100, 102],
-        'High': [105, 107],
-        'Low': [95, 97],
-        'Volume': [1000000, 1100000]
-    })
-    
-    mock_info = {
-        'longName': 'Reliance Industries',
-        'previousClose': 100
-    }
-    
-    mock_instance = Mock()
-    mock_instance.history.return_value = mock_hist
-    mock_instance.info = mock_info
-    mock_ticker.return_value = mock_instance
-    
+    replay_provider.save(
+        "RELIANCE.NS",
+        _bars([100, 102], high=[105, 107], low=[95, 97], volume=[1000000, 1100000]),
+        {'longName': 'Reliance Industries', 'previousClose': 100}
+    )
+
     result = get_current_price("RELIANCE")
-    
+
     assert result is not None
     assert result['current_price'] == 102
     assert result['day_high'] == 107
     assert result['day_low'] == 97
     assert result['volume'] == 1100000
     assert result['currency'] == 'INR'
+    assert result['name'] == 'Reliance Industries'
     assert 'change_percent' in result
 
 
-@patch('src.services.data_service.yf.Ticker')
-def test_get_current_price_percentage_change(mock_ticker):
+def test_get_current_price_percentage_change(replay_provider):
     """Test percentage change calculation."""
-    mock_hist = pd.DataFrame({
-        'Close': [100, 110],
-        'High': [105, 115],
-        'Low': [95, 105],
-        'Volume': [1000000, 1100000]
-    })
-    
-    mock_info = {'longName': 'Test Stock', 'previousClose': 100}
-    
-    mock_instance = Mock()
-    mock_instance.history.return_value = mock_hist
-    mock_instance.info = mock_info
-    mock_ticker.return_value = mock_instance
-    
-    result = get_current_price("TEST")
-    
+    replay_provider.save("MARUTI.NS", _bars([100, 110]), {'longName': 'Maruti Suzuki India'})
+
+    result = get_current_price("MARUTI")
+
     # 10% increase from 100 to 110
     assert result['change_percent'] == 10.0
 
 
-@patch('src.services.data_service.yf.Ticker')
-def test_get_stock_info_success(mock_ticker):
+def test_get_current_price_reuses_fresh_history(replay_provider):
+    """Test that a fresh history fetch is the only call on the quote path."""
+    replay_provider.save("WIPRO.NS", _bars([100, 102]), {'longName': 'Wipro Limited'})
+
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history, \
+            patch.object(replay_provider, 'info', wraps=replay_provider.info) as info:
+        result = get_current_price("WIPRO")
+        get_stock_data("WIPRO", period="1y")
+        data_service.data_refresher.wait()
+
+    history.assert_called_once_with("WIPRO.NS", period=data_service.HISTORY_CANONICAL_PERIOD)
+    info.assert_not_called()
+    assert result['name'] == 'Wipro'
+    assert result['current_price'] == 102.0
+
+
+def test_get_current_price_overlays_latest_bar(replay_provider):
+    """Test that today's bar replaces a stale stored bar in the quote."""
+    dates = _recent_dates(2)
+    history_store.merge("ITC.NS", _bars([100, 101], volume=[1000000, 500000], dates=dates), None)
+    history_store.invalidate()
+    replay_provider.save(
+        "ITC.NS",
+        _bars([100, 104], high=[105, 108], low=[95, 96], volume=[1000000, 900000], dates=dates)
+    )
+
+    result = get_current_price("ITC")
+
+    assert result['current_price'] == 104.0
+    assert result['day_high'] == 108.0
+    assert result['volume'] == 900000
+    assert result['change_percent'] == 4.0
+    assert result['name'] == 'ITC'
+
+
+def test_get_current_price_names_unlisted_symbols_off_the_quote_path(replay_provider):
+    """Test that symbols outside the symbol master get their name from .info in the background."""
+    replay_provider.save("RVNL.NS", _bars([400, 410]), {'longName': 'Rail Vikas Nigam Limited'})
+
+    with patch.object(replay_provider, 'info', side_effect=replay_provider.info) as info:
+        first = get_current_price("RVNL")
+        data_service.data_refresher.wait()
+    info.assert_called_once_with("RVNL.NS")
+    data_service.get_cache_backend().clear("quote:")
+
+    assert first['name'] == 'RVNL.NS'
+    assert get_current_price("RVNL")['name'] == 'Rail Vikas Nigam Limited'
+
+
+def test_get_current_price_serves_stale_quote_while_refreshing(replay_provider):
+    """Test that an expired quote is returned at once and refreshed in the background."""
+    replay_provider.save("ITC.NS", _bars([100, 101]))
+    get_current_price("ITC")
+    history_store.invalidate()
+    replay_provider.save("ITC.NS", _bars([100, 110]))
+
+    with patch.object(data_service.nse_calendar, 'is_fresh', return_value=False):
+        stale = get_current_price("ITC")
+    data_service.data_refresher.wait()
+    fresh = get_current_price("ITC")
+
+    assert stale['stale'] and stale['current_price'] == 101.0
+    assert not fresh['stale'] and fresh['current_price'] == 110.0
+
+
+def test_get_current_price_waits_when_revalidation_disabled(replay_provider, monkeypatch):
+    """Test that an expired quote is rebuilt synchronously without stale-while-revalidate."""
+    monkeypatch.setattr(data_service, "STALE_WHILE_REVALIDATE", False)
+    replay_provider.save("ITC.NS", _bars([100, 101]))
+    get_current_price("ITC")
+    history_store.invalidate()
+    replay_provider.save("ITC.NS", _bars([100, 110]))
+
+    with patch.object(data_service.nse_calendar, 'is_fresh', return_value=False):
+        result = get_current_price("ITC")
+
+    assert not result['stale'] and result['current_price'] == 110.0
+
+
+def test_get_stock_info_success(replay_provider):
     """Test successful stock info retrieval."""
-    mock_info = {
+    replay_provider.save("RELIANCE.NS", _bars([100]), {
         'longName': 'Reliance Industries Limited',
         'sector': 'Energy',
         'industry': 'Oil & Gas',
@@ -164,14 +289,10 @@ def test_get_stock_info_success(mock_ticker):
         'dividendYield': 0.005,
         'fiftyTwoWeekHigh': 2800,
         'fiftyTwoWeekLow': 2000
-    }
-    
-    mock_instance = Mock()
-    mock_instance.info = mock_info
-    mock_ticker.return_value = mock_instance
-    
+    })
+
     result = get_stock_info("RELIANCE")
-    
+
     assert result is not None
     assert result['name'] == 'Reliance Industries Limited'
     assert result['sector'] == 'Energy'
@@ -179,3 +300,249 @@ def test_get_stock_info_success(mock_ticker):
     assert result['currency'] == 'INR'
     assert result['52_week_high'] == 2800
     assert result['52_week_low'] == 2000
+
+
+def test_get_stock_data_persists_history(replay_provider):
+    """Test that fetched history is written to the local store."""
+    replay_provider.save("RELIANCE.NS", _bars([102, 103]))
+
+    get_stock_data("RELIANCE")
+
+    stored = history_store.load("RELIANCE.NS")
+    assert stored is not None
+    assert list(stored['Close']) == [102.0, 103.0]
+
+
+def test_history_store_keeps_previous_file_when_a_write_fails():
+    """Test that an interrupted write never leaves a truncated partition behind."""
+    dates = _recent_dates(2)
+    history_store.merge("RELIANCE.NS", _bars([102], dates=dates[:1]), None)
+
+    def interrupted(frame, path):
+        with open(path, 'wb') as f:
+            f.write(b"PAR1")
+        raise OSError("disk full")
+
+    with patch.object(pd.DataFrame, 'to_parquet', interrupted):
+        history_store.merge("RELIANCE.NS", _bars([103], dates=dates[1:]), None)
+
+    assert list(history_store.load("RELIANCE.NS")['Close']) == [102.0]
+    assert not [f for f in os.listdir(history_store.store_dir) if f.endswith('.tmp')]
+
+
+def test_get_stock_data_fetches_only_new_bars(replay_provider):
+    """Test incremental delta fetch when the store already covers the period."""
+    dates = _recent_dates(3)
+    history_store.merge("TCS.NS", _bars([102, 103], dates=dates[:2]),
+                        pd.Timestamp.now().normalize() - pd.DateOffset(years=6))
+    history_store.invalidate()
+    replay_provider.save("TCS.NS", _bars([90, 104, 105], dates=dates))
+
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history:
+        result = get_stock_data("TCS", period="1y")
+
+    history.assert_called_once_with("TCS.NS", start=dates[1].strftime('%Y-%m-%d'))
+    assert list(result['Close']) == [102.0, 104.0, 105.0]
+
+
+def test_get_stock_data_slices_one_canonical_frame(replay_provider):
+    """Test that shorter periods are zero-copy slices of one cached frame."""
+    dates = pd.date_range(end=pd.Timestamp.now(tz='Asia/Kolkata').normalize(),
+                          periods=400, freq='D')
+    replay_provider.save("HDFCBANK.NS", _bars(list(range(400)), dates=dates))
+
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history:
+        year = get_stock_data("HDFCBANK", period="1y")
+        month = get_stock_data("HDFCBANK", period="1mo")
+
+    history.assert_called_once()
+    assert 28 <= len(month) <= 32
+    assert month.index[-1] == year.index[-1]
+    assert np.shares_memory(month['Close'].to_numpy(), year['Close'].to_numpy())
+
+
+def test_get_stock_data_serves_stale_frame_while_refreshing(replay_provider):
+    """Test that an expired history frame is served while it is refreshed."""
+    replay_provider.save("WIPRO.NS", _bars([100, 101]))
+    get_stock_data("WIPRO")
+    data_service._history_frames["WIPRO.NS"]["loaded_at"] = datetime(2000, 1, 1)
+    history_store.invalidate()
+    replay_provider.save("WIPRO.NS", _bars([100, 105]))
+
+    stale = get_stock_data("WIPRO")
+    data_service.data_refresher.wait()
+    fresh = get_stock_data("WIPRO")
+
+    assert stale['Close'].iloc[-1] == 101.0
+    assert fresh['Close'].iloc[-1] == 105.0
+    assert datetime.fromisoformat(fresh.attrs['as_of']) > datetime(2000, 1, 1)
+
+
+def test_get_stock_data_widens_canonical_frame(replay_provider):
+    """Test that a longer period replaces the cached frame instead of adding one."""
+    replay_provider.save("SBIN.NS", _bars([100, 101]))
+
+    get_stock_data("SBI", period="1y")
+    get_stock_data("SBI", period="max")
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history:
+        get_stock_data("SBI", period="10y")
+
+    history.assert_not_called()
+    assert data_service._history_frames["SBIN.NS"]["period"] == "max"
+
+
+def test_get_stock_data_returns_compact_layout(replay_provider):
+    """Test float64 prices, integer volume, fixed columns and an IST index."""
+    bars = _bars([100, 101, 102])
+    bars['Volume'] = bars['Volume'].astype('float64')
+    bars['Dividends'] = 0.0
+    bars['Stock Splits'] = 0.0
+    bars.index = bars.index.tz_convert('UTC')
+    replay_provider.save("AXISBANK.NS", bars)
+
+    result = get_stock_data("Axis Bank")
+
+    assert list(result.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert all(result[c].dtype == np.float64 for c in ['Open', 'High', 'Low', 'Close'])
+    assert result['Volume'].dtype == np.int64
+    assert str(result.index.tz) == 'Asia/Kolkata'
+    assert list(result['Close']) == [100.0, 101.0, 102.0]
+
+
+def test_history_memory_report_shows_savings(replay_provider):
+    """Test that the compact layout is reported as saving memory per symbol."""
+    replay_provider.save("ITC.NS", _bars([100.0 + i for i in range(50)]))
+    get_stock_data("ITC")
+
+    report = data_service.history_memory_report()
+
+    assert report["ITC.NS"]["rows"] == 50
+    # Dividends and Stock Splits are dropped; Volume is int64 instead of float64
+    assert report["ITC.NS"]["saved_bytes"] == 50 * 2 * 8
+
+
+def test_get_stock_data_keeps_paisa_precision_for_high_prices(replay_provider):
+    """Test that prices above ₹131,072 (e.g. MRF) are not rounded by the compact layout."""
+    replay_provider.save("MRF.NS", _bars([141234.55, 141250.05]))
+
+    result = get_stock_data("MRF")
+
+    assert list(result['Close']) == [141234.55, 141250.05]
+    assert get_current_price("MRF")['current_price'] == 141250.05
+
+
+def test_get_stock_data_serves_fresh_store_without_fetch(replay_provider):
+    """Test that a recently refreshed partition is served from disk."""
+    history_store.merge("INFY.NS", _bars([102]), None)
+
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history:
+        result = get_stock_data("INFY.NS", period="1mo")
+
+    history.assert_not_called()
+    assert list(result['Close']) == [102.0]
+
+
+def test_get_stock_data_batch_isolates_missing_symbols(replay_provider, strict_symbols):
+    """Test that one symbol without data does not fail the whole batch."""
+    replay_provider.save("RELIANCE.NS", _bars([102, 103]))
+
+    with patch.object(replay_provider, 'download', wraps=replay_provider.download) as download:
+        result = get_stock_data_batch(["reliance", "NTPC", "BADTICKER"], period="1y")
+
+    download.assert_called_once()
+    assert list(result["reliance"]['Close']) == [102.0, 103.0]
+    assert isinstance(result["NTPC"], DataNotAvailableError)
+    assert isinstance(result["BADTICKER"], InvalidSymbolError)
+
+
+def test_get_current_prices_batch(replay_provider):
+    """Test batched quotes with per-symbol errors."""
+    replay_provider.save("TCS.NS", _bars([100, 110], high=[105, 115]))
+
+    result = get_current_prices(["TCS", "WIPRO"])
+
+    assert result["TCS"]['current_price'] == 110.0
+    assert result["TCS"]['name'] == 'Tata Consultancy Services'
+    assert result["TCS"]['change_percent'] == 10.0
+    assert result["TCS"]['day_high'] == 115.0
+    assert isinstance(result["WIPRO"], DataNotAvailableError)
+
+
+def test_get_current_prices_batch_rate_limited():
+    """Test that a failed batch request maps to a per-symbol error."""
+    set_provider(_throttled_provider())
+
+    result = get_current_prices(["TCS", "ITC"])
+
+    assert isinstance(result["TCS"], APIRateLimitError)
+    assert isinstance(result["ITC"], APIRateLimitError)
+
+
+def test_get_current_prices_batch_failures_are_not_cached(replay_provider):
+    """Test that a batch hit by a network error is fetched again once the provider recovers."""
+    replay_provider.save("TCS.NS", _bars([100, 110]))
+    offline = Mock(spec=MarketDataProvider)
+    offline.download.side_effect = requests.exceptions.ConnectionError("offline")
+    set_provider(offline)
+    assert isinstance(get_current_prices(["TCS"])["TCS"], NetworkError)
+
+    set_provider(replay_provider)
+
+    assert get_current_prices(["TCS"])["TCS"]['current_price'] == 110.0
+
+
+def test_get_stock_data_serves_stored_history_when_throttled():
+    """Test that stored bars are served while Yahoo Finance is rate limiting."""
+    history_store.merge("SBIN.NS", _bars([102]), None)
+    history_store.invalidate()
+    set_provider(_throttled_provider())
+
+    result = get_stock_data("SBI", period="1mo")
+
+    assert list(result['Close']) == [102.0]
+    assert data_service.yahoo_guard.stats()['stale_served'] == 1
+
+
+def test_get_stock_data_rate_limited_without_stored_history():
+    """Test that throttling without stored data surfaces as APIRateLimitError."""
+    set_provider(_throttled_provider())
+
+    with pytest.raises(APIRateLimitError):
+        get_stock_data("MARUTI")
+
+
+def test_replay_provider_latency_and_windows(tmp_path):
+    """Test that the replay provider serves recorded windows with latency."""
+    provider = ReplayProvider(str(tmp_path), latency_seconds=0.05)
+    provider.save("HDFCBANK.NS", _bars(list(range(100, 140))), {'longName': 'HDFC Bank'})
+
+    started = time.perf_counter()
+    recent = provider.history("HDFCBANK.NS", period="5d")
+    elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.05
+    assert len(recent) == 6
+    assert provider.info("HDFCBANK.NS") == {'longName': 'HDFC Bank'}
+    assert provider.history("UNKNOWN.NS", period="1y").empty
+
+
+def test_batch_download_pool_is_configurable(monkeypatch):
+    """Test that BATCH_MAX_WORKERS bounds the yfinance download threads."""
+    monkeypatch.setenv("MARKET_DATA_PROVIDER", "yfinance")
+    monkeypatch.setenv("BATCH_MAX_WORKERS", "3")
+
+    assert create_provider_from_env().max_workers == 3
+
+
+def test_get_live_indicators_applies_quotes(replay_provider):
+    """Test that watchlist indicators include the latest quote."""
+    close = [100.0 + (i % 7) - (i % 3) * 0.5 for i in range(60)]
+    replay_provider.save("TCS.NS", _bars(close))
+
+    result = data_service.get_live_indicators(["TCS", "WIPRO"])
+
+    expected = calculate_indicator_series(get_stock_data("TCS", period="1y"))
+    assert result["TCS"]["RSI"] == pytest.approx(expected["RSI"].iloc[-1])
+    assert result["TCS"]["MA_50"] == pytest.approx(expected["MA_50"].iloc[-1])
+    assert result["TCS"]["MA_200"] is None
+    assert isinstance(result["WIPRO"], DataNotAvailableError)
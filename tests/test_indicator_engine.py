@@ -0,0 +1,188 @@
+"""
+Parity tests for the vectorized indicator engine against the ta library.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator, StochasticOscillator
+from ta.trend import ADXIndicator, MACD
+from ta.volatility import AverageTrueRange, BollingerBands
+from ta.volume import OnBalanceVolumeIndicator, VolumeWeightedAveragePrice
+from src.services.indicator_engine import (
+    compute_extended_frame,
+    compute_indicator_frame,
+    compute_universe_indicators,
+    ema,
+    latest_indicator_table,
+    rolling_max,
+    rolling_min,
+    rolling_std,
+    rsi,
+    sma
+)
+
+
+def _close(count: int = 400) -> pd.Series:
+    rng = np.random.default_rng(11)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.015, count))).astype(np.float32))
+
+
+def _ohlcv(count: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, count)))
+    spread = np.abs(rng.normal(0, 0.01, (2, count))) * close
+    volume = rng.integers(1_000, 100_000, count).astype(float)
+    # A few unchanged closes exercise OBV's tie handling
+    close[[30, 31, 32]] = close[29]
+    return pd.DataFrame({'High': close + spread[0], 'Low': close - spread[1], 'Close': close,
+                         'Volume': volume})
+
+
+def test_rsi_matches_ta():
+    """Test RSI against ta, including the warm-up NaNs."""
+    close = _close()
+
+    expected = RSIIndicator(close=close, window=14).rsi()
+
+    np.testing.assert_allclose(rsi(close, 14), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_rsi_is_100_without_down_moves():
+    """Test that a steadily rising series has an RSI of 100."""
+    values = rsi(np.arange(1.0, 40.0), 14)
+
+    assert np.isnan(values[:13]).all()
+    assert (values[13:] == 100).all()
+
+
+def test_macd_matches_ta():
+    """Test the MACD line, signal and histogram against ta."""
+    close = _close()
+    expected = MACD(close=close)
+
+    frame = compute_indicator_frame(pd.DataFrame({'Close': close}), ma_periods=())
+
+    np.testing.assert_allclose(frame['MACD'], expected.macd(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(frame['MACD_signal'], expected.macd_signal(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(frame['MACD_hist'], expected.macd_diff(), rtol=1e-7, atol=1e-9,
+                               equal_nan=True)
+
+
+def test_sma_matches_rolling_mean_with_gaps():
+    """Test moving averages, including windows that contain a missing close."""
+    close = _close().astype(np.float64)
+    close[50] = np.nan
+
+    for window in (20, 50, 200):
+        expected = close.rolling(window=window).mean()
+        np.testing.assert_allclose(sma(close, window), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_ema_skips_leading_nans():
+    """Test that the recursion starts at the first observation."""
+    values = pd.Series([np.nan, np.nan, 1.0, 2.0, 3.0, 4.0])
+
+    expected = values.ewm(span=3, min_periods=2, adjust=False).mean()
+
+    np.testing.assert_allclose(ema(values, 0.5, 2), expected, equal_nan=True)
+
+
+def test_frame_is_indexed_like_the_bars():
+    """Test the columnar result layout."""
+    data = pd.DataFrame({'Close': _close(300)},
+                        index=pd.bdate_range(end='2026-10-16', periods=300, tz='Asia/Kolkata'))
+
+    frame = compute_indicator_frame(data)
+
+    assert list(frame.columns) == ['MA_20', 'MA_50', 'MA_200', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist']
+    assert frame.index.equals(data.index)
+
+
+def _bars(count: int, seed: int, end: str = '2026-10-16') -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    return pd.DataFrame({'High': close * 1.01, 'Low': close * 0.99, 'Close': close},
+                        index=pd.bdate_range(end=end, periods=count, tz='Asia/Kolkata'))
+
+
+def test_universe_matches_per_symbol_computation():
+    """Test that each column of the batch equals that symbol computed alone, including late listings."""
+    frames = {"TCS.NS": _bars(300, 1), "INFY.NS": _bars(120, 2), "NEW.NS": _bars(10, 3)}
+
+    series = compute_universe_indicators(frames)
+
+    for symbol, bars in frames.items():
+        expected = compute_indicator_frame(bars)
+        for column in expected.columns:
+            actual = series[column][symbol].loc[bars.index]
+            np.testing.assert_allclose(actual, expected[column], rtol=1e-9, equal_nan=True)
+        assert series['RSI'][symbol].drop(bars.index).isna().all()
+
+
+def test_universe_skips_missing_bars():
+    """Test that a missing bar is reported as NaN and the series carries on."""
+    full = _bars(100, 4)
+    gappy = full.drop(full.index[60])
+
+    series = compute_universe_indicators({"TCS.NS": full, "ITC.NS": gappy})
+
+    assert np.isnan(series['MA_20']['ITC.NS'].iloc[60])
+    assert not series['MA_20']['ITC.NS'].iloc[61:].isna().any()
+    assert not series['MACD']['ITC.NS'].iloc[61:].isna().any()
+
+
+def test_latest_table_uses_each_symbols_last_bar():
+    """Test the per-symbol summary, including pivots and symbols whose data ends early."""
+    frames = {"TCS.NS": _bars(250, 5), "ITC.NS": _bars(250, 6, end='2026-10-09'),
+              "EMPTY.NS": _bars(0, 7)}
+
+    table = latest_indicator_table(compute_universe_indicators(frames))
+
+    stale = compute_indicator_frame(frames["ITC.NS"]).iloc[-1]
+    assert table.loc["ITC.NS", "RSI"] == pytest.approx(stale["RSI"])
+    assert table.loc["ITC.NS", "Close"] == pytest.approx(frames["ITC.NS"]['Close'].iloc[-1])
+    last = frames["TCS.NS"].iloc[-1]
+    assert table.loc["TCS.NS", "pivot"] == pytest.approx((last['High'] + last['Low'] + last['Close']) / 3)
+    assert table.loc["EMPTY.NS"].isna().all()
+
+
+def test_rolling_extremes_and_std_match_pandas_with_gaps():
+    """Test rolling min, max and standard deviation, including windows with a NaN."""
+    close = _close().astype(np.float64)
+    close[[0, 75, 76]] = np.nan
+
+    for window in (1, 3, 14, 20):
+        rolling = close.rolling(window=window)
+        np.testing.assert_array_equal(rolling_min(close, window), rolling.min())
+        np.testing.assert_array_equal(rolling_max(close, window), rolling.max())
+        np.testing.assert_allclose(rolling_std(close, window), rolling.std(ddof=0), rtol=1e-9,
+                                   atol=1e-12, equal_nan=True)
+
+
+def test_extended_indicators_match_ta():
+    """Test Bollinger Bands, ATR, VWAP, Stochastic, ADX and OBV against ta."""
+    bars = _ohlcv()
+    high, low, close, volume = bars['High'], bars['Low'], bars['Close'], bars['Volume']
+
+    frame = compute_extended_frame(bars)
+
+    def check(column, expected, start=0):
+        np.testing.assert_allclose(frame[column][start:], expected[start:], rtol=1e-9, equal_nan=True)
+
+    bands = BollingerBands(close=close, window=20, window_dev=2)
+    check('BB_middle', bands.bollinger_mavg())
+    check('BB_upper', bands.bollinger_hband())
+    check('BB_lower', bands.bollinger_lband())
+    check('VWAP', VolumeWeightedAveragePrice(high, low, close, volume, window=14).volume_weighted_average_price())
+    stochastic = StochasticOscillator(high, low, close, window=14, smooth_window=3)
+    check('STOCH_K', stochastic.stoch())
+    check('STOCH_D', stochastic.stoch_signal())
+    check('OBV', OnBalanceVolumeIndicator(close, volume).on_balance_volume())
+    # ta reports 0 instead of NaN while ATR and ADX warm up
+    check('ATR', AverageTrueRange(high, low, close, window=14).average_true_range(), start=13)
+    assert frame['ATR'][:13].isna().all()
+    adx = ADXIndicator(high, low, close, window=14)
+    check('ADX', adx.adx(), start=27)
+    check('ADX_pos', adx.adx_pos(), start=15)
+    check('ADX_neg', adx.adx_neg(), start=15)
+    assert frame['ADX'][:27].isna().all()
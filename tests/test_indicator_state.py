@@ -0,0 +1,96 @@
+"""
+Unit tests for streaming indicator state.
+"""
+import json
+import numpy as np
+import pandas as pd
+from src.services.history_store import HistoryStore
+from src.services.indicator_engine import compute_indicator_frame
+from src.services.indicator_state import IndicatorStateStore, StreamingIndicators
+
+
+COLUMNS = ['MA_20', 'MA_50', 'MA_200', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist']
+
+
+def _frame(count: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    return pd.DataFrame({'Close': close.astype(np.float32)},
+                        index=pd.bdate_range(end='2026-10-16', periods=count, tz='Asia/Kolkata'))
+
+
+def _assert_matches_engine(values, data):
+    expected = compute_indicator_frame(data).iloc[-1]
+    for column in COLUMNS:
+        np.testing.assert_allclose(values[column], expected[column], rtol=1e-9)
+
+
+def test_streamed_values_match_engine():
+    """Test that feeding bars one at a time matches the vectorized engine."""
+    data = _frame()
+
+    state = StreamingIndicators.from_history("TCS.NS", data)
+
+    _assert_matches_engine(state.values(), data)
+    assert state.values()["as_of"] == data.index[-1].isoformat()
+
+
+def test_warm_up_values_are_none():
+    """Test that indicators are undefined until enough bars have been seen."""
+    state = StreamingIndicators.from_history("TCS.NS", _frame(30))
+
+    values = state.values()
+
+    assert values["MA_50"] is None and values["MACD_signal"] is None
+    assert values["MA_20"] is not None and values["MACD"] is not None
+
+
+def test_revisions_and_new_bars():
+    """Test revising the open bar and then completing it with a new one."""
+    data = _frame()
+    state = StreamingIndicators.from_history("TCS.NS", data.iloc[:-1])
+
+    assert not state.update(data.index[-2], 1.0)
+    assert not state.update(data.index[-2], data['Close'].iloc[-2])
+    assert state.update(data.index[-1], data['Close'].iloc[-1])
+    assert not state.update(data.index[-3], 1.0)
+
+    _assert_matches_engine(state.values(), data)
+
+
+def test_serialization_round_trip():
+    """Test that a restored state continues exactly where it left off."""
+    data = _frame()
+    state = StreamingIndicators.from_history("TCS.NS", data.iloc[:-1])
+
+    restored = StreamingIndicators.from_dict(json.loads(json.dumps(state.to_dict())))
+    restored.update(data.index[-1], data['Close'].iloc[-1])
+
+    _assert_matches_engine(restored.values(), data)
+
+
+def test_store_persists_next_to_history_and_replays_only_new_bars(tmp_path):
+    """Test that a saved state is caught up with new bars after a restart."""
+    history = HistoryStore(str(tmp_path))
+    data = _frame()
+    IndicatorStateStore(history).sync("TCS.NS", data.iloc[:-5])
+
+    assert (tmp_path / "TCS_NS.indicators.json").exists()
+
+    restarted = IndicatorStateStore(history)
+    state = restarted.sync("TCS.NS", data)
+
+    _assert_matches_engine(state.values(), data)
+    assert restarted.update("INFY.NS", data.index[-1], 100.0) is None
+
+
+def test_store_rebuilds_when_history_is_adjusted(tmp_path):
+    """Test that a split-adjusted history replaces the saved state."""
+    states = IndicatorStateStore(HistoryStore(str(tmp_path)))
+    data = _frame()
+    states.sync("TCS.NS", data)
+
+    adjusted = data.assign(Close=data['Close'] / 2)
+    state = states.sync("TCS.NS", adjusted)
+
+    _assert_matches_engine(state.values(), adjusted)
@@ -0,0 +1,91 @@
+"""
+Unit tests for the TensorFlow-free LSTM runtime.
+"""
+import subprocess
+import sys
+import numpy as np
+import pytest
+from src.services.lstm_runtime import NumpyLSTM
+
+
+def _network(seed: int = 0, units: int = 8) -> NumpyLSTM:
+    rng = np.random.default_rng(seed)
+
+    def lstm(inputs, return_sequences):
+        return ("lstm", {"kernel": rng.normal(0, 0.3, (inputs, 4 * units)).astype(np.float32),
+                         "recurrent_kernel": rng.normal(0, 0.3, (units, 4 * units)).astype(np.float32),
+                         "bias": rng.normal(0, 0.1, 4 * units).astype(np.float32),
+                         "return_sequences": return_sequences})
+
+    return NumpyLSTM([lstm(1, True), lstm(units, False),
+                      ("dense", {"kernel": rng.normal(0, 0.3, (units, 1)).astype(np.float32),
+                                 "bias": np.zeros(1, dtype=np.float32)})])
+
+
+def test_lstm_matches_reference_recurrence():
+    """Test one LSTM layer against the gate equations written out per sample."""
+    layer = _network().layers[1]
+    weights = layer[1]
+    inputs = np.random.default_rng(1).normal(size=(2, 5, 8)).astype(np.float32)
+
+    def sigmoid(x):
+        return 1 / (1 + np.exp(-x))
+
+    expected = []
+    for sample in inputs:
+        h, c = np.zeros(8), np.zeros(8)
+        for x in sample:
+            z = x @ weights["kernel"] + h @ weights["recurrent_kernel"] + weights["bias"]
+            i, f, g, o = np.split(z, 4)
+            c = sigmoid(f) * c + sigmoid(i) * np.tanh(g)
+            h = sigmoid(o) * np.tanh(c)
+        expected.append(h)
+
+    np.testing.assert_allclose(NumpyLSTM([layer])(inputs), expected, rtol=1e-5, atol=1e-6)
+
+
+def test_rollout_feeds_predictions_back():
+    """Test the rollout against feeding each prediction back by hand."""
+    network = _network()
+    windows = np.random.default_rng(2).uniform(0, 1, (3, 12, 1)).astype(np.float32)
+
+    forecast = network.rollout(windows, 4)
+
+    current = windows
+    for day in range(4):
+        expected = network(current)[:, 0]
+        np.testing.assert_allclose(forecast[:, day], expected, rtol=1e-6)
+        current = np.concatenate([current[:, 1:], expected[:, None, None]], axis=1)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test that an exported network loads back unchanged."""
+    network = _network()
+    windows = np.random.default_rng(3).uniform(0, 1, (2, 12, 1))
+    network.save(str(tmp_path / "general_model.npz"))
+
+    loaded = NumpyLSTM.load(str(tmp_path / "general_model.npz"))
+
+    np.testing.assert_array_equal(loaded(windows), network(windows))
+    assert [kind for kind, _ in loaded.layers] == ["lstm", "lstm", "dense"]
+
+
+def test_unsupported_layers_are_rejected():
+    """Test that layer kinds the runtime cannot run fail loudly."""
+    with pytest.raises(ValueError):
+        NumpyLSTM([("conv1d", {})])
+
+
+def test_serving_numpy_models_does_not_import_tensorflow(tmp_path):
+    """Test that a worker predicting with an exported model never imports TensorFlow."""
+    _network().save(str(tmp_path / "general_model.npz"))
+    script = (
+        "import sys, numpy as np\n"
+        "from src.services.prediction_service import PredictionService\n"
+        f"service = PredictionService(models_dir={str(tmp_path)!r})\n"
+        "model = service.load_model('TCS.NS')\n"
+        "assert service.forecast(model, np.zeros((2, 60, 1)), 5).shape == (2, 5)\n"
+        "assert 'tensorflow' not in sys.modules\n"
+    )
+
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,96 @@
+"""
+Unit tests for the NSE trading calendar and market-hours cache expiry.
+"""
+from datetime import date, datetime
+from unittest.mock import patch
+from src.services import cache_backend, market_calendar
+from src.services.market_calendar import IST, TradingCalendar, market_hours_cache
+
+
+# Friday 2026-10-02 (Gandhi Jayanti) is a holiday
+calendar = TradingCalendar([date(2026, 10, 2)])
+
+
+def _ist(*args) -> datetime:
+    return datetime(*args, tzinfo=IST)
+
+
+def test_trading_days_skip_weekends_and_holidays():
+    """Test that weekends and listed holidays have no session."""
+    assert calendar.is_trading_day(date(2026, 10, 1))
+    assert not calendar.is_trading_day(date(2026, 10, 2))
+    assert not calendar.is_trading_day(date(2026, 10, 3))
+
+
+def test_is_open_during_session_and_grace():
+    """Test session hours including the post-close grace period."""
+    assert not calendar.is_open(_ist(2026, 10, 1, 9, 0))
+    assert calendar.is_open(_ist(2026, 10, 1, 9, 15))
+    assert calendar.is_open(_ist(2026, 10, 1, 15, 45))
+    assert not calendar.is_open(_ist(2026, 10, 1, 16, 0))
+    assert not calendar.is_open(_ist(2026, 10, 2, 11, 0))
+
+
+def test_next_open_skips_holiday_weekend():
+    """Test that Thursday evening's next open is the following Monday."""
+    assert calendar.next_open(_ist(2026, 10, 1, 18, 0)) == _ist(2026, 10, 5, 9, 15)
+    assert calendar.next_open(_ist(2026, 10, 5, 8, 0)) == _ist(2026, 10, 5, 9, 15)
+
+
+def test_is_fresh_holds_until_next_open():
+    """Test that data fetched after the close stays fresh over the long weekend."""
+    fetched = _ist(2026, 10, 1, 17, 0)
+
+    assert calendar.is_fresh(fetched, 300, now=_ist(2026, 10, 4, 12, 0))
+    assert not calendar.is_fresh(fetched, 300, now=_ist(2026, 10, 5, 9, 30))
+    assert not calendar.is_fresh(_ist(2026, 10, 1, 15, 0), 300, now=_ist(2026, 10, 1, 20, 0))
+
+
+def test_is_fresh_uses_ttl_in_session():
+    """Test that the open-market TTL applies during trading hours."""
+    now = _ist(2026, 10, 1, 11, 0)
+
+    assert calendar.is_fresh(_ist(2026, 10, 1, 10, 58), 300, now=now)
+    assert not calendar.is_fresh(_ist(2026, 10, 1, 10, 50), 300, now=now)
+    assert not calendar.is_fresh(None, 300, now=now)
+
+
+def test_market_hours_cache_holds_results_while_closed():
+    """Test that off-hours calls are computed once per closed period."""
+    calls = []
+
+    @market_hours_cache(open_ttl=300)
+    def double(value):
+        calls.append(value)
+        return value * 2
+
+    with patch.object(market_calendar, "nse_calendar", calendar), \
+            patch.object(market_calendar, "datetime", wraps=datetime) as clock, \
+            patch.object(cache_backend, "time") as stored_clock:
+        stored_clock.time.side_effect = lambda: clock.now.return_value.timestamp()
+        clock.now.return_value = _ist(2026, 10, 3, 10, 0)
+        assert double(21) == 42
+        assert double(21) == 42
+        clock.now.return_value = _ist(2026, 10, 5, 10, 0)
+        double(21)
+
+    assert calls == [21, 21]
+
+
+def test_market_hours_cache_does_not_hold_failures():
+    """Test that None and error results are recomputed instead of held until the next open."""
+    results = [None, ConnectionError("offline"), {"score": 0.5}]
+
+    @market_hours_cache(open_ttl=300)
+    def sentiment(name):
+        return results.pop(0)
+
+    with patch.object(market_calendar, "nse_calendar", calendar), \
+            patch.object(market_calendar, "datetime", wraps=datetime) as clock:
+        clock.now.return_value = _ist(2026, 10, 3, 10, 0)
+        assert sentiment("tcs") is None
+        assert isinstance(sentiment("tcs"), ConnectionError)
+        assert sentiment("tcs") == {"score": 0.5}
+        assert sentiment("tcs") == {"score": 0.5}
+
+    assert results == []
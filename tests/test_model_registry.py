@@ -0,0 +1,114 @@
+"""
+Unit tests for the model registry.
+"""
+import os
+from src.services.model_registry import ModelRegistry
+
+
+def _registry(tmp_path, **kwargs):
+    loaded = []
+
+    def loader(path):
+        loaded.append(os.path.basename(path))
+        with open(path) as f:
+            return {"path": path, "weights": f.read()}
+
+    return ModelRegistry(str(tmp_path), loader=loader, **kwargs), loaded
+
+
+def _save(tmp_path, name, content="v1", mtime=None):
+    path = tmp_path / name
+    path.write_text(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_symbol_model_with_general_fallback(tmp_path):
+    """Test that a symbol's own model wins over the general model."""
+    _save(tmp_path, "TCS_NS_lstm.h5")
+    _save(tmp_path, "general_model.h5")
+    registry, _ = _registry(tmp_path)
+
+    assert registry.artifact_path("TCS.NS") == str(tmp_path / "TCS_NS_lstm.h5")
+    assert registry.artifact_path("INFY.NS") == str(tmp_path / "general_model.h5")
+    assert registry.artifact_path("^NSEI") == str(tmp_path / "general_model.h5")
+
+
+def test_no_model_returns_none(tmp_path):
+    """Test an empty and a missing models directory."""
+    registry, loaded = _registry(tmp_path)
+    missing, _ = _registry(tmp_path / "missing")
+
+    assert registry.get("TCS.NS") is None
+    assert missing.get("TCS.NS") is None
+    assert loaded == []
+
+
+def test_models_are_loaded_once(tmp_path):
+    """Test that repeated requests are served from memory, shared by symbols using the same file."""
+    _save(tmp_path, "general_model.h5")
+    registry, loaded = _registry(tmp_path)
+
+    first = registry.get("TCS.NS")
+    second = registry.get("INFY.NS")
+
+    assert first is second
+    assert loaded == ["general_model.h5"]
+    assert registry.hits == 1 and registry.loads == 1
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    """Test hot reload when a model is retrained, replacing the stale version."""
+    _save(tmp_path, "TCS_NS_lstm.h5", "v1", mtime=1_000_000)
+    registry, loaded = _registry(tmp_path)
+    registry.get("TCS.NS")
+
+    _save(tmp_path, "TCS_NS_lstm.h5", "v2", mtime=2_000_000)
+    model = registry.get("TCS.NS")
+
+    assert model["weights"] == "v2"
+    assert loaded == ["TCS_NS_lstm.h5", "TCS_NS_lstm.h5"]
+    assert len(registry.cached()) == 1
+
+
+def test_new_and_removed_files_are_indexed(tmp_path):
+    """Test that the index follows files being added and deleted."""
+    general = _save(tmp_path, "general_model.h5")
+    registry, _ = _registry(tmp_path)
+    assert registry.get("TCS.NS")["path"].endswith("general_model.h5")
+    os.utime(tmp_path, (1_000_000, 1_000_000))
+
+    symbol_model = _save(tmp_path, "TCS_NS_lstm.h5")
+    assert registry.get("TCS.NS")["path"].endswith("TCS_NS_lstm.h5")
+
+    symbol_model.unlink()
+    general.unlink()
+    assert registry.get("TCS.NS") is None
+
+
+def test_cache_is_bounded(tmp_path):
+    """Test least recently used eviction."""
+    for name in ("A", "B", "C"):
+        _save(tmp_path, f"{name}_NS_lstm.h5")
+    registry, loaded = _registry(tmp_path, maxsize=2)
+
+    registry.get("A.NS")
+    registry.get("B.NS")
+    registry.get("A.NS")
+    registry.get("C.NS")
+    registry.get("A.NS")
+    registry.get("B.NS")
+
+    assert loaded == ["A_NS_lstm.h5", "B_NS_lstm.h5", "C_NS_lstm.h5", "B_NS_lstm.h5"]
+
+
+def test_numpy_export_is_preferred(tmp_path):
+    """Test that a model's .npz export is served instead of its .h5."""
+    _save(tmp_path, "TCS_NS_lstm.h5")
+    _save(tmp_path, "general_model.h5")
+    _save(tmp_path, "general_model.npz")
+    registry, _ = _registry(tmp_path)
+
+    assert registry.artifact_path("TCS.NS") == str(tmp_path / "TCS_NS_lstm.h5")
+    assert registry.artifact_path("INFY.NS") == str(tmp_path / "general_model.npz")
@@ -0,0 +1,164 @@
+"""
+Unit tests for LSTM forecasting.
+
+Models are served from NumPy exports, so batching and caching run without
+TensorFlow; the Keras rollout and export tests are skipped when it is not
+installed.
+"""
+import importlib.util
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import pytest
+from src.services import prediction_service
+from src.services.lstm_runtime import NumpyLSTM
+from src.services.model_registry import ModelRegistry
+from src.services.prediction_service import PredictionService, get_price_predictions_batch
+
+
+requires_tensorflow = pytest.mark.skipif(importlib.util.find_spec("tensorflow") is None,
+                                         reason="TensorFlow is not installed")
+
+
+def _bars(count: int, seed: int) -> pd.DataFrame:
+    dates = pd.date_range(end=pd.Timestamp.now(tz='Asia/Kolkata').normalize(), periods=count, freq='D')
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, count)))
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': [1000000] * count}, index=dates)
+
+
+def _network(seed: int, units: int = 8) -> NumpyLSTM:
+    """A small untrained network with the layer layout of lstm_model.create_lstm_model."""
+    rng = np.random.default_rng(seed)
+
+    def lstm(inputs, return_sequences):
+        return ("lstm", {"kernel": rng.normal(0, 0.3, (inputs, 4 * units)).astype(np.float32),
+                         "recurrent_kernel": rng.normal(0, 0.3, (units, 4 * units)).astype(np.float32),
+                         "bias": rng.normal(0, 0.1, 4 * units).astype(np.float32),
+                         "return_sequences": return_sequences})
+
+    return NumpyLSTM([lstm(1, True), lstm(units, False),
+                      ("dense", {"kernel": rng.normal(0, 0.3, (units, 1)).astype(np.float32),
+                                 "bias": np.full(1, 0.5, dtype=np.float32)})])
+
+
+@pytest.fixture
+def models_dir(tmp_path, replay_provider):
+    """A general model, a model of its own for TCS, and recorded history for four symbols."""
+    _network(0).save(str(tmp_path / "general_model.npz"))
+    _network(1).save(str(tmp_path / "TCS_NS_lstm.npz"))
+    for seed, symbol in enumerate(("TCS.NS", "INFY.NS", "ITC.NS", "WIPRO.NS")):
+        replay_provider.save(symbol, _bars(250, seed))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def service(models_dir, monkeypatch):
+    """A prediction service over models_dir, also used by the cached module functions."""
+    service = PredictionService(registry=ModelRegistry(models_dir))
+    monkeypatch.setattr(prediction_service, "prediction_service", service)
+    return service
+
+
+def test_batch_matches_single_predictions(service):
+    """Test that the batch groups symbols by model file and scales each symbol on its own."""
+    symbols = ["TCS.NS", "INFY.NS", "ITC.NS", "WIPRO.NS", "NOSUCHCOMPANY.NS"]
+
+    with patch.object(service, 'forecast', wraps=service.forecast) as forecast:
+        batch = service.predict_prices_batch(symbols, days=3)
+
+    assert sorted(call.args[1].shape[0] for call in forecast.call_args_list) == [1, 3]
+    assert batch["NOSUCHCOMPANY.NS"] is None
+    for symbol in symbols[:4]:
+        single = service.predict_prices(symbol, days=3)
+        np.testing.assert_allclose(batch[symbol]["predictions"], single["predictions"], rtol=1e-4)
+        assert batch[symbol]["dates"] == single["dates"]
+        assert batch[symbol]["model_type"] == "LSTM"
+
+
+def test_batch_results_are_cached_per_symbol(service):
+    """Test that batched predictions are shared with get_price_predictions."""
+    first = get_price_predictions_batch(["TCS", "Infosys"], days=5)
+    with patch.object(service, 'predict_prices_batch') as batch:
+        again = get_price_predictions_batch(["TCS", "INFY.NS"], days=5)
+        single = prediction_service.get_price_predictions("TCS", days=5)
+
+    batch.assert_not_called()
+    assert again["INFY.NS"] == first["Infosys"]
+    assert single == first["TCS"]
+
+
+def test_batch_fetches_only_uncached_symbols(service):
+    """Test that a batch predicts just the symbols missing from the cache."""
+    prediction_service.get_price_predictions("TCS", days=5)
+
+    with patch.object(service, 'predict_prices_batch', wraps=service.predict_prices_batch) as batch:
+        get_price_predictions_batch(["TCS", "ITC", "WIPRO"], days=5)
+
+    batch.assert_called_once_with(["ITC.NS", "WIPRO.NS"], 5)
+
+
+def test_failed_predictions_are_not_cached(service):
+    """Test that a symbol without history is predicted again rather than cached as None."""
+    with patch.object(service, 'predict_prices', wraps=service.predict_prices) as predict:
+        assert prediction_service.get_price_predictions("NOSUCHCOMPANY", days=5) is None
+        assert prediction_service.get_price_predictions("NOSUCHCOMPANY", days=5) is None
+    batch = get_price_predictions_batch(["TCS", "NOSUCHCOMPANY"], days=5)
+
+    assert predict.call_count == 2
+    assert batch["NOSUCHCOMPANY"] is None
+    assert prediction_service._cached_predictions.lookup("NOSUCHCOMPANY.NS", 5) is None
+    assert prediction_service._cached_predictions.lookup("TCS.NS", 5).value == batch["TCS"]
+
+
+@requires_tensorflow
+def test_rollout_matches_step_by_step_predictions():
+    """Test the compiled rollout against feeding each prediction back by hand."""
+    from src.services.lstm_model import create_lstm_model, create_rollout
+
+    model = create_lstm_model(lookback_window=10)
+    windows = np.random.default_rng(0).uniform(0, 1, (3, 10, 1)).astype(np.float32)
+
+    forecast = create_rollout(model, lookback_window=10)(windows, np.int32(4)).numpy()
+
+    current = windows.copy()
+    for day in range(4):
+        expected = model(current, training=False).numpy()[:, 0]
+        np.testing.assert_allclose(forecast[:, day], expected, rtol=1e-5, atol=1e-6)
+        current = np.concatenate([current[:, 1:], expected[:, None, None]], axis=1)
+    assert forecast.shape == (3, 4)
+
+
+@requires_tensorflow
+def test_keras_batch_matches_single_predictions(tmp_path, replay_provider):
+    """Test batching through the compiled rollout when only .h5 models exist."""
+    from src.services.lstm_model import create_lstm_model
+
+    create_lstm_model().save(str(tmp_path / "general_model.h5"))
+    for seed, symbol in enumerate(("INFY.NS", "ITC.NS")):
+        replay_provider.save(symbol, _bars(250, seed))
+    service = PredictionService(registry=ModelRegistry(str(tmp_path)))
+
+    batch = service.predict_prices_batch(["INFY.NS", "ITC.NS"], days=3)
+
+    for symbol in ("INFY.NS", "ITC.NS"):
+        np.testing.assert_allclose(batch[symbol]["predictions"],
+                                   service.predict_prices(symbol, days=3)["predictions"], rtol=1e-4)
+
+
+@requires_tensorflow
+def test_numpy_export_matches_keras(tmp_path):
+    """Test that the exported NumPy runtime reproduces the Keras model."""
+    from src.services.lstm_model import create_lstm_model, create_rollout
+    from src.services.model_trainer import export_numpy_model
+
+    model = create_lstm_model()
+    windows = np.random.default_rng(1).uniform(0, 1, (4, 60, 1)).astype(np.float32)
+    export_numpy_model(model, str(tmp_path / "general_model.npz"))
+
+    runtime = NumpyLSTM.load(str(tmp_path / "general_model.npz"))
+
+    np.testing.assert_allclose(runtime(windows), model(windows, training=False).numpy(), rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(runtime.rollout(windows, 5), create_rollout(model)(windows, np.int32(5)).numpy(),
+                               rtol=1e-4, atol=1e-6)
+
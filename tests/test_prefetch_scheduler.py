@@ -0,0 +1,89 @@
+"""
+Unit tests for the prefetch scheduler.
+"""
+import threading
+import time
+from datetime import date, datetime
+from unittest.mock import patch
+import pandas as pd
+from src.services import data_service
+from src.services.market_calendar import IST, TradingCalendar
+from src.services.prefetch_scheduler import PrefetchScheduler, default_universe
+
+
+calendar = TradingCalendar([date(2026, 10, 2)])
+
+
+def _bars(count: int) -> pd.DataFrame:
+    dates = pd.date_range(end=pd.Timestamp.now(tz='Asia/Kolkata').normalize(), periods=count, freq='D')
+    close = [100.0 + i for i in range(count)]
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': [1000000] * count}, index=dates)
+
+
+def test_default_universe_includes_map_and_indices():
+    """Test that the default universe covers the symbol map and the indices."""
+    universe = default_universe()
+
+    assert "reliance" in universe and "bank nifty" in universe
+    assert "^NSEI" in universe and "^BSESN" in universe
+
+
+def test_next_run_before_open_and_during_session():
+    """Test pre-market and in-session scheduling."""
+    scheduler = PrefetchScheduler(universe=[], interval_seconds=600, lead_minutes=30, calendar=calendar)
+
+    evening = datetime(2026, 10, 1, 18, 0, tzinfo=IST)
+    assert scheduler.next_run(evening) == datetime(2026, 10, 5, 8, 45, tzinfo=IST)
+
+    pre_market = datetime(2026, 10, 5, 9, 0, tzinfo=IST)
+    assert scheduler.next_run(pre_market) == datetime(2026, 10, 5, 9, 15, tzinfo=IST)
+
+    session = datetime(2026, 10, 5, 11, 0, tzinfo=IST)
+    assert scheduler.next_run(session) == datetime(2026, 10, 5, 11, 10, tzinfo=IST)
+
+
+def test_run_once_warms_data_once_per_symbol(replay_provider):
+    """Test that names for the same symbol share one history fetch."""
+    replay_provider.save("HDFCBANK.NS", _bars(60))
+    replay_provider.save("TCS.NS", _bars(60))
+    scheduler = PrefetchScheduler(universe=["hdfc bank", "hdfcbank", "TCS"],
+                                  stages=("data", "indicators"))
+
+    with patch.object(replay_provider, 'history', wraps=replay_provider.history) as history:
+        summary = scheduler.run_once()
+        data_service.get_stock_data("HDFC Bank", period="1y")
+
+    assert summary["symbols"] == 2
+    assert summary["failed"] == {}
+    assert [c.args[0] for c in history.call_args_list].count("HDFCBANK.NS") == 1
+
+
+def test_run_once_reports_failures():
+    """Test that symbols that cannot be warmed are reported, not raised."""
+    scheduler = PrefetchScheduler(universe=["NOSUCHCOMPANY"], stages=("data",))
+
+    summary = scheduler.run_once()
+
+    assert "data" in summary["failed"]["NOSUCHCOMPANY.NS"]
+
+
+def test_run_once_bounds_concurrency():
+    """Test that no more than max_workers symbols are warmed at once."""
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_warm(symbol, names):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return {}
+
+    scheduler = PrefetchScheduler(universe=[f"SYM{i}" for i in range(12)], max_workers=3)
+    with patch.object(scheduler, "warm_symbol", side_effect=slow_warm):
+        scheduler.run_once()
+
+    assert peak[0] == 3
@@ -0,0 +1,119 @@
+"""
+Unit tests for multi-timeframe resampling.
+"""
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from src.services import resampler
+from src.services.resampler import BarResampler, aggregate_bars, period_is_open
+from src.services.technical_indicators import calculate_pivot_points
+
+
+def _daily(count: int = 120, end: str = '2026-10-16', symbol: str = "TCS.NS") -> pd.DataFrame:
+    """Build daily bars in the data service's layout."""
+    rng = np.random.default_rng(3)
+    close = (100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))).astype(np.float32)
+    data = pd.DataFrame({
+        'Open': close * np.float32(0.995), 'High': close * np.float32(1.01),
+        'Low': close * np.float32(0.99), 'Close': close,
+        'Volume': rng.integers(100000, 500000, count)
+    }, index=pd.bdate_range(end=end, periods=count, tz='Asia/Kolkata'))
+    if symbol:
+        data.attrs.update({"symbol": symbol, "interval": "1d"})
+    return data
+
+
+def test_weekly_and_monthly_bars_match_pandas():
+    """Test the aggregation rules against a pandas groupby."""
+    data = _daily()
+
+    for timeframe, freq in (("1wk", "W"), ("1mo", "M")):
+        bars = aggregate_bars(data, timeframe)
+        groups = data.groupby(data.index.tz_localize(None).to_period(freq))
+        expected = groups.agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+
+        np.testing.assert_array_equal(bars.to_numpy(), expected.to_numpy())
+        assert (bars.index.tz_localize(None) == expected.index.start_time).all()
+        assert bars.dtypes.equals(data.dtypes)
+
+
+def test_intraday_bars_resample_to_sessions():
+    """Test that intraday bars become one daily bar per session."""
+    index = pd.date_range('2026-10-15 09:15', periods=4, freq='h', tz='Asia/Kolkata').append(
+        pd.date_range('2026-10-16 09:15', periods=3, freq='h', tz='Asia/Kolkata'))
+    data = pd.DataFrame({'High': [5.0, 7, 6, 5, 9, 8, 8], 'Low': [4.0, 3, 5, 4, 7, 6, 7],
+                         'Close': [4.5, 6, 5.5, 4.5, 8, 7, 7.5]}, index=index)
+
+    bars = aggregate_bars(data, "1d")
+
+    assert list(bars.index.day) == [15, 16]
+    assert bars['High'].tolist() == [7, 9]
+    assert bars['Low'].tolist() == [3, 6]
+    assert bars['Close'].tolist() == [4.5, 7.5]
+
+
+def test_only_the_open_period_is_recomputed():
+    """Test that new bars re-aggregate the current period only."""
+    cache = BarResampler()
+    history = _daily(120)
+    cache.resample(history.iloc[:-1], "1wk")
+
+    with patch.object(resampler, 'aggregate_bars', wraps=aggregate_bars) as aggregate:
+        weekly = cache.resample(history, "1wk")
+
+    # 2026-10-16 is a Friday, so the open week holds five daily bars
+    assert len(aggregate.call_args.args[0]) == 5
+    pd.testing.assert_frame_equal(weekly, aggregate_bars(history, "1wk"), check_freq=False)
+    assert weekly.attrs == {"symbol": "TCS.NS", "interval": "1wk"}
+
+
+def test_new_period_and_changed_history_are_handled():
+    """Test rolling into a new period and a frame whose start moved."""
+    cache = BarResampler()
+    history = _daily(130, end='2026-10-20')
+    cache.resample(history.iloc[:-2], "1wk")
+
+    rolled = cache.resample(history, "1wk")
+    shifted = cache.resample(history.iloc[7:], "1wk")
+
+    pd.testing.assert_frame_equal(rolled, aggregate_bars(history, "1wk"), check_freq=False)
+    pd.testing.assert_frame_equal(shifted, aggregate_bars(history.iloc[7:], "1wk"), check_freq=False)
+
+
+def test_pivot_points_at_any_timeframe():
+    """Test that weekly and monthly pivots of completed periods use the last bar of that timeframe."""
+    data = _daily()
+    october = data.loc['2026-10-01':]
+
+    with patch.object(resampler.pd.Timestamp, 'now', return_value=pd.Timestamp('2026-11-02', tz='Asia/Kolkata')):
+        monthly = calculate_pivot_points(data, "1mo")
+    daily = calculate_pivot_points(data)
+
+    expected = (october['High'].max() + october['Low'].min() + october['Close'].iloc[-1]) / 3
+    assert monthly["pivot"] == round(expected, 2)
+    assert daily["pivot"] == round((data['High'].iloc[-1] + data['Low'].iloc[-1]
+                                    + data['Close'].iloc[-1]) / 3, 2)
+
+
+def test_period_is_open():
+    """Test whether a week or month is still in progress on a Wednesday."""
+    wednesday = pd.Timestamp('2026-10-14 11:00', tz='Asia/Kolkata')
+    this_week = pd.Timestamp('2026-10-12', tz='Asia/Kolkata')
+
+    assert period_is_open(this_week, "1wk", now=wednesday)
+    assert not period_is_open(this_week - pd.Timedelta(days=7), "1wk", now=wednesday)
+    assert period_is_open(pd.Timestamp('2026-10-01', tz='Asia/Kolkata'), "1mo", now=wednesday)
+    assert not period_is_open(pd.Timestamp('2026-09-01', tz='Asia/Kolkata'), "1mo", now=wednesday)
+
+
+def test_weekly_pivots_skip_the_week_in_progress():
+    """Test that mid-week, weekly pivots come from the previous completed week."""
+    data = _daily(end='2026-10-14')
+    previous_week = data.loc['2026-10-05':'2026-10-09']
+    wednesday = pd.Timestamp('2026-10-14 11:00', tz='Asia/Kolkata')
+
+    with patch.object(resampler.pd.Timestamp, 'now', return_value=wednesday):
+        weekly = calculate_pivot_points(data, "1wk")
+
+    expected = (previous_week['High'].max() + previous_week['Low'].min() + previous_week['Close'].iloc[-1]) / 3
+    assert weekly["pivot"] == round(expected, 2)
@@ -0,0 +1,106 @@
+"""
+Unit tests for the indicator screener.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.exceptions import InvalidQueryError
+from src.services.screener import Screener, build_indicator_table, evaluate_expression
+
+
+def _bars(close) -> pd.DataFrame:
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': np.full(len(close), 1000000)},
+                        index=pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=len(close),
+                                             tz='Asia/Kolkata'))
+
+
+def _table() -> pd.DataFrame:
+    return pd.DataFrame({
+        "name": ["A", "B", "C", "D"],
+        "close": [100.0, 50.0, 80.0, np.nan],
+        "ma_200": [90.0, 60.0, 70.0, 10.0],
+        "rsi": [25.0, 20.0, 45.0, 10.0],
+        "macd_hist": [0.5, 0.2, -0.1, 1.0],
+        "prev_macd_hist": [-0.2, 0.1, 0.3, -1.0]
+    }, index=["A.NS", "B.NS", "C.NS", "D.NS"])
+
+
+def test_expression_filters_whole_columns():
+    """Test boolean logic, comparisons, arithmetic and NaN handling."""
+    table = _table()
+
+    mask = evaluate_expression("RSI < 30 and close > ma_200", table)
+    chained = evaluate_expression("20 <= rsi < 30 or not close / ma_200 > 1", table)
+
+    assert mask.tolist() == [True, False, False, False]
+    assert chained.tolist() == [True, True, False, True]
+
+
+def test_crossings_compare_with_previous_bar():
+    """Test crosses_above and crosses_below against prev_ columns."""
+    table = _table()
+
+    assert evaluate_expression("crosses_above(macd_hist, 0)", table).tolist() == [True, False, False, True]
+    assert evaluate_expression("crosses_below(macd_hist, 0)", table).tolist() == [False, False, True, False]
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('echo hi')",
+    "close.__class__",
+    "rsi < 'thirty'",
+    "[rsi for rsi in close]",
+    "volume > 0",
+    "rsi <",
+    "crosses_above(rsi + 1, 30)",
+])
+def test_rejects_unsafe_or_invalid_expressions(expression):
+    """Test that anything outside the expression language is refused."""
+    with pytest.raises(InvalidQueryError):
+        evaluate_expression(expression, _table())
+
+
+def test_build_table_includes_previous_bar_and_names():
+    """Test the precomputed table layout."""
+    frames = {"TCS.NS": _bars(np.linspace(100, 200, 250)), "INFY.NS": _bars(np.linspace(200, 100, 40))}
+
+    table = build_indicator_table(frames)
+
+    assert table.loc["TCS.NS", "name"] == "Tata Consultancy Services"
+    assert table.loc["TCS.NS", "rsi"] == 100
+    assert table.loc["TCS.NS", "prev_close"] < table.loc["TCS.NS", "close"]
+    assert np.isnan(table.loc["INFY.NS", "ma_200"])
+    assert table.loc["INFY.NS", "change_pct"] < 0
+
+
+def test_screen_filters_sorts_and_caches(replay_provider):
+    """Test the Python API end to end on cached history."""
+    rng = np.random.default_rng(1)
+    universe = ["TCS.NS", "INFY.NS", "ITC.NS"]
+    for i, symbol in enumerate(universe):
+        replay_provider.save(symbol, _bars(100 + np.cumsum(rng.normal(0, 1, 260)) + i * 50))
+    screener = Screener(universe)
+
+    everything = screener.screen(sort_by="close", descending=True, limit=None)
+    cheap = screener.screen("close < 140", sort_by="close / ma_50", descending=False, limit=1)
+
+    assert list(everything.index) == ["ITC.NS", "INFY.NS", "TCS.NS"]
+    assert len(cheap) == 1 and cheap.iloc[0]["close"] < 140
+    assert "close / ma_50" in cheap.columns
+    assert screener.table() is screener.table()
+    assert screener.errors == {}
+
+
+def test_table_with_failed_symbols_is_rebuilt(replay_provider):
+    """Test that symbols missing after a failed load are retried on the next use."""
+    replay_provider.save("TCS.NS", _bars(np.linspace(100, 200, 250)))
+    screener = Screener(["TCS.NS", "INFY.NS"])
+
+    assert list(screener.table().index) == ["TCS.NS"]
+    assert "INFY.NS" in screener.errors and screener.built_at is None
+
+    replay_provider.save("INFY.NS", _bars(np.linspace(200, 100, 250)))
+
+    assert sorted(screener.table().index) == ["INFY.NS", "TCS.NS"]
+    assert screener.errors == {} and screener.built_at is not None
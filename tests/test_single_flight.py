@@ -0,0 +1,82 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+import threading
+import time
+import pytest
+from src.services.single_flight import SingleFlight
+
+
+def _run_concurrently(count: int, target):
+    """Start count threads running target and wait for all of them."""
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_callers_share_one_execution():
+    """Test that concurrent callers for one key trigger a single upstream call."""
+    flight = SingleFlight("test")
+    executions = []
+    results = []
+
+    def fetch():
+        executions.append(1)
+        time.sleep(0.2)
+        return "data"
+
+    _run_concurrently(10, lambda: results.append(flight.do("RELIANCE.NS", fetch)))
+
+    assert len(executions) == 1
+    assert results == ["data"] * 10
+    stats = flight.stats()
+    assert stats['requests'] == 10
+    assert stats['upstream_calls'] == 1
+    assert stats['calls_saved'] == 9
+    assert stats['in_flight'] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    """Test that callers for different keys run independently."""
+    flight = SingleFlight("test")
+
+    assert flight.do("TCS.NS", lambda: 1) == 1
+    assert flight.do("INFY.NS", lambda: 2) == 2
+    assert flight.stats()['upstream_calls'] == 2
+
+
+def test_errors_are_shared_with_waiting_callers():
+    """Test that an upstream failure is raised to every coalesced caller."""
+    flight = SingleFlight("test")
+    errors = []
+
+    def fetch():
+        time.sleep(0.2)
+        raise ValueError("upstream failed")
+
+    def call():
+        try:
+            flight.do("^NSEI", fetch)
+        except ValueError as e:
+            errors.append(e)
+
+    _run_concurrently(5, call)
+
+    assert len(errors) == 5
+    assert flight.stats()['upstream_calls'] == 1
+
+
+def test_sequential_calls_execute_again():
+    """Test that a finished call is not reused by later callers."""
+    flight = SingleFlight("test")
+    counter = iter(range(10))
+
+    first = flight.do("key", lambda: next(counter))
+    second = flight.do("key", lambda: next(counter))
+
+    assert (first, second) == (0, 1)
+    with pytest.raises(ZeroDivisionError):
+        flight.do("key", lambda: 1 / 0)
+    assert flight.stats()['in_flight'] == 0
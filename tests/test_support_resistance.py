@@ -0,0 +1,86 @@
+"""
+Unit tests for swing-based support and resistance zones.
+"""
+import numpy as np
+import pandas as pd
+from src.services.indicator_engine import swing_points
+from src.services.support_resistance import find_price_zones, support_resistance_zones
+from src.services.technical_indicators import calculate_support_resistance
+
+
+def _range_bound(cycles: int = 4, volume: float = 1000.0) -> pd.DataFrame:
+    """Bars oscillating between about 100 and 120, ending mid-range at 110."""
+    leg = np.linspace(100, 120, 11)
+    close = np.concatenate([np.concatenate([leg, leg[-2:0:-1]]) for _ in range(cycles)] + [leg[:6]])
+    # Nudge the turning points so that each touch is a little different
+    close = close + np.resize([0.0, 0.3, -0.2, 0.1], len(close)) * (np.abs(close - 110) > 9)
+    data = pd.DataFrame({'High': close + 0.5, 'Low': close - 0.5, 'Close': close,
+                         'Volume': np.full(len(close), volume)},
+                        index=pd.bdate_range(end='2026-10-16', periods=len(close), tz='Asia/Kolkata'))
+    data.attrs.update({"symbol": "TEST.NS", "interval": "1d"})
+    return data
+
+
+def test_swing_points_match_centered_extremes():
+    """Test detection against a pandas definition, including a flat top."""
+    rng = np.random.default_rng(9)
+    high = pd.Series(np.round(np.cumsum(rng.normal(size=500)), 1))
+    high[100:103] = high[90:115].max() + 5
+    low = high - 1
+
+    is_high, is_low = swing_points(high, low, order=5)
+
+    expected_high = (high == high.rolling(11, center=True).max()) & (high > high.shift(1).rolling(5).max())
+    expected_low = (low == low.rolling(11, center=True).min()) & (low < low.shift(1).rolling(5).min())
+    np.testing.assert_array_equal(is_high, expected_high)
+    np.testing.assert_array_equal(is_low, expected_low)
+    assert is_high[100] and not is_high[101:103].any()
+    assert not is_high[-5:].any()
+
+
+def test_swings_cluster_into_support_and_resistance():
+    """Test that repeated turns at the range edges become zones on either side of the close."""
+    data = _range_bound()
+
+    zones = support_resistance_zones(data)
+
+    support, resistance = zones["support"], zones["resistance"]
+    assert len(support) == 1 and len(resistance) == 1
+    assert support[0]["touches"] == 4 and resistance[0]["touches"] == 4
+    assert 99 <= support[0]["low"] <= support[0]["level"] <= support[0]["high"] <= 100
+    assert 120 <= resistance[0]["low"] <= resistance[0]["level"] <= resistance[0]["high"] <= 121
+    assert support[0]["strength"] == 4.0
+
+
+def test_zone_strength_is_weighted_by_volume():
+    """Test that touches on heavy volume count for more."""
+    data = _range_bound()
+    swing_highs, _ = swing_points(data['High'], data['Low'])
+    data.loc[data.index[swing_highs], 'Volume'] = 3000.0
+
+    zones = find_price_zones(data)
+
+    resistance = max(zones, key=lambda zone: zone["level"])
+    support = min(zones, key=lambda zone: zone["level"])
+    assert resistance["strength"] > support["strength"]
+    assert resistance["last_touch"] == data.index[np.flatnonzero(swing_highs)[-1]]
+
+
+def test_min_touches_filters_single_swings():
+    """Test that a lone turning point is not reported as a zone."""
+    data = _range_bound(cycles=1)
+
+    assert find_price_zones(data) == []
+    assert len(find_price_zones(data, min_touches=1)) == 2
+
+
+def test_calculate_support_resistance_reports_zone_levels():
+    """Test the service function, including too little data for any swing."""
+    data = _range_bound()
+
+    levels = calculate_support_resistance(data)
+    empty = calculate_support_resistance(data.iloc[:5])
+
+    assert levels["support_levels"] == [levels["support_zones"][0]["level"]]
+    assert levels["resistance_levels"] == [levels["resistance_zones"][0]["level"]]
+    assert empty == {"support_levels": [], "resistance_levels": [], "support_zones": [], "resistance_zones": []}
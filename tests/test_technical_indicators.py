@@ -0,0 +1,132 @@
+"""
+Unit tests for technical indicators and their cache.
+"""
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from src.services import technical_indicators
+from src.services.technical_indicators import (
+    IndicatorCache,
+    calculate_all_indicators,
+    calculate_extended_indicators,
+    calculate_indicator_series,
+    calculate_moving_averages,
+    calculate_rsi,
+    calculate_universe_indicators,
+    indicator_cache
+)
+
+
+def _frame(count: int = 250, symbol: str = "TCS.NS") -> pd.DataFrame:
+    """Build a random-walk daily frame tagged the way the data service tags it."""
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    data = pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(100000, 500000, count)
+    }, index=pd.bdate_range(end='2026-10-16', periods=count, tz='Asia/Kolkata'))
+    if symbol:
+        data.attrs.update({"symbol": symbol, "interval": "1d"})
+    return data
+
+
+def test_all_indicators_are_served_from_cache():
+    """Test that a repeated call is answered without recomputing."""
+    data = _frame()
+    first = calculate_all_indicators(data)
+
+    with patch.object(technical_indicators, 'compute_indicator_frame') as engine:
+        second = calculate_all_indicators(data.iloc[:].copy())
+
+    engine.assert_not_called()
+    assert second == first
+
+
+def test_cache_key_tracks_latest_bar():
+    """Test that updating today's bar invalidates the cached result."""
+    data = _frame()
+    before = calculate_rsi(data)
+
+    updated = data.copy()
+    updated.iloc[-1, updated.columns.get_loc('Close')] *= 1.05
+
+    assert calculate_rsi(updated)['current'] > before['current']
+
+
+def test_parameters_are_part_of_key():
+    """Test that different parameters get separate cache entries."""
+    data = _frame()
+
+    assert calculate_rsi(data, 7) != calculate_rsi(data, 21)
+    assert set(calculate_moving_averages(data, [5])) == {"MA_5"}
+
+
+def test_untagged_frames_are_not_cached():
+    """Test that frames without a symbol are computed directly."""
+    calculate_rsi(_frame(symbol=None))
+
+    assert indicator_cache.stats()["entries"] == 0
+
+
+def test_results_are_copies():
+    """Test that mutating a returned result does not corrupt the cache."""
+    data = _frame()
+    calculate_rsi(data)["current"] = -1
+
+    assert calculate_rsi(data)["current"] != -1
+
+
+def test_cache_is_bounded():
+    """Test least recently used eviction."""
+    cache = IndicatorCache(maxsize=2)
+    cache.set("a", {})
+    cache.set("b", {})
+    cache.get("a")
+    cache.set("c", {})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {} and cache.get("c") == {}
+
+
+def test_series_are_shared_by_cards_and_charts():
+    """Test that every metric is read from one cached series computation."""
+    data = _frame()
+
+    with patch.object(technical_indicators, 'compute_indicator_frame',
+                      wraps=technical_indicators.compute_indicator_frame) as engine:
+        indicators = calculate_all_indicators(data)
+        series = calculate_indicator_series(data)
+
+    assert engine.call_count == 1
+    assert indicators["rsi"]["current"] == round(series["RSI"].iloc[-1], 2)
+    assert indicators["moving_averages"]["MA_200"] == round(series["MA_200"].iloc[-1], 2)
+
+
+def test_extended_indicators_report_warm_up_as_none():
+    """Test the extended summary, including indicators without enough bars yet."""
+    short = calculate_extended_indicators(_frame(20))
+    full = calculate_extended_indicators(_frame())
+
+    assert short["bollinger"]["upper"] is not None
+    assert short["adx"]["adx"] is None and short["adx"]["trend"] == "N/A"
+    assert short["adx"]["plus_di"] is not None
+    assert full["bollinger"]["lower"] < full["bollinger"]["middle"] < full["bollinger"]["upper"]
+    assert full["atr"] > 0
+    assert full["adx"]["trend"] in ("Strong", "Weak")
+    assert full["stochastic"]["signal"] in ("Overbought", "Oversold", "Neutral")
+    assert calculate_all_indicators(_frame())["extended"] == full
+
+
+def test_universe_batch_matches_per_symbol_results():
+    """Test that the batch path agrees with calculate_all_indicators."""
+    frames = {"TCS.NS": _frame(250, "TCS.NS"), "INFY.NS": _frame(60, "INFY.NS")}
+
+    table = calculate_universe_indicators(frames)
+
+    for symbol, data in frames.items():
+        indicators = calculate_all_indicators(data)
+        row = table.loc[symbol]
+        assert round(row["RSI"], 2) == indicators["rsi"]["current"]
+        assert round(row["MACD_hist"], 2) == indicators["macd"]["histogram"]
+        assert round(row["support_1"], 2) == indicators["pivot_points"]["support_1"]
+    assert np.isnan(table.loc["INFY.NS", "MA_200"])
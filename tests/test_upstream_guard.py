@@ -0,0 +1,87 @@
+"""
+Unit tests for upstream rate limiting, retries and circuit breaking.
+"""
+import pytest
+from src.services.exceptions import CircuitOpenError
+from src.services.upstream_guard import CircuitBreaker, TokenBucket, UpstreamGuard
+
+
+class TransientError(Exception):
+    """Stand-in for an upstream throttling error."""
+    pass
+
+
+def _guard(**kwargs) -> UpstreamGuard:
+    """Create a guard with no rate limiting and no backoff delay."""
+    options = dict(rate=1000, burst=1000, backoff_base=0,
+                   is_transient=lambda e: isinstance(e, TransientError))
+    options.update(kwargs)
+    return UpstreamGuard("test", **options)
+
+
+def test_retries_transient_errors_until_success():
+    """Test that transient errors are retried."""
+    guard = _guard(max_retries=3)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TransientError()
+        return "ok"
+
+    assert guard.call(flaky) == "ok"
+    stats = guard.stats()
+    assert stats['retries'] == 2
+    assert stats['upstream_requests'] == 3
+    assert stats['breaker_state'] == "closed"
+
+
+def test_non_transient_errors_are_not_retried():
+    """Test that permanent errors are raised immediately."""
+    guard = _guard(max_retries=3)
+
+    with pytest.raises(ValueError):
+        guard.call(lambda: int("not a number"))
+    assert guard.stats()['retries'] == 0
+
+
+def test_breaker_opens_after_repeated_failures():
+    """Test that the circuit opens and rejects calls without going upstream."""
+    guard = _guard(max_retries=0, failure_threshold=2, reset_timeout=60)
+
+    def throttled():
+        raise TransientError()
+
+    for _ in range(2):
+        with pytest.raises(TransientError):
+            guard.call(throttled)
+
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: "never called")
+
+    stats = guard.stats()
+    assert stats['breaker_state'] == "open"
+    assert stats['rejected'] == 1
+    assert stats['upstream_requests'] == 2
+
+
+def test_breaker_half_open_trial_closes_circuit():
+    """Test that a successful trial call after the reset timeout closes the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_token_bucket_limits_rate():
+    """Test that requests beyond the burst wait for new tokens."""
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0